@@ -69,6 +69,15 @@ options:
       - a hash/dictionary of tags to add to the new copied AMI; '{"key":"value"}' and '{"key":"value","key":"value"}'
     required: false
     default: null
+  destination_regions:
+    description:
+      - A list of regions to copy the AMI to, instead of I(region). All the copies are started at once
+        and waited on together, with one describe_images call per region and an exponential backoff
+        between the polls. The I(tags) are added to each copy as soon as it is available, or as soon
+        as it is registered without I(wait).
+    required: false
+    default: null
+    version_added: "2.3"
 
 author: Amir Moulavi <amir.moulavi@gmail.com>
 extends_documentation_fragment:
@@ -115,6 +124,19 @@ EXAMPLES = '''
     source_image_id: ami-xxxxxxx
     encrypted: yes
 
+# Copy an AMI to several regions at once and wait for all the copies
+- ec2_ami_copy:
+    source_region: us-east-1
+    source_image_id: ami-xxxxxxx
+    destination_regions:
+      - eu-west-1
+      - eu-central-1
+      - ap-southeast-2
+    wait: yes
+    tags:
+        Name: My-Super-AMI
+  register: copies
+
 # Encrypted AMI copy with specified key
 - ec2_ami_copy:
     source_region: us-east-1
@@ -124,6 +146,24 @@ EXAMPLES = '''
     kms_key_id: arn:aws:kms:us-east-1:XXXXXXXXXXXX:key/746de6ea-50a4-4bcb-8fbc-e3b29f2d367b
 '''
 
+RETURN = '''
+image_id:
+    description: id of the new image, when copying to a single region
+    returned: when destination_regions is not given
+    type: string
+    sample: ami-1234abcd
+images:
+    description: the copy in each of the destination regions, with its state and how long it took to copy
+    returned: when destination_regions is given
+    type: dict
+    sample: {
+        "eu-west-1": {"image_id": "ami-1234abcd", "state": "available", "duration": 1260.4},
+        "eu-central-1": {"image_id": "ami-5678cdef", "state": "pending", "duration": null}
+    }
+'''
+
+import time
+
 try:
     import boto
     import boto.ec2
@@ -172,6 +212,88 @@ def copy_image(module, ec2):
     module.exit_json(msg="AMI copy operation complete", image_id=image_id, state=img.state, changed=True)
 
 
+def copy_image_to_regions(module, connections):
+    """
+    Starts the copy of the AMI to every region, then waits on all the copies
+    together and tags each of them as soon as it completes
+
+    module : AnsibleModule object
+    connections: authenticated ec2 connection object of every destination region
+    """
+
+    params = {'source_region': module.params.get('source_region'),
+              'source_image_id': module.params.get('source_image_id'),
+              'name': module.params.get('name'),
+              'description': module.params.get('description'),
+              'encrypted': module.params.get('encrypted'),
+              'kms_key_id': module.params.get('kms_key_id')
+    }
+    tags = module.params.get('tags')
+    wait = module.params.get('wait')
+    wait_timeout = int(module.params.get('wait_timeout'))
+
+    images = {}
+    started = {}
+    for region in module.params.get('destination_regions'):
+        try:
+            image_id = connections[region].copy_image(**params).image_id
+        except boto.exception.BotoServerError as e:
+            module.fail_json(msg="%s: %s: %s" % (region, e.error_code, e.error_message), images=images)
+        images[region] = {'image_id': image_id, 'state': 'pending', 'duration': None}
+        started[region] = time.time()
+
+    pending = wait_until_images_are_copied(module, connections, images, started, tags, wait, wait_timeout)
+    if pending:
+        module.fail_json(msg="timed out waiting for image to be %s in %s" % (wait and 'copied' or 'recognized', ', '.join(sorted(pending))),
+                         images=images, changed=True)
+
+    failed = [region for region in images if images[region]['state'] == 'failed']
+    if failed:
+        module.fail_json(msg="AMI copy failed in %s" % ', '.join(sorted(failed)), images=images, changed=True)
+
+    module.exit_json(msg="AMI copy operation complete", images=images, changed=True)
+
+
+def wait_until_images_are_copied(module, connections, images, started, tags, wait, wait_timeout):
+    """
+    Polls all the regions that have a copy pending with a single describe_images
+    call each, sleeping twice as long between every round, up to 30 seconds,
+    and polls a last time once wait_timeout expired.
+    A copy is done once it is available, or once it is registered without wait.
+    Returns the regions still pending when wait_timeout expired.
+    """
+    deadline = time.time() + wait_timeout
+    pending = dict((region, [images[region]['image_id']]) for region in images)
+    delay = 1
+    while pending:
+        for region in list(pending):
+            try:
+                found = connections[region].get_all_images(image_ids=pending[region])
+            except boto.exception.EC2ResponseError as e:
+                # the copy is not known to EC2 right after copy_image returned
+                if 'InvalidAMIID.NotFound' in e.error_code:
+                    continue
+                module.fail_json(msg="Error while trying to find the new image in %s: %s" % (region, str(e)),
+                                 images=images, changed=True)
+            for img in found:
+                images[region]['state'] = img.state
+                if img.state == 'failed' or not wait or img.state == 'available':
+                    if img.state == 'available':
+                        images[region]['duration'] = round(time.time() - started[region], 1)
+                    pending[region].remove(img.id)
+                    if img.state != 'failed':
+                        register_tags_if_any(module, connections[region], tags, img.id)
+            if not pending[region]:
+                del pending[region]
+        remaining = deadline - time.time()
+        if not pending or remaining <= 0:
+            break
+        # the last round polls right at the deadline
+        time.sleep(min(delay, remaining))
+        delay = min(delay * 2, 30)
+    return list(pending)
+
+
 # register tags to the copied AMI
 def register_tags_if_any(module, ec2, tags, image_id):
     if tags:
@@ -222,13 +344,24 @@ def main():
         kms_key_id=dict(type='str', required=False),
         wait=dict(type='bool', default=False),
         wait_timeout=dict(default=1200),
-        tags=dict(type='dict')))
+        tags=dict(type='dict'),
+        destination_regions=dict(type='list')))
 
     module = AnsibleModule(argument_spec=argument_spec)
 
     if not HAS_BOTO:
         module.fail_json(msg='boto required for this module')
 
+    if module.params.get('destination_regions'):
+        region, ec2_url, boto_params = get_aws_connection_info(module)
+        connections = {}
+        for region in module.params.get('destination_regions'):
+            try:
+                connections[region] = connect_to_aws(boto.ec2, region, **boto_params)
+            except (boto.exception.NoAuthHandlerFound, AnsibleAWSError) as e:
+                module.fail_json(msg="%s: %s" % (region, str(e)))
+        copy_image_to_regions(module, connections)
+
     try:
         ec2 = ec2_connect(module)
     except boto.exception.NoAuthHandlerFound, e:
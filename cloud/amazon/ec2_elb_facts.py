@@ -28,6 +28,39 @@ options:
     required: false
     default: null
     aliases: ['elb_ids', 'ec2_elbs']
+  health:
+    description:
+      - Whether to look up the health of the instances of every ELB. Set to C(no) to skip the
+        describe_instance_health call made per ELB.
+    required: false
+    default: yes
+    version_added: "2.3"
+  tags:
+    description:
+      - Whether to return the tags of every ELB, looked up with batched describe_tags calls of
+        20 ELB names each.
+    required: false
+    default: no
+    version_added: "2.3"
+  attributes:
+    description:
+      - Whether to return the attributes (cross-zone load balancing, connection draining,
+        access log and idle timeout) of every ELB.
+    required: false
+    default: no
+    version_added: "2.3"
+  concurrency:
+    description:
+      - Maximum number of per-ELB API calls in flight at once.
+    required: false
+    default: 10
+    version_added: "2.3"
+  retries:
+    description:
+      - Number of times an API call is retried with an exponential backoff when AWS throttles it.
+    required: false
+    default: 5
+    version_added: "2.3"
 extends_documentation_fragment:
     - aws
     - ec2
@@ -70,8 +103,18 @@ EXAMPLES = '''
     msg: "{{ item.dns_name }}"
   with_items: elb_facts.elbs
 
+# Gather the tags of all ELBs, without looking up the health of their instances
+- action:
+    module: ec2_elb_facts
+    health: no
+    tags: yes
+  register: elb_facts
+
 '''
 
+import random
+import threading
+import time
 import xml.etree.ElementTree as ET
 
 try:
@@ -82,6 +125,91 @@ except ImportError:
     HAS_BOTO = False
 
 
+# ELB names accepted by a single DescribeTags call
+TAGS_PER_CALL = 20
+
+
+class ElbTag(object):
+
+    def __init__(self, connection=None):
+        self.key = None
+        self.value = None
+
+    def startElement(self, name, attrs, connection):
+        return None
+
+    def endElement(self, name, value, connection):
+        if name == 'Key':
+            self.key = value
+        elif name == 'Value':
+            self.value = value
+
+
+class ElbTagDescription(object):
+    """ One member of a DescribeTags response, the tags of one ELB """
+
+    def __init__(self, connection=None):
+        self.load_balancer_name = None
+        self.tags = []
+
+    def startElement(self, name, attrs, connection):
+        if name == 'member':
+            tag = ElbTag()
+            self.tags.append(tag)
+            return tag
+        return None
+
+    def endElement(self, name, value, connection):
+        if name == 'LoadBalancerName':
+            self.load_balancer_name = value
+
+
+def with_backoff(func, retries, *args, **kwargs):
+    """ Call func, retrying with an exponential backoff while AWS throttles """
+    for attempt in range(retries + 1):
+        try:
+            return func(*args, **kwargs)
+        except BotoServerError as e:
+            if e.error_code not in ('Throttling', 'RequestLimitExceeded') or attempt == retries:
+                raise
+            time.sleep(min(2 ** attempt, 30) * (0.5 + random.random() / 2))
+
+
+def run_concurrently(func, items, limit):
+    """ Call func for every item with at most limit calls in flight and
+    return the results in the order of items, or the first error raised
+    """
+    results = [None] * len(items)
+    errors = []
+    pending = list(enumerate(items))
+    lock = threading.Lock()
+
+    def worker():
+        while True:
+            lock.acquire()
+            try:
+                if not pending or errors:
+                    return
+                (index, item) = pending.pop(0)
+            finally:
+                lock.release()
+            try:
+                results[index] = func(item)
+            except Exception as e:
+                errors.append(e)
+
+    threads = []
+    for i in range(max(1, min(limit, len(items)))):
+        thread = threading.Thread(target=worker)
+        thread.start()
+        threads.append(thread)
+    for thread in threads:
+        thread.join()
+    if errors:
+        raise errors[0]
+    return results
+
+
 def get_error_message(xml_string):
 
     root = ET.fromstring(xml_string)
@@ -131,6 +259,45 @@ def get_health_check(health_check):
     return health_check_dict
 
 
+def get_elb_attributes(attributes):
+    attributes_dict = {}
+    cross_zone = getattr(attributes, 'cross_zone_load_balancing', None)
+    if cross_zone is not None:
+        attributes_dict['cross_zone_load_balancing'] = cross_zone.enabled
+    draining = getattr(attributes, 'connection_draining', None)
+    if draining is not None:
+        attributes_dict['connection_draining'] = {
+            'enabled': draining.enabled,
+            'timeout': draining.timeout,
+        }
+    access_log = getattr(attributes, 'access_log', None)
+    if access_log is not None:
+        attributes_dict['access_log'] = {
+            'enabled': access_log.enabled,
+            's3_bucket_name': access_log.s3_bucket_name,
+            's3_bucket_prefix': access_log.s3_bucket_prefix,
+            'emit_interval': access_log.emit_interval,
+        }
+    settings = getattr(attributes, 'connecting_settings', None)
+    if settings is not None:
+        attributes_dict['idle_timeout'] = settings.idle_timeout
+    return attributes_dict
+
+
+def get_elb_tags(connection, elb_names, retries):
+    """ Look up the tags of all the ELBs, TAGS_PER_CALL names at a time """
+    tags = {}
+    for start in range(0, len(elb_names), TAGS_PER_CALL):
+        params = {}
+        for (i, name) in enumerate(elb_names[start:start + TAGS_PER_CALL]):
+            params['LoadBalancerNames.member.%d' % (i + 1)] = name
+        descriptions = with_backoff(connection.get_list, retries, 'DescribeTags', params,
+                                    [('member', ElbTagDescription)])
+        for description in descriptions:
+            tags[description.load_balancer_name] = dict((tag.key, tag.value) for tag in description.tags)
+    return tags
+
+
 def get_elb_info(connection,elb):
     elb_info = {
         'name': elb.name,
@@ -154,7 +321,7 @@ def get_elb_info(connection,elb):
     }
     if elb.vpc_id:
         elb_info['vpc_id'] = elb.vpc_id
-    if elb.instances:
+    if elb.instances and connection is not None:
         instance_health = connection.describe_instance_health(elb.name)
         elb_info['instances_inservice'] = [inst.instance_id for inst in instance_health if inst.state == 'InService']
         elb_info['instances_inservice_count'] = len(elb_info['instances_inservice'])
@@ -167,19 +334,54 @@ def get_elb_info(connection,elb):
     return elb_info
 
 
-def list_elb(connection, module):
+def list_elb(connection, module, connect):
     elb_names = module.params.get("names")
     if not elb_names:
         elb_names = None
+    retries = module.params.get("retries")
 
     try:
-        all_elbs = connection.get_all_load_balancers(elb_names)
+        all_elbs = []
+        marker = None
+        while True:
+            elbs = with_backoff(connection.get_all_load_balancers, retries, elb_names, marker=marker)
+            all_elbs.extend(elbs)
+            marker = getattr(elbs, 'next_marker', None)
+            if not marker:
+                break
     except BotoServerError as e:
         module.fail_json(msg = "%s: %s" % (e.error_code, e.error_message))
 
-    elb_array = []
-    for elb in all_elbs:
-        elb_array.append(get_elb_info(connection,elb))
+    # boto connections are not shared between threads
+    local = threading.local()
+
+    def thread_connection():
+        if not hasattr(local, 'connection'):
+            local.connection = connect()
+        return local.connection
+
+    def elb_details(elb):
+        if module.params.get("health"):
+            elb_info = with_backoff(get_elb_info, retries, thread_connection(), elb)
+        else:
+            elb_info = get_elb_info(None, elb)
+        if module.params.get("attributes"):
+            attributes = with_backoff(thread_connection().get_all_lb_attributes, retries, elb.name)
+            elb_info['attributes'] = get_elb_attributes(attributes)
+        return elb_info
+
+    try:
+        if module.params.get("health") or module.params.get("attributes"):
+            elb_array = run_concurrently(elb_details, all_elbs, module.params.get("concurrency"))
+        else:
+            elb_array = [elb_details(elb) for elb in all_elbs]
+
+        if module.params.get("tags"):
+            tags = get_elb_tags(connection, [elb.name for elb in all_elbs], retries)
+            for elb_info in elb_array:
+                elb_info['tags'] = tags.get(elb_info['name'], {})
+    except BotoServerError as e:
+        module.fail_json(msg = "%s: %s" % (e.error_code, e.error_message))
 
     module.exit_json(elbs=elb_array)
 
@@ -188,7 +390,12 @@ def main():
     argument_spec = ec2_argument_spec()
     argument_spec.update(
         dict(
-            names={'default': None, 'type': 'list'}
+            names={'default': None, 'type': 'list'},
+            health={'default': True, 'type': 'bool'},
+            tags={'default': False, 'type': 'bool'},
+            attributes={'default': False, 'type': 'bool'},
+            concurrency={'default': 10, 'type': 'int'},
+            retries={'default': 5, 'type': 'int'},
         )
     )
 
@@ -207,7 +414,10 @@ def main():
     else:
         module.fail_json(msg="region must be specified")
 
-    list_elb(connection, module)
+    def connect():
+        return connect_to_aws(boto.ec2.elb, region, **aws_connect_params)
+
+    list_elb(connection, module, connect)
 
 from ansible.module_utils.basic import *
 from ansible.module_utils.ec2 import *
@@ -23,12 +23,12 @@ version_added: "2.2"
 options:
   name:
     description:
-      - Tagged name identifying a network ACL.
-    required: true
+      - Tagged name identifying a network ACL. Required unless I(nacls) is given.
+    required: false
   vpc_id:
     description:
-      - VPC id of the requesting VPC.
-    required: true
+      - VPC id of the requesting VPC. Required unless every item of I(nacls) has a I(vpc_id).
+    required: false
   subnets:
     description:
       - The list of subnets that should be associated with the network ACL.
@@ -56,6 +56,25 @@ options:
     required: false
     choices: ['present', 'absent']
     default: present
+  nacls:
+    description:
+      - A list of network ACLs to converge in one task, each a dict with any of the I(name),
+        I(vpc_id), I(subnets), I(egress), I(ingress), I(tags) and I(state) options, which
+        default to the options of the task.
+      - The network ACLs of different VPCs are converged concurrently, those of one VPC in turn.
+    required: false
+    version_added: "2.3"
+  concurrency:
+    description:
+      - Maximum number of API calls, or of VPCs with I(nacls), handled at once.
+    required: false
+    default: 10
+    version_added: "2.3"
+notes:
+  - Rules are compared by rule number. A changed rule is replaced in place, and rules are
+    only deleted once the new and changed rules are in place. Subnets are only moved onto the
+    network ACL once its rules are written.
+  - The subnet associations are read from a single describe_network_acls call of the VPC.
 author: Mike Mochan(@mmochan)
 extends_documentation_fragment: aws
 requirements: [ botocore, boto3, json ]
@@ -113,12 +132,30 @@ EXAMPLES = '''
     vpc_id: vpc-12345678
     name: prod-dmz-nacl
     state: absent
+
+- name: "Set up the network ACLs of the VPC"
+  ec2_vpc_nacl:
+    vpc_id: vpc-12345678
+    region: ap-southeast-2
+    nacls:
+      - name: prod-dmz-nacl
+        subnets: ['prod-dmz-1', 'prod-dmz-2']
+        ingress: [[100, 'tcp', 'allow', '0.0.0.0/0', null, null, 443, 443]]
+        egress: [[100, 'all', 'allow', '0.0.0.0/0', null, null, null, null]]
+      - name: prod-app-nacl
+        subnets: ['prod-app-1', 'prod-app-2']
+        ingress: [[100, 'tcp', 'allow', '10.0.0.0/16', null, null, 8080, 8080]]
+        egress: [[100, 'all', 'allow', '10.0.0.0/16', null, null, null, null]]
 '''
 RETURN = '''
 task:
   description: The result of the create, or delete action.
   returned: success
   type: dictionary
+nacls:
+  description: The name, vpc_id, changed and nacl_id result of every item of nacls, in order.
+  returned: when nacls is given
+  type: list
 '''
 
 try:
@@ -129,6 +166,8 @@ try:
 except ImportError:
     HAS_BOTO3 = False
 
+import threading
+
 
 # Common fields for the default rule that is contained within every VPC NACL.
 DEFAULT_RULE_FIELDS = {
@@ -145,6 +184,68 @@ DEFAULT_EGRESS = dict(DEFAULT_RULE_FIELDS.items() + [('Egress', True)])
 # http://www.iana.org/assignments/protocol-numbers/protocol-numbers.xhtml
 PROTOCOL_NUMBERS = {'all': -1, 'icmp': 1, 'tcp': 6, 'udp': 17, }
 
+# Options that each item of nacls can set
+NACL_KEYS = ['name', 'vpc_id', 'subnets', 'tags', 'ingress', 'egress', 'state']
+
+
+class NaclError(Exception):
+    pass
+
+
+class NaclModule(object):
+    """
+    Stands in for the AnsibleModule while one network ACL is converged. It
+    holds the options of that ACL and raises failures as NaclError, so that
+    they reach the caller from any thread.
+    """
+
+    def __init__(self, module, params):
+        self.params = params
+        self.concurrency = module.params.get('concurrency')
+
+    def fail_json(self, msg, **kwargs):
+        raise NaclError(msg)
+
+
+def run_concurrently(func, items, limit):
+    """ Call func for every item with at most limit calls in flight and
+    return the results in the order of items, or raise the first error
+    """
+    results = [None] * len(items)
+    errors = []
+    pending = list(enumerate(items))
+    lock = threading.Lock()
+
+    def worker():
+        while True:
+            lock.acquire()
+            try:
+                if not pending or errors:
+                    return
+                (index, item) = pending.pop(0)
+            finally:
+                lock.release()
+            try:
+                results[index] = func(item)
+            except Exception as e:
+                errors.append(e)
+
+    threads = []
+    for i in range(max(1, min(limit, len(items)))):
+        thread = threading.Thread(target=worker)
+        thread.start()
+        threads.append(thread)
+    for thread in threads:
+        thread.join()
+    if errors:
+        raise errors[0]
+    return results
+
+
+def run_calls(calls, client, module):
+    """ Make the (client method, params) calls concurrently """
+    run_concurrently(lambda call: call[0](call[1], client, module), calls, module.concurrency)
+
 
 #Utility methods
 def icmp_present(entry):
@@ -163,114 +264,114 @@ def load_tags(module):
     return tags
 
 
-def subnets_removed(nacl_id, subnets, client, module):
-    results = find_acl_by_id(nacl_id, client, module)
-    associations = results['NetworkAcls'][0]['Associations']
-    subnet_ids = [assoc['SubnetId'] for assoc in associations]
-    return [subnet for subnet in subnet_ids if subnet not in subnets]
-
-
-def subnets_added(nacl_id, subnets, client, module):
-    results = find_acl_by_id(nacl_id, client, module)
-    associations = results['NetworkAcls'][0]['Associations']
-    subnet_ids = [assoc['SubnetId'] for assoc in associations]
-    return [subnet for subnet in subnets if subnet not in subnet_ids]
-
-
-def subnets_changed(nacl, client, module):
-    changed = False
-    response = {}
-    vpc_id = module.params.get('vpc_id')
-    nacl_id = nacl['NetworkAcls'][0]['NetworkAclId']
-    subnets = subnets_to_associate(nacl, client, module)
-    if not subnets:
-        default_nacl_id = find_default_vpc_nacl(vpc_id, client, module)[0]
-        subnets = find_subnet_ids_by_nacl_id(nacl_id, client, module)
-        if subnets:
-            replace_network_acl_association(default_nacl_id, subnets, client, module)
-            changed = True
-            return changed
-        changed = False
-        return changed
-    subs_added = subnets_added(nacl_id, subnets, client, module)
-    if subs_added:
-        replace_network_acl_association(nacl_id, subs_added, client, module)
-        changed = True
-    subs_removed = subnets_removed(nacl_id, subnets, client, module)
-    if subs_removed:
-        default_nacl_id = find_default_vpc_nacl(vpc_id, client, module)[0]
-        replace_network_acl_association(default_nacl_id, subs_removed, client, module)
-        changed = True
-    return changed
+def find_nacl_by_name(vpc_nacls, name):
+    for nacl in vpc_nacls:
+        for tag in nacl.get('Tags', []):
+            if tag['Key'] == 'Name' and tag['Value'] == name:
+                return nacl
+    return None
+
+
+def find_default_nacl_id(vpc_nacls):
+    for nacl in vpc_nacls:
+        if nacl['IsDefault']:
+            return nacl['NetworkAclId']
+    return None
+
+
+def subnet_associations(vpc_nacls):
+    """ Maps every subnet of the VPC to its association id and network ACL id """
+    associations = dict()
+    for nacl in vpc_nacls:
+        for assoc in nacl['Associations']:
+            associations[assoc['SubnetId']] = (assoc['NetworkAclAssociationId'], nacl['NetworkAclId'])
+    return associations
+
+
+def subnets_changed(nacl_id, vpc_nacls, client, module):
+    """
+    Moves the subnets to and from the network ACL, working from the
+    describe_network_acls snapshot of the whole VPC. The subnets no longer
+    listed go back to the default network ACL of the VPC.
+    """
+    default_nacl_id = find_default_nacl_id(vpc_nacls)
+    associations = subnet_associations(vpc_nacls)
+    subnets = subnets_to_associate(client, module)
+    associated = [s for s in associations if associations[s][1] == nacl_id]
+
+    calls = []
+    for subnet in subnets:
+        if subnet in associations and subnet not in associated:
+            calls.append((replace_network_acl_association,
+                          {'NetworkAclId': nacl_id, 'AssociationId': associations[subnet][0]}))
+    for subnet in associated:
+        if subnet not in subnets:
+            calls.append((replace_network_acl_association,
+                          {'NetworkAclId': default_nacl_id, 'AssociationId': associations[subnet][0]}))
+    run_calls(calls, client, module)
+    return bool(calls)
 
 
 def nacls_changed(nacl, client, module):
-    changed = False
-    params = dict()
-    params['egress'] = module.params.get('egress')
-    params['ingress'] = module.params.get('ingress')
-
-    nacl_id = nacl['NetworkAcls'][0]['NetworkAclId']
-    nacl = describe_network_acl(client, module)
-    entries = nacl['NetworkAcls'][0]['Entries']
-    tmp_egress = [entry for entry in entries if entry['Egress'] is True and DEFAULT_EGRESS !=entry]
-    tmp_ingress = [entry for entry in entries if entry['Egress'] is False]
-    egress = [rule for rule in tmp_egress if DEFAULT_EGRESS != rule]
-    ingress = [rule for rule in tmp_ingress if DEFAULT_INGRESS != rule]
-    if rules_changed(egress, params['egress'], True, nacl_id, client, module):
-        changed = True
-    if rules_changed(ingress, params['ingress'], False, nacl_id, client, module):
-        changed = True
-    return changed
+    nacl_id = nacl['NetworkAclId']
+    entries = nacl['Entries']
+    egress = [entry for entry in entries if entry['Egress'] is True and DEFAULT_EGRESS != entry]
+    ingress = [entry for entry in entries if entry['Egress'] is False and DEFAULT_INGRESS != entry]
+    (egress_upserts, egress_deletes) = diff_rules(egress, module.params.get('egress'), True, nacl_id)
+    (ingress_upserts, ingress_deletes) = diff_rules(ingress, module.params.get('ingress'), False, nacl_id)
 
+    # the new and changed rules are in place before any rule is removed
+    run_calls(egress_upserts + ingress_upserts, client, module)
+    run_calls(egress_deletes + ingress_deletes, client, module)
+    return bool(egress_upserts or ingress_upserts or egress_deletes or ingress_deletes)
 
-def tags_changed(nacl_id, client, module):
+
+def tags_changed(nacl, client, module):
     changed = False
+    nacl_id = nacl['NetworkAclId']
     tags = dict()
     if module.params.get('tags'):
-        tags = module.params.get('tags')
+        tags = dict(module.params.get('tags'))
     tags['Name'] = module.params.get('name')
-    nacl = find_acl_by_id(nacl_id, client, module)
-    if nacl['NetworkAcls']:
-        nacl_values = [t.values() for t in nacl['NetworkAcls'][0]['Tags']]
-        nacl_tags = [item for sublist in nacl_values for item in sublist]
-        tag_values = [[key, str(value)] for key, value in tags.iteritems()]
-        tags = [item for sublist in tag_values for item in sublist]
-        if sorted(nacl_tags) == sorted(tags):
-            changed = False
-            return changed
-        else:
-            delete_tags(nacl_id, client, module)
-            create_tags(nacl_id, client, module)
-            changed = True
-            return changed
+    nacl_values = [t.values() for t in nacl.get('Tags', [])]
+    nacl_tags = [item for sublist in nacl_values for item in sublist]
+    tag_values = [[key, str(value)] for key, value in tags.iteritems()]
+    tags = [item for sublist in tag_values for item in sublist]
+    if sorted(nacl_tags) == sorted(tags):
+        return changed
+    create_tags(nacl_id, client, module)
+    changed = True
     return changed
 
 
-def rules_changed(aws_rules, param_rules, Egress, nacl_id, client, module):
-    changed = False
-    rules = list()
+def diff_rules(aws_rules, param_rules, Egress, nacl_id):
+    """
+    Compares the rules by rule number and returns the (client method, params)
+    calls that converge them: the entries to create or to replace in place,
+    then the entries to delete.
+    """
+    current = dict((rule['RuleNumber'], rule) for rule in aws_rules)
+    upserts = []
+    wanted = set()
     for entry in param_rules:
-        rules.append(process_rule_entry(entry, Egress))
-    if rules == aws_rules:
-        return changed
-    else:
-        removed_rules = [x for x in aws_rules if x not in rules]
-        if removed_rules:
-            params = dict()
-            for rule in removed_rules:
-                params['NetworkAclId'] = nacl_id
-                params['RuleNumber'] = rule['RuleNumber']
-                params['Egress'] = Egress
-                delete_network_acl_entry(params, client, module)
-            changed = True
-        added_rules = [x for x in rules if x not in aws_rules]
-        if added_rules:
-            for rule in added_rules:
-                rule['NetworkAclId'] = nacl_id
-                create_network_acl_entry(rule, client, module)
-            changed = True
-    return changed
+        rule = process_rule_entry(entry, Egress)
+        number = rule['RuleNumber']
+        wanted.add(number)
+        if number not in current:
+            method = create_network_acl_entry
+        elif current[number] != rule:
+            method = replace_network_acl_entry
+        else:
+            continue
+        rule['NetworkAclId'] = nacl_id
+        upserts.append((method, rule))
+
+    deletes = []
+    for number in sorted(current):
+        if number not in wanted:
+            deletes.append((delete_network_acl_entry,
+                            {'NetworkAclId': nacl_id, 'RuleNumber': number, 'Egress': Egress}))
+    return upserts, deletes
 
 
 def process_rule_entry(entry, Egress):
@@ -288,46 +389,39 @@ def process_rule_entry(entry, Egress):
     return params
 
 
-def restore_default_associations(assoc_ids, default_nacl_id, client, module):
-    if assoc_ids:
-        params = dict()
-        params['NetworkAclId'] = default_nacl_id[0]
-        for assoc_id in assoc_ids:
-            params['AssociationId'] = assoc_id
-            restore_default_acl_association(params, client, module)
-        return True
-
-
-def construct_acl_entries(nacl, client, module):
+def construct_acl_entries(nacl_id, client, module):
+    calls = []
     for entry in module.params.get('ingress'):
         params = process_rule_entry(entry, Egress=False)
-        params['NetworkAclId'] = nacl['NetworkAcl']['NetworkAclId']
-        create_network_acl_entry(params, client, module)
+        params['NetworkAclId'] = nacl_id
+        calls.append((create_network_acl_entry, params))
     for rule in module.params.get('egress'):
         params = process_rule_entry(rule, Egress=True)
-        params['NetworkAclId'] = nacl['NetworkAcl']['NetworkAclId']
-        create_network_acl_entry(params, client, module)
+        params['NetworkAclId'] = nacl_id
+        calls.append((create_network_acl_entry, params))
+    run_calls(calls, client, module)
 
 
 ## Module invocations
 def setup_network_acl(client, module):
     changed = False
-    nacl = describe_network_acl(client, module)
-    if not nacl['NetworkAcls']:
+    vpc_nacls = describe_vpc_nacls(module.params.get('vpc_id'), client, module)
+    nacl = find_nacl_by_name(vpc_nacls, module.params.get('name'))
+    if nacl is None:
         nacl = create_network_acl(module.params.get('vpc_id'), client, module)
         nacl_id = nacl['NetworkAcl']['NetworkAclId']
         create_tags(nacl_id, client, module)
-        subnets = subnets_to_associate(nacl, client, module)
-        replace_network_acl_association(nacl_id, subnets, client, module)
-        construct_acl_entries(nacl, client, module)
+        # the entries are in place before any subnet is moved onto the NACL
+        construct_acl_entries(nacl_id, client, module)
+        subnets_changed(nacl_id, vpc_nacls, client, module)
         changed = True
-        return(changed, nacl['NetworkAcl']['NetworkAclId'])
+        return(changed, nacl_id)
     else:
         changed = False
-        nacl_id = nacl['NetworkAcls'][0]['NetworkAclId']
-        subnet_result = subnets_changed(nacl, client, module)
+        nacl_id = nacl['NetworkAclId']
         nacl_result = nacls_changed(nacl, client, module)
-        tag_result = tags_changed(nacl_id, client, module)
+        subnet_result = subnets_changed(nacl_id, vpc_nacls, client, module)
+        tag_result = tags_changed(nacl, client, module)
         if subnet_result is True or nacl_result is True or tag_result is True:
             changed = True
             return(changed, nacl_id)
@@ -338,25 +432,22 @@ def remove_network_acl(client, module):
     changed = False
     result = dict()
     vpc_id = module.params.get('vpc_id')
-    nacl = describe_network_acl(client, module)
-    if nacl['NetworkAcls']:
-        nacl_id = nacl['NetworkAcls'][0]['NetworkAclId']
-        associations = nacl['NetworkAcls'][0]['Associations']
-        assoc_ids = [a['NetworkAclAssociationId'] for a in associations]
-        default_nacl_id = find_default_vpc_nacl(vpc_id, client, module)
+    vpc_nacls = describe_vpc_nacls(vpc_id, client, module)
+    nacl = find_nacl_by_name(vpc_nacls, module.params.get('name'))
+    if nacl:
+        nacl_id = nacl['NetworkAclId']
+        assoc_ids = [a['NetworkAclAssociationId'] for a in nacl['Associations']]
+        default_nacl_id = find_default_nacl_id(vpc_nacls)
         if not default_nacl_id:
             result = {vpc_id: "Default NACL ID not found - Check the VPC ID"}
             return changed, result
-        if restore_default_associations(assoc_ids, default_nacl_id, client, module):
-            delete_network_acl(nacl_id, client, module)
-            changed = True
-            result[nacl_id] = "Successfully deleted"
-            return changed, result
-        if not assoc_ids: 
-            delete_network_acl(nacl_id, client, module)
-            changed = True
-            result[nacl_id] = "Successfully deleted"
-            return changed, result            
+        run_calls([(replace_network_acl_association,
+                    {'NetworkAclId': default_nacl_id, 'AssociationId': assoc_id})
+                   for assoc_id in assoc_ids], client, module)
+        delete_network_acl(nacl_id, client, module)
+        changed = True
+        result[nacl_id] = "Successfully deleted"
+        return changed, result
     return changed, result
 
 
@@ -406,91 +497,31 @@ def delete_tags(nacl_id, client, module):
         module.fail_json(msg=str(e))
 
 
-def describe_acl_associations(subnets, client, module):
-    if not subnets:
-        return []
-    try:
-        results = client.describe_network_acls(Filters=[
-            {'Name': 'association.subnet-id', 'Values': subnets}
-        ])
-    except botocore.exceptions.ClientError as e:
-        module.fail_json(msg=str(e))
-    associations = results['NetworkAcls'][0]['Associations']
-    return [a['NetworkAclAssociationId'] for a in associations if a['SubnetId'] in subnets]
-
-
-def describe_network_acl(client, module):
-    try:
-        nacl = client.describe_network_acls(Filters=[
-            {'Name': 'tag:Name', 'Values': [module.params.get('name')]}
-        ])
-    except botocore.exceptions.ClientError as e:
-        module.fail_json(msg=str(e))
-    return nacl
-
-
-def find_acl_by_id(nacl_id, client, module):
-    try:
-        return client.describe_network_acls(NetworkAclIds=[nacl_id])
-    except botocore.exceptions.ClientError as e:
-        module.fail_json(msg=str(e))
-
-
-def find_default_vpc_nacl(vpc_id, client, module):
+def describe_vpc_nacls(vpc_id, client, module):
     try:
         response = client.describe_network_acls(Filters=[
             {'Name': 'vpc-id', 'Values': [vpc_id]}])
     except botocore.exceptions.ClientError as e:
         module.fail_json(msg=str(e))
-    nacls = response['NetworkAcls']
-    return [n['NetworkAclId'] for n in nacls if n['IsDefault'] == True]
+    return response['NetworkAcls']
 
 
-def find_subnet_ids_by_nacl_id(nacl_id, client, module):
+def replace_network_acl_association(params, client, module):
     try:
-        results = client.describe_network_acls(Filters=[
-            {'Name': 'association.network-acl-id', 'Values': [nacl_id]}
-        ])
+        client.replace_network_acl_association(**params)
     except botocore.exceptions.ClientError as e:
         module.fail_json(msg=str(e))
-    if results['NetworkAcls']:
-        associations = results['NetworkAcls'][0]['Associations']
-        return [s['SubnetId'] for s in associations if s['SubnetId']]
-    else:
-        return []
-
-
-def replace_network_acl_association(nacl_id, subnets, client, module):
-    params = dict()
-    params['NetworkAclId'] = nacl_id
-    for association in describe_acl_associations(subnets, client, module):
-        params['AssociationId'] = association
-        try:
-            client.replace_network_acl_association(**params)
-        except botocore.exceptions.ClientError as e:
-            module.fail_json(msg=str(e))
-
-
-def replace_network_acl_entry(entries, Egress, nacl_id, client, module):
-    params = dict()
-    for entry in entries:
-        params = entry
-        params['NetworkAclId'] = nacl_id
-        try:
-            client.replace_network_acl_entry(**params)
-        except botocore.exceptions.ClientError as e:
-            module.fail_json(msg=str(e))
 
 
-def restore_default_acl_association(params, client, module):
+def replace_network_acl_entry(params, client, module):
     try:
-        client.replace_network_acl_association(**params)
+        client.replace_network_acl_entry(**params)
     except botocore.exceptions.ClientError as e:
         module.fail_json(msg=str(e))
 
 
-def subnets_to_associate(nacl, client, module):
-    params = list(module.params.get('subnets'))
+def subnets_to_associate(client, module):
+    params = list(module.params.get('subnets') or [])
     if not params:
         return []
     if params[0].startswith("subnet-"):
@@ -505,22 +536,70 @@ def subnets_to_associate(nacl, client, module):
                 {'Name': 'tag:Name', 'Values': params}])
         except botocore.exceptions.ClientError as e:
             module.fail_json(msg=str(e))
-    return [s['SubnetId'] for s in subnets['Subnets'] if s['SubnetId']]    
+    return [s['SubnetId'] for s in subnets['Subnets'] if s['SubnetId']]
+
+
+def converge_nacls(client, module, invocations):
+    """
+    Converges every item of nacls. The network ACLs of different VPCs are
+    converged concurrently, those of one VPC one after the other since
+    moving a subnet invalidates its association id.
+    """
+    vpc_ids = []
+    vpc_items = dict()
+    for (index, item) in enumerate(module.params.get('nacls')):
+        if not isinstance(item, dict):
+            module.fail_json(msg="Each item of nacls must be a dict")
+        params = dict((key, item.get(key, module.params.get(key))) for key in NACL_KEYS)
+        for key in ('name', 'vpc_id'):
+            if not params[key]:
+                module.fail_json(msg="Item %d of nacls has no %s" % (index, key))
+        if params['state'] not in invocations:
+            module.fail_json(msg="state of %s must be present or absent" % params['name'])
+        for key in ('subnets', 'ingress', 'egress'):
+            if params[key] is None:
+                params[key] = list()
+        if params['vpc_id'] not in vpc_items:
+            vpc_ids.append(params['vpc_id'])
+            vpc_items[params['vpc_id']] = []
+        vpc_items[params['vpc_id']].append((index, params))
+
+    results = [None] * len(module.params.get('nacls'))
+
+    def converge_vpc(vpc_id):
+        for (index, params) in vpc_items[vpc_id]:
+            try:
+                (changed, nacl_id) = invocations[params['state']](client, NaclModule(module, params))
+            except NaclError as e:
+                raise NaclError("%s: %s" % (params['name'], e))
+            results[index] = dict(name=params['name'], vpc_id=vpc_id, changed=changed, nacl_id=nacl_id)
+
+    try:
+        run_concurrently(converge_vpc, vpc_ids, module.params.get('concurrency'))
+    except NaclError as e:
+        done = [result for result in results if result is not None]
+        module.fail_json(msg=str(e), changed=any(r['changed'] for r in done), nacls=done)
+
+    module.exit_json(changed=any(r['changed'] for r in results), nacls=results)
 
 
 def main():
     argument_spec = ec2_argument_spec()
     argument_spec.update(dict(
-        vpc_id=dict(required=True),
-        name=dict(required=True),
+        vpc_id=dict(required=False),
+        name=dict(required=False),
         subnets=dict(required=False, type='list', default=list()),
         tags=dict(required=False, type='dict'),
         ingress=dict(required=False, type='list', default=list()),
         egress=dict(required=False, type='list', default=list(),),
         state=dict(default='present', choices=['present', 'absent']),
+        nacls=dict(required=False, type='list'),
+        concurrency=dict(required=False, type='int', default=10),
         ),
     )
-    module = AnsibleModule(argument_spec=argument_spec)
+    module = AnsibleModule(argument_spec=argument_spec,
+                           mutually_exclusive=[['name', 'nacls']],
+                           required_one_of=[['name', 'nacls']])
 
     if not HAS_BOTO3:
         module.fail_json(msg='json, botocore and boto3 are required.')
@@ -530,12 +609,20 @@ def main():
         client = boto3_conn(module, conn_type='client', resource='ec2', region=region, endpoint=ec2_url, **aws_connect_kwargs)
     except botocore.exceptions.NoCredentialsError, e:
         module.fail_json(msg="Can't authorize connection - "+str(e))
-    
+
     invocations = {
         "present": setup_network_acl,
         "absent": remove_network_acl
     }
-    (changed, results) = invocations[state](client, module)
+    if module.params.get('nacls') is not None:
+        converge_nacls(client, module, invocations)
+
+    if not module.params.get('vpc_id'):
+        module.fail_json(msg="missing required arguments: vpc_id")
+    try:
+        (changed, results) = invocations[state](client, NaclModule(module, module.params))
+    except NaclError as e:
+        module.fail_json(msg=str(e))
     module.exit_json(changed=changed, nacl_id=results)
 
 # import module snippets
@@ -41,7 +41,20 @@ options:
   routes:
     description:
       - "List of routes in the route table. Routes are specified as dicts containing the keys 'dest' and one of 'gateway_id', 'instance_id', 'interface_id', or 'vpc_peering_connection_id'. If 'gateway_id' is specified, you can refer to the VPC's IGW by using the value 'igw'."
+      - "Routes are matched to the existing routes by destination. A route whose destination exists with another target is replaced in place."
     required: true
+  route_tables:
+    description:
+      - "A list of route tables to manage in one task, each a dict with any of the I(lookup), I(propagating_vgw_ids), I(route_table_id), I(routes), I(state), I(subnets), I(tags) and I(vpc_id) options, which default to the options of the task. The route tables are reconciled concurrently, and the subnets, Internet gateway and route tables of each VPC are looked up once for all of them."
+    required: false
+    default: null
+    version_added: "2.3"
+  concurrency:
+    description:
+      - "Maximum number of route tables of I(route_tables) reconciled at once."
+    required: false
+    default: 10
+    version_added: "2.3"
   state:
     description:
       - "Create or destroy the VPC route table"
@@ -60,8 +73,8 @@ options:
     aliases: [ "resource_tags" ]
   vpc_id:
     description:
-      - "VPC ID of the VPC in which to create the route table."
-    required: true
+      - "VPC ID of the VPC in which to create the route table. Required unless every item of I(route_tables) has a I(vpc_id)."
+    required: false
 extends_documentation_fragment:
     - aws
     - ec2
@@ -101,11 +114,31 @@ EXAMPLES = '''
         instance_id: "{{ nat.instance_id }}"
   register: nat_route_table
 
+- name: Set up the route tables of all the availability zones
+  ec2_vpc_route_table:
+    vpc_id: vpc-1245678
+    region: us-west-1
+    route_tables:
+      - tags:
+          Name: Private-a
+        subnets: [ 'Private Subnet A' ]
+        routes:
+          - dest: 0.0.0.0/0
+            instance_id: "{{ nat_a.instance_id }}"
+      - tags:
+          Name: Private-b
+        subnets: [ 'Private Subnet B' ]
+        routes:
+          - dest: 0.0.0.0/0
+            instance_id: "{{ nat_b.instance_id }}"
+  register: private_route_tables
+
 '''
 
 
 import sys  # noqa
 import re
+import threading
 
 try:
     import boto.ec2
@@ -138,60 +171,118 @@ SUBNET_RE = re.compile('^subnet-[A-z0-9]+$')
 ROUTE_TABLE_RE = re.compile('^rtb-[A-z0-9]+$')
 
 
-def find_subnets(vpc_conn, vpc_id, identified_subnets):
+ROUTE_TABLE_KEYS = ['lookup', 'propagating_vgw_ids', 'route_table_id', 'routes', 'state',
+                    'subnets', 'tags', 'vpc_id']
+
+
+class VpcLookupCache(object):
+    """
+    Looks up the subnets, Internet gateway and route tables of every VPC once,
+    and shares them between all the route tables managed by the task.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._results = {}
+
+    def _lookup(self, key, func):
+        self._lock.acquire()
+        try:
+            if key not in self._results:
+                self._results[key] = func()
+            return self._results[key]
+        finally:
+            self._lock.release()
+
+    def subnets(self, vpc_conn, vpc_id):
+        return self._lookup(('subnets', vpc_id),
+                            lambda: vpc_conn.get_all_subnets(filters={'vpc_id': vpc_id}))
+
+    def igw(self, vpc_conn, vpc_id):
+        return self._lookup(('igw', vpc_id), lambda: find_igw(vpc_conn, vpc_id))
+
+    def route_tables(self, vpc_conn, vpc_id):
+        return self._lookup(('route_tables', vpc_id),
+                            lambda: vpc_conn.get_all_route_tables(filters={'vpc_id': vpc_id}))
+
+
+def run_concurrently(func, items, limit):
+    """ Call func for every item with at most limit calls in flight and
+    return the results in the order of items, or the exception raised
+    """
+    results = [None] * len(items)
+    pending = list(enumerate(items))
+    lock = threading.Lock()
+
+    def worker():
+        while True:
+            lock.acquire()
+            try:
+                if not pending:
+                    return
+                (index, item) = pending.pop(0)
+            finally:
+                lock.release()
+            try:
+                results[index] = func(item)
+            except Exception as e:
+                results[index] = e
+
+    threads = []
+    for i in range(max(1, min(limit, len(items)))):
+        thread = threading.Thread(target=worker)
+        thread.start()
+        threads.append(thread)
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def find_subnets(vpc_conn, vpc_id, identified_subnets, cache=None):
     """
     Finds a list of subnets, each identified either by a raw ID, a unique
     'Name' tag, or a CIDR such as 10.0.0.0/8.
 
+    All the subnets of the VPC are listed once, through the cache when given.
+
     Note that this function is duplicated in other ec2 modules, and should
     potentially be moved into potentially be moved into a shared module_utils
     """
-    subnet_ids = []
-    subnet_names = []
-    subnet_cidrs = []
+    if cache is None:
+        cache = VpcLookupCache()
+
+    subnets_by_id = {}
+    subnets_by_cidr = {}
+    subnets_by_name = {}
+    for subnet in cache.subnets(vpc_conn, vpc_id):
+        subnets_by_id[subnet.id] = subnet
+        subnets_by_cidr[subnet.cidr_block] = subnet
+        if 'Name' in subnet.tags:
+            subnets_by_name.setdefault(subnet.tags['Name'], []).append(subnet)
+
+    subnets = []
     for subnet in (identified_subnets or []):
         if re.match(SUBNET_RE, subnet):
-            subnet_ids.append(subnet)
-        elif re.match(CIDR_RE, subnet):
-            subnet_cidrs.append(subnet)
-        else:
-            subnet_names.append(subnet)
-
-    subnets_by_id = []
-    if subnet_ids:
-        subnets_by_id = vpc_conn.get_all_subnets(
-            subnet_ids, filters={'vpc_id': vpc_id})
-
-        for subnet_id in subnet_ids:
-            if not any(s.id == subnet_id for s in subnets_by_id):
+            if subnet not in subnets_by_id:
                 raise AnsibleSubnetSearchException(
-                    'Subnet ID "{0}" does not exist'.format(subnet_id))
-
-    subnets_by_cidr = []
-    if subnet_cidrs:
-        subnets_by_cidr = vpc_conn.get_all_subnets(
-            filters={'vpc_id': vpc_id, 'cidr': subnet_cidrs})
-
-        for cidr in subnet_cidrs:
-            if not any(s.cidr_block == cidr for s in subnets_by_cidr):
+                    'Subnet ID "{0}" does not exist'.format(subnet))
+            subnets.append(subnets_by_id[subnet])
+        elif re.match(CIDR_RE, subnet):
+            if subnet not in subnets_by_cidr:
                 raise AnsibleSubnetSearchException(
-                    'Subnet CIDR "{0}" does not exist'.format(subnet_cidr))
-
-    subnets_by_name = []
-    if subnet_names:
-        subnets_by_name = vpc_conn.get_all_subnets(
-            filters={'vpc_id': vpc_id, 'tag:Name': subnet_names})
-
-        for name in subnet_names:
-            matching = [s.tags.get('Name') == name for s in subnets_by_name]
+                    'Subnet CIDR "{0}" does not exist'.format(subnet))
+            subnets.append(subnets_by_cidr[subnet])
+        else:
+            matching = subnets_by_name.get(subnet, [])
             if len(matching) == 0:
                 raise AnsibleSubnetSearchException(
-                    'Subnet named "{0}" does not exist'.format(name))
+                    'Subnet named "{0}" does not exist'.format(subnet))
             elif len(matching) > 1:
                 raise AnsibleSubnetSearchException(
-                    'Multiple subnets named "{0}"'.format(name))
+                    'Multiple subnets named "{0}"'.format(subnet))
+            subnets.append(matching[0])
 
-    return subnets_by_id + subnets_by_cidr + subnets_by_name
+    return subnets
 
 
 def find_igw(vpc_conn, vpc_id):
@@ -257,14 +348,16 @@ def get_route_table_by_id(vpc_conn, vpc_id, route_table_id):
 
     return route_table
 
-def get_route_table_by_tags(vpc_conn, vpc_id, tags):
+def get_route_table_by_tags(vpc_conn, vpc_id, tags, cache=None):
+
+    if cache is None:
+        cache = VpcLookupCache()
 
     count = 0
     route_table = None
-    route_tables = vpc_conn.get_all_route_tables(filters={'vpc_id': vpc_id})
-    for table in route_tables:
-        this_tags = get_resource_tags(vpc_conn, table.id)
-        if tags_match(tags, this_tags):
+    # the tags come with the route tables, no need to look them up one by one
+    for table in cache.route_tables(vpc_conn, vpc_id):
+        if tags_match(tags, table.tags):
             route_table = table
             count +=1
 
@@ -294,22 +387,31 @@ def rename_key(d, old_key, new_key):
     del d[old_key]
 
 
-def index_of_matching_route(route_spec, routes_to_match):
-    for i, route in enumerate(routes_to_match):
-        if route_spec_matches_route(route_spec, route):
-            return i
-
-
 def ensure_routes(vpc_conn, route_table, route_specs, propagating_vgw_ids,
                   check_mode):
-    routes_to_match = list(route_table.routes)
+    # the routes not matched yet, by destination
+    unmatched_routes = {}
+    for route in route_table.routes:
+        unmatched_routes.setdefault(route.destination_cidr_block, []).append(route)
+
     route_specs_to_create = []
+    route_specs_to_replace = []
     for route_spec in route_specs:
-        i = index_of_matching_route(route_spec, routes_to_match)
-        if i is None:
-            route_specs_to_create.append(route_spec)
+        routes = unmatched_routes.get(route_spec['destination_cidr_block'], [])
+        matching = [r for r in routes if route_spec_matches_route(route_spec, r)]
+        if matching:
+            routes.remove(matching[0])
+        elif routes and routes[0].gateway_id != 'local' and \
+                routes[0].gateway_id not in (propagating_vgw_ids or []):
+            # same destination with another target, update it in place
+            routes.pop(0)
+            route_specs_to_replace.append(route_spec)
         else:
-            del routes_to_match[i]
+            route_specs_to_create.append(route_spec)
+
+    routes_to_match = []
+    for routes in unmatched_routes.values():
+        routes_to_match.extend(routes)
 
     # NOTE: As of boto==2.38.0, the origin of a route is not available
     # (for example, whether it came from a gateway with route propagation
@@ -322,8 +424,19 @@ def ensure_routes(vpc_conn, route_table, route_specs, propagating_vgw_ids,
                         and (propagating_vgw_ids is not None
                              and r.gateway_id not in propagating_vgw_ids)]
 
-    changed = routes_to_delete or route_specs_to_create
+    changed = routes_to_delete or route_specs_to_create or route_specs_to_replace
     if changed:
+        for route_spec in route_specs_to_replace:
+            try:
+                vpc_conn.replace_route(route_table.id,
+                                       dry_run=check_mode,
+                                       **route_spec)
+            except EC2ResponseError as e:
+                if e.error_code == 'DryRunOperation':
+                    pass
+                else:
+                    raise
+
         for route_spec in route_specs_to_create:
             try:
                 vpc_conn.create_route(route_table.id,
@@ -411,39 +524,45 @@ def ensure_propagation(vpc_conn, route_table, propagating_vgw_ids,
     return {'changed': changed}
 
 
-def ensure_route_table_absent(connection, module):
+def find_route_table(connection, params, cache):
 
-    lookup = module.params.get('lookup')
-    route_table_id = module.params.get('route_table_id')
-    tags = module.params.get('tags')
-    vpc_id = module.params.get('vpc_id')
+    lookup = params.get('lookup')
+    route_table_id = params.get('route_table_id')
+    tags = params.get('tags')
+    vpc_id = params.get('vpc_id')
 
+    route_table = None
     if lookup == 'tag':
         if tags is not None:
             try:
-                route_table = get_route_table_by_tags(connection, vpc_id, tags)
+                route_table = get_route_table_by_tags(connection, vpc_id, tags, cache)
             except EC2ResponseError as e:
-                module.fail_json(msg=e.message)
+                raise AnsibleRouteTableException(e.message)
             except RuntimeError as e:
-                module.fail_json(msg=e.args[0])
-        else:
-            route_table = None
+                raise AnsibleRouteTableException(e.args[0])
     elif lookup == 'id':
         try:
             route_table = get_route_table_by_id(connection, vpc_id, route_table_id)
         except EC2ResponseError as e:
-            module.fail_json(msg=e.message)
+            raise AnsibleRouteTableException(e.message)
+
+    return route_table
+
+
+def ensure_route_table_absent(connection, params, check_mode, cache):
+
+    route_table = find_route_table(connection, params, cache)
 
     if route_table is None:
         return {'changed': False}
 
     try:
-        connection.delete_route_table(route_table.id, dry_run=module.check_mode)
+        connection.delete_route_table(route_table.id, dry_run=check_mode)
     except EC2ResponseError as e:
         if e.error_code == 'DryRunOperation':
             pass
         else:
-            module.fail_json(msg=e.message)
+            raise AnsibleRouteTableException(e.message)
 
     return {'changed': True}
 
@@ -463,83 +582,74 @@ def get_route_table_info(route_table):
 
     return route_table_info
 
-def create_route_spec(connection, routes, vpc_id):
+def create_route_spec(connection, routes, vpc_id, cache=None):
+
+    if cache is None:
+        cache = VpcLookupCache()
 
-    for route_spec in routes:
+    route_specs = []
+    for route_spec in (routes or []):
+        route_spec = dict(route_spec)
         rename_key(route_spec, 'dest', 'destination_cidr_block')
 
         if 'gateway_id' in route_spec and route_spec['gateway_id'] and \
                 route_spec['gateway_id'].lower() == 'igw':
-            igw = find_igw(connection, vpc_id)
-            route_spec['gateway_id'] = igw
+            route_spec['gateway_id'] = cache.igw(connection, vpc_id)
+        route_specs.append(route_spec)
 
-    return routes
+    return route_specs
 
-def ensure_route_table_present(connection, module):
+def ensure_route_table_present(connection, params, check_mode, cache):
 
-    lookup = module.params.get('lookup')
-    propagating_vgw_ids = module.params.get('propagating_vgw_ids')
-    route_table_id = module.params.get('route_table_id')
-    subnets = module.params.get('subnets')
-    tags = module.params.get('tags')
-    vpc_id = module.params.get('vpc_id')
-    try:
-        routes = create_route_spec(connection, module.params.get('routes'), vpc_id)
-    except AnsibleIgwSearchException as e:
-        module.fail_json(msg=e[0])
+    propagating_vgw_ids = params.get('propagating_vgw_ids')
+    subnets = params.get('subnets')
+    tags = params.get('tags')
+    vpc_id = params.get('vpc_id')
+    routes = None
+    if params.get('routes') is not None:
+        try:
+            routes = create_route_spec(connection, params.get('routes'), vpc_id, cache)
+        except EC2ResponseError as e:
+            raise AnsibleRouteTableException(e.message)
 
     changed = False
     tags_valid = False
 
-    if lookup == 'tag':
-        if tags is not None:
-            try:
-                route_table = get_route_table_by_tags(connection, vpc_id, tags)
-            except EC2ResponseError as e:
-                module.fail_json(msg=e.message)
-            except RuntimeError as e:
-                module.fail_json(msg=e.args[0])
-        else:
-            route_table = None
-    elif lookup == 'id':
-        try:
-            route_table = get_route_table_by_id(connection, vpc_id, route_table_id)
-        except EC2ResponseError as e:
-            module.fail_json(msg=e.message)
+    route_table = find_route_table(connection, params, cache)
 
     # If no route table returned then create new route table
     if route_table is None:
         try:
-            route_table = connection.create_route_table(vpc_id, module.check_mode)
+            route_table = connection.create_route_table(vpc_id, check_mode)
             changed = True
         except EC2ResponseError as e:
             if e.error_code == 'DryRunOperation':
-                module.exit_json(changed=True)
+                return {'changed': True}
 
-            module.fail_json(msg=e.message)
+            raise AnsibleRouteTableException(e.message)
 
     if routes is not None:
         try:
-            result = ensure_routes(connection, route_table, routes, propagating_vgw_ids, module.check_mode)
+            result = ensure_routes(connection, route_table, routes, propagating_vgw_ids, check_mode)
             changed = changed or result['changed']
         except EC2ResponseError as e:
-            module.fail_json(msg=e.message)
+            raise AnsibleRouteTableException(e.message)
 
     if propagating_vgw_ids is not None:
         result = ensure_propagation(connection, route_table,
                                     propagating_vgw_ids,
-                                    check_mode=module.check_mode)
+                                    check_mode=check_mode)
         changed = changed or result['changed']
 
     if not tags_valid and tags is not None:
         result = ensure_tags(connection, route_table.id, tags,
-                             add_only=True, check_mode=module.check_mode)
+                             add_only=True, check_mode=check_mode)
         changed = changed or result['changed']
 
     if subnets:
         associated_subnets = []
         try:
-            associated_subnets = find_subnets(connection, vpc_id, subnets)
+            associated_subnets = find_subnets(connection, vpc_id, subnets, cache)
         except EC2ResponseError as e:
             raise AnsibleRouteTableException(
                 'Unable to find subnets for route table {0}, error: {1}'
@@ -547,7 +657,7 @@ def ensure_route_table_present(connection, module):
             )
 
         try:
-            result = ensure_subnet_associations(connection, vpc_id, route_table, associated_subnets, module.check_mode)
+            result = ensure_subnet_associations(connection, vpc_id, route_table, associated_subnets, check_mode)
             changed = changed or result['changed']
         except EC2ResponseError as e:
             raise AnsibleRouteTableException(
@@ -555,7 +665,55 @@ def ensure_route_table_present(connection, module):
                 .format(route_table, e)
             )
 
-    module.exit_json(changed=changed, route_table=get_route_table_info(route_table))
+    return {'changed': changed, 'route_table': get_route_table_info(route_table)}
+
+
+def ensure_route_table(connection, params, check_mode, cache):
+
+    if params.get('vpc_id') is None:
+        raise AnsibleRouteTableException("You must specify vpc_id")
+    if params.get('lookup') == 'id' and params.get('route_table_id') is None:
+        raise AnsibleRouteTableException("You must specify route_table_id if lookup is set to id")
+
+    if params.get('state') == 'present':
+        return ensure_route_table_present(connection, params, check_mode, cache)
+    elif params.get('state') == 'absent':
+        return ensure_route_table_absent(connection, params, check_mode, cache)
+    raise AnsibleRouteTableException("state must be present or absent, got {0}".format(params.get('state')))
+
+
+def ensure_route_tables(connection, module, region, aws_connect_params):
+    """
+    Reconciles all the route tables of the route_tables option concurrently,
+    each thread with its own connection and all of them with a shared cache
+    of the lookups of every VPC.
+    """
+    tables = []
+    for table in module.params.get('route_tables'):
+        if not isinstance(table, dict):
+            module.fail_json(msg="Each item of route_tables must be a dict")
+        tables.append(dict((key, table.get(key, module.params.get(key))) for key in ROUTE_TABLE_KEYS))
+
+    cache = VpcLookupCache()
+    local = threading.local()
+
+    def reconcile(params):
+        if not hasattr(local, 'connection'):
+            local.connection = connect_to_aws(boto.vpc, region, **aws_connect_params)
+        return ensure_route_table(local.connection, params, module.check_mode, cache)
+
+    results = run_concurrently(reconcile, tables, module.params.get('concurrency'))
+
+    errors = []
+    for (i, result) in enumerate(results):
+        if isinstance(result, Exception):
+            errors.append('route_tables[{0}]: {1}'.format(i, result))
+            results[i] = {'changed': False, 'msg': str(result)}
+    changed = any(result['changed'] for result in results)
+    if errors:
+        module.fail_json(msg='; '.join(errors), changed=changed, route_tables=results)
+
+    module.exit_json(changed=changed, route_tables=results)
 
 
 def main():
@@ -569,7 +727,9 @@ def main():
             state = dict(default='present', choices=['present', 'absent']),
             subnets = dict(default=None, required=False, type='list'),
             tags = dict(default=None, required=False, type='dict', aliases=['resource_tags']),
-            vpc_id = dict(default=None, required=True)
+            vpc_id = dict(default=None, required=False),
+            route_tables = dict(default=None, required=False, type='list'),
+            concurrency = dict(default=10, required=False, type='int')
         )
     )
 
@@ -588,18 +748,11 @@ def main():
     else:
         module.fail_json(msg="region must be specified")
 
-    lookup = module.params.get('lookup')
-    route_table_id = module.params.get('route_table_id')
-    state = module.params.get('state', 'present')
-
-    if lookup == 'id' and route_table_id is None:
-        module.fail_json("You must specify route_table_id if lookup is set to id")
+    if module.params.get('route_tables') is not None:
+        ensure_route_tables(connection, module, region, aws_connect_params)
 
     try:
-        if state == 'present':
-            result = ensure_route_table_present(connection, module)
-        elif state == 'absent':
-            result = ensure_route_table_absent(connection, module)
+        result = ensure_route_table(connection, module.params, module.check_mode, VpcLookupCache())
     except AnsibleRouteTableException as e:
         module.fail_json(msg=str(e))
 
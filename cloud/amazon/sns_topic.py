@@ -27,8 +27,8 @@ author:
 options:
   name:
     description:
-      - The name or ARN of the SNS topic to converge
-    required: True
+      - The name or ARN of the SNS topic to converge. Required unless I(topics) is given.
+    required: False
   state:
     description:
       - Whether to create or destroy an SNS topic
@@ -66,6 +66,21 @@ options:
         Blame Amazon."
     required: False
     default: True
+  topics:
+    description:
+      - A list of topics to converge in one task, each a dict with the I(name) and optionally
+        the I(state), I(display_name), I(policy), I(delivery_policy), I(subscriptions) and
+        I(purge_subscriptions) of the topic, which default to the options of the task.
+        The topics of the account are listed once for all of them.
+    required: False
+    default: None
+    version_added: "2.3"
+notes:
+  - Without I(topics), the ARN of the topic is built from the account and region of the
+    first page of topics and checked with a single get_topic_attributes call, instead of
+    listing every topic of the account.
+  - Subscriptions are compared as sets and the subscribe and unsubscribe calls are made
+    concurrently.
 extends_documentation_fragment: aws
 requirements: [ "boto" ]
 """
@@ -94,6 +109,19 @@ EXAMPLES = """
       - endpoint: "my_mobile_number"
         protocol: "sms"
 
+- name: Create the SNS topics of all the services
+  sns_topic:
+    purge_subscriptions: False
+    topics:
+      - name: "billing-events"
+        subscriptions:
+          - endpoint: "https://billing.example.com/sns"
+            protocol: "https"
+      - name: "audit-events"
+        display_name: "audit"
+      - name: "legacy-events"
+        state: absent
+
 """
 
 RETURN = '''
@@ -120,12 +148,23 @@ sns_topic:
       topic_created: false
       topic_deleted: false
       attributes_set: []
+
+sns_topics:
+    description: The sns_arn and sns_topic details of every topic, in the order of I(topics)
+    returned: when topics is given
+    type: list
+    sample:
+      - sns_arn: "arn:aws:sns:us-east-1:123456789012:billing-events"
+        sns_topic:
+          name: billing-events
+          topic_created: true
 '''
 
 import sys
 import time
 import json
 import re
+import threading
 
 try:
     import boto.sns
@@ -134,6 +173,44 @@ try:
 except ImportError:
     HAS_BOTO = False
 
+# subscribe and unsubscribe calls in flight at once
+SUBSCRIPTION_CONCURRENCY = 10
+
+TOPIC_KEYS = ['name', 'state', 'display_name', 'policy', 'delivery_policy',
+              'subscriptions', 'purge_subscriptions']
+
+
+def run_concurrently(func, items, limit):
+    """ Call func for every item with at most limit calls in flight and
+    return the results in the order of items, or the exception raised
+    """
+    results = [None] * len(items)
+    pending = list(enumerate(items))
+    lock = threading.Lock()
+
+    def worker():
+        while True:
+            lock.acquire()
+            try:
+                if not pending:
+                    return
+                (index, item) = pending.pop(0)
+            finally:
+                lock.release()
+            try:
+                results[index] = func(item)
+            except Exception, err:
+                results[index] = err
+
+    threads = []
+    for i in range(max(1, min(limit, len(items)))):
+        thread = threading.Thread(target=worker)
+        thread.start()
+        threads.append(thread)
+    for thread in threads:
+        thread.join()
+    return results
+
 
 class SnsTopicManager(object):
     """ Handles SNS Topic creation and destruction """
@@ -149,6 +226,7 @@ class SnsTopicManager(object):
                  purge_subscriptions,
                  check_mode,
                  region,
+                 topic_arns=None,
                  **aws_connect_params):
 
         self.region = region
@@ -171,6 +249,9 @@ class SnsTopicManager(object):
         self.topic_deleted = False
         self.arn_topic = None
         self.attributes_set = []
+        # name to ARN of all the topics, when they were listed once for many topics
+        self.topic_arns = topic_arns
+        self.topic_attributes = None
 
     def _get_boto_connection(self):
         try:
@@ -186,7 +267,7 @@ class SnsTopicManager(object):
             try:
                 response = self.connection.get_all_topics(next_token)
             except BotoServerError, err:
-                module.fail_json(msg=err.message)
+                self.module.fail_json(msg=err.message)
             topics.extend(response['ListTopicsResponse']['ListTopicsResult']['Topics'])
             next_token = response['ListTopicsResponse']['ListTopicsResult']['NextToken']
             if not next_token:
@@ -194,39 +275,74 @@ class SnsTopicManager(object):
         return [t['TopicArn'] for t in topics]
 
 
+    def _arn_prefix(self):
+        """ Returns the arn:<partition>:sns:<region>:<account>: prefix of the
+        topics of the account, read from the first page of topics, or None
+        when the account has no topic in the region """
+        try:
+            response = self.connection.get_all_topics()
+        except BotoServerError, err:
+            self.module.fail_json(msg=err.message)
+        topics = response['ListTopicsResponse']['ListTopicsResult']['Topics']
+        if not topics:
+            return None
+        return topics[0]['TopicArn'].rsplit(':', 1)[0] + ':'
+
+
+    def _get_topic_attributes(self, arn):
+        return self.connection.get_topic_attributes(arn) \
+            ['GetTopicAttributesResponse'] ['GetTopicAttributesResult'] \
+            ['Attributes']
+
+
     def _arn_topic_lookup(self):
         # topic names cannot have colons, so this captures the full topic name
-        all_topics = self._get_all_topics()
-        lookup_topic = ':%s' % self.name
-        for topic in all_topics:
-            if topic.endswith(lookup_topic):
-                return topic
+        topic_name = self.name.split(':')[-1]
+        if self.topic_arns is not None:
+            return self.topic_arns.get(topic_name)
+
+        if self.name.startswith('arn:'):
+            arn = self.name
+        else:
+            prefix = self._arn_prefix()
+            if prefix is None:
+                return None
+            arn = prefix + topic_name
+        try:
+            self.topic_attributes = self._get_topic_attributes(arn)
+        except BotoServerError, err:
+            if err.status == 404 or err.error_code == 'NotFound':
+                return None
+            self.module.fail_json(msg=err.message)
+        return arn
 
 
     def _create_topic(self):
         self.changed = True
         self.topic_created = True
         if not self.check_mode:
-            self.connection.create_topic(self.name)
-            self.arn_topic = self._arn_topic_lookup()
-            while not self.arn_topic:
-                time.sleep(3)
-                self.arn_topic = self._arn_topic_lookup()
+            response = self.connection.create_topic(self.name.split(':')[-1])
+            self.arn_topic = response['CreateTopicResponse']['CreateTopicResult']['TopicArn']
 
 
     def _set_topic_attrs(self):
-        topic_attributes = self.connection.get_topic_attributes(self.arn_topic) \
-            ['GetTopicAttributesResponse'] ['GetTopicAttributesResult'] \
-            ['Attributes']
-
-        if self.display_name and self.display_name != topic_attributes['DisplayName']:
+        if not self.arn_topic:
+            # the topic would be created, outside of check mode
+            topic_attributes = {}
+        elif self.topic_attributes is not None:
+            topic_attributes = self.topic_attributes
+        else:
+            topic_attributes = self._get_topic_attributes(self.arn_topic)
+
+        if self.display_name and self.display_name != topic_attributes.get('DisplayName'):
             self.changed = True
             self.attributes_set.append('display_name')
             if not self.check_mode:
                 self.connection.set_topic_attributes(self.arn_topic, 'DisplayName',
                     self.display_name)
 
-        if self.policy and self.policy != json.loads(topic_attributes['Policy']):
+        if self.policy and ('Policy' not in topic_attributes or \
+           self.policy != json.loads(topic_attributes['Policy'])):
             self.changed = True
             self.attributes_set.append('policy')
             if not self.check_mode:
@@ -249,6 +365,8 @@ class SnsTopicManager(object):
 
 
     def _get_topic_subs(self):
+        if not self.arn_topic:
+            return
         next_token = None
         while True:
             response = self.connection.get_all_subscriptions_by_topic(self.arn_topic, next_token)
@@ -259,40 +377,63 @@ class SnsTopicManager(object):
             if not next_token:
                 break
 
+    def _run_calls(self, calls):
+        """ Make the (method, args) calls concurrently, each thread with its
+        own connection """
+        local = threading.local()
+
+        def call(item):
+            if not hasattr(local, 'connection'):
+                local.connection = self._get_boto_connection()
+            (method, args) = item
+            return getattr(local.connection, method)(*args)
+
+        for result in run_concurrently(call, calls, SUBSCRIPTION_CONCURRENCY):
+            if isinstance(result, BotoServerError):
+                self.module.fail_json(msg=result.message)
+            elif isinstance(result, Exception):
+                self.module.fail_json(msg=str(result))
+
+
     def _set_topic_subs(self):
-        subscriptions_existing_list = []
-        desired_subscriptions = [(sub['protocol'],
+        desired_subscriptions = set([(sub['protocol'],
             self._canonicalize_endpoint(sub['protocol'], sub['endpoint'])) for sub in
-            self.subscriptions]
-
-        if self.subscriptions_existing:
-            for sub in self.subscriptions_existing:
-                sub_key = (sub['Protocol'], sub['Endpoint'])
-                subscriptions_existing_list.append(sub_key)
-                if self.purge_subscriptions and sub_key not in desired_subscriptions and \
-                    sub['SubscriptionArn'] != 'PendingConfirmation':
-                    self.changed = True
+            self.subscriptions])
+
+        subscriptions_existing = {}
+        for sub in self.subscriptions_existing:
+            sub_key = (sub['Protocol'], sub['Endpoint'])
+            subscriptions_existing.setdefault(sub_key, []).append(sub['SubscriptionArn'])
+
+        calls = []
+        if self.purge_subscriptions:
+            for sub_key in sorted(set(subscriptions_existing) - desired_subscriptions):
+                arns = [arn for arn in subscriptions_existing[sub_key] if arn != 'PendingConfirmation']
+                if arns:
                     self.subscriptions_deleted.append(sub_key)
-                    if not self.check_mode:
-                        self.connection.unsubscribe(sub['SubscriptionArn'])
+                    calls.extend([('unsubscribe', (arn,)) for arn in arns])
 
-        for (protocol, endpoint) in desired_subscriptions:
-            if (protocol, endpoint) not in subscriptions_existing_list:
-                self.changed = True
-                self.subscriptions_added.append(sub)
-                if not self.check_mode:
-                    self.connection.subscribe(self.arn_topic, protocol, endpoint)
+        for (protocol, endpoint) in sorted(desired_subscriptions - set(subscriptions_existing)):
+            self.subscriptions_added.append((protocol, endpoint))
+            calls.append(('subscribe', (self.arn_topic, protocol, endpoint)))
+
+        if calls:
+            self.changed = True
+            if not self.check_mode:
+                self._run_calls(calls)
 
 
     def _delete_subscriptions(self):
         # NOTE: subscriptions in 'PendingConfirmation' timeout in 3 days
         #       https://forums.aws.amazon.com/thread.jspa?threadID=85993
+        calls = []
         for sub in self.subscriptions_existing:
             if sub['SubscriptionArn'] != 'PendingConfirmation':
                 self.subscriptions_deleted.append(sub['SubscriptionArn'])
                 self.changed = True
-                if not self.check_mode:
-                    self.connection.unsubscribe(sub['SubscriptionArn'])
+                calls.append(('unsubscribe', (sub['SubscriptionArn'],)))
+        if calls and not self.check_mode:
+            self._run_calls(calls)
 
 
     def _delete_topic(self):
@@ -306,6 +447,8 @@ class SnsTopicManager(object):
         self.arn_topic = self._arn_topic_lookup()
         if not self.arn_topic:
             self._create_topic()
+            if self.arn_topic and self.topic_arns is not None:
+                self.topic_arns[self.arn_topic.split(':')[-1]] = self.arn_topic
         self._set_topic_attrs()
         self._get_topic_subs()
         self._set_topic_subs()
@@ -317,6 +460,8 @@ class SnsTopicManager(object):
            if self.subscriptions_existing:
                self._delete_subscriptions()
            self._delete_topic()
+           if self.topic_arns is not None and not self.check_mode:
+               del self.topic_arns[self.arn_topic.split(':')[-1]]
 
 
     def get_info(self):
@@ -340,12 +485,56 @@ class SnsTopicManager(object):
         return info
 
 
+def ensure_topics(module, region, aws_connect_params):
+    """ Converge all the topics of the topics option, from a single listing
+    of the topics of the account """
+    topic_arns = None
+    changed = False
+    sns_topics = []
+    for topic in module.params.get('topics'):
+        if not isinstance(topic, dict) or not topic.get('name'):
+            module.fail_json(msg="Each item of topics must be a dict with a name")
+        params = dict((key, topic.get(key, module.params.get(key))) for key in TOPIC_KEYS)
+        if params['state'] not in ('present', 'absent'):
+            module.fail_json(msg="state of topic %s must be present or absent" % params['name'])
+        if params['subscriptions'] is None:
+            params['subscriptions'] = []
+        params['purge_subscriptions'] = module.boolean(params['purge_subscriptions'])
+
+        sns_topic = SnsTopicManager(module,
+                                    params['name'],
+                                    params['state'],
+                                    params['display_name'],
+                                    params['policy'],
+                                    params['delivery_policy'],
+                                    params['subscriptions'],
+                                    params['purge_subscriptions'],
+                                    module.check_mode,
+                                    region,
+                                    topic_arns,
+                                    **aws_connect_params)
+        if topic_arns is None:
+            topic_arns = dict((arn.split(':')[-1], arn) for arn in sns_topic._get_all_topics())
+            sns_topic.topic_arns = topic_arns
+
+        if params['state'] == 'present':
+            sns_topic.ensure_ok()
+        else:
+            sns_topic.ensure_gone()
+
+        changed = changed or sns_topic.changed
+        sns_topics.append(dict(sns_arn=sns_topic.arn_topic,
+                               sns_topic=sns_topic.get_info()))
+
+    module.exit_json(changed=changed, sns_topics=sns_topics)
+
 
 def main():
     argument_spec = ec2_argument_spec()
     argument_spec.update(
         dict(
-            name=dict(type='str', required=True),
+            name=dict(type='str', required=False),
+            topics=dict(type='list', required=False),
             state=dict(type='str', default='present', choices=['present',
                 'absent']),
             display_name=dict(type='str', required=False),
@@ -357,6 +546,8 @@ def main():
     )
 
     module = AnsibleModule(argument_spec=argument_spec,
+                           mutually_exclusive=[['name', 'topics']],
+                           required_one_of=[['name', 'topics']],
                            supports_check_mode=True)
 
     if not HAS_BOTO:
@@ -375,6 +566,9 @@ def main():
     if not region:
         module.fail_json(msg="region must be specified")
 
+    if module.params.get('topics') is not None:
+        ensure_topics(module, region, aws_connect_params)
+
     sns_topic = SnsTopicManager(module,
                                 name,
                                 state,
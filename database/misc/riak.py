@@ -76,6 +76,14 @@ options:
     default: None
     aliases: []
     choices: ['kv']
+  wait_timeout:
+    description:
+      - Number of seconds to wait for the Riak stats endpoint to answer and,
+        with I(wait_for_service), for the service to come online.
+    required: false
+    default: 120
+    type: 'int'
+    version_added: "2.3"
   validate_certs:
     description:
       - If C(no), SSL certificates will not be validated. This should only be used
@@ -95,6 +103,17 @@ EXAMPLES = '''
 
 # Wait for riak_kv service to startup
 - riak: wait_for_service=kv
+
+# Wait for the service, the ring and handoffs together after a rolling restart
+- riak: wait_for_service=kv wait_for_ring=600 wait_for_handoffs=1800
+'''
+
+RETURN = '''
+waited:
+    description: Seconds each requested wait condition took to hold
+    returned: when any of wait_for_handoffs, wait_for_ring or wait_for_service is set
+    type: dict
+    sample: {"handoffs": 12.5, "ring": 0.3, "service": 0.0}
 '''
 
 import time
@@ -119,6 +138,77 @@ def ring_check(module, riak_admin_bin):
     else:
         return False
 
+
+def fetch_stats(module, http_conn):
+    (response, info) = fetch_url(module, 'http://%s/stats' % (http_conn), force=True, timeout=5)
+    if info['status'] != 200:
+        return None
+    try:
+        return json.loads(response.read())
+    except:
+        module.fail_json(msg='Could not parse Riak stats.')
+
+
+def handoffs_check(module, riak_admin_bin):
+    cmd = '%s transfers' % riak_admin_bin
+    rc, out, err = module.run_command(cmd)
+    return 'No transfers active' in out
+
+
+def ring_members_connected(stats):
+    connected = [stats['nodename']] + list(stats.get('connected_nodes', []))
+    for node in stats['ring_members']:
+        if node not in connected:
+            return False
+    return True
+
+
+class ReadinessWaiter(object):
+    """Evaluate several readiness conditions together.
+
+    Every round fetches /stats once and checks all pending conditions
+    against it, so the slowest condition bounds the total wait instead of
+    the sum of all of them. The poll interval starts short and doubles up
+    to max_interval while conditions stay pending. riak-admin is only
+    forked for checks /stats cannot answer, and for the ring only once
+    /stats shows every ring member connected. A condition may set its own
+    interval so that costly checks run less often than /stats is polled.
+    A timeout of None waits without limit."""
+
+    def __init__(self, module, http_conn, min_interval=0.25, max_interval=5):
+        self.module = module
+        self.http_conn = http_conn
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.conditions = []
+
+    def add(self, name, timeout, check, fail_msg, interval=0):
+        self.conditions.append((name, timeout, check, fail_msg, interval))
+
+    def wait(self):
+        start = time.time()
+        waited = {}
+        next_check = {}
+        interval = self.min_interval
+        while True:
+            stats = fetch_stats(self.module, self.http_conn)
+            now = time.time()
+            for name, timeout, check, fail_msg, check_interval in self.conditions:
+                if name in waited:
+                    continue
+                if stats is not None and now >= next_check.get(name, 0):
+                    next_check[name] = now + check_interval
+                    if check(stats):
+                        waited[name] = round(time.time() - start, 3)
+                        continue
+                if timeout is not None and now - start > timeout:
+                    self.module.fail_json(msg=fail_msg, waited=waited)
+            if len(waited) == len(self.conditions):
+                return waited
+            time.sleep(interval)
+            interval = min(interval * 2, self.max_interval)
+
+
 def main():
 
     module = AnsibleModule(
@@ -132,6 +222,7 @@ def main():
         wait_for_ring=dict(default=False, type='int'),
         wait_for_service=dict(
             required=False, default=None, choices=['kv']),
+        wait_timeout=dict(required=False, default=120, type='int'),
         validate_certs = dict(default='yes', type='bool'))
     )
 
@@ -143,6 +234,7 @@ def main():
     wait_for_handoffs = module.params.get('wait_for_handoffs')
     wait_for_ring = module.params.get('wait_for_ring')
     wait_for_service = module.params.get('wait_for_service')
+    wait_timeout = module.params.get('wait_timeout')
     validate_certs =  module.params.get('validate_certs')
 
 
@@ -150,21 +242,16 @@ def main():
     riak_bin = module.get_bin_path('riak')
     riak_admin_bin = module.get_bin_path('riak-admin')
 
-    timeout = time.time() + 120
+    start = time.time()
+    interval = 0.25
     while True:
-        if time.time() > timeout:
-            module.fail_json(msg='Timeout, could not fetch Riak stats.')
-        (response, info) = fetch_url(module, 'http://%s/stats' % (http_conn), force=True, timeout=5)
-        if info['status'] == 200:
-            stats_raw = response.read()
+        stats = fetch_stats(module, http_conn)
+        if stats is not None:
             break
-        time.sleep(5)
-
-    # here we attempt to load those stats,
-    try:
-        stats = json.loads(stats_raw)
-    except:
-        module.fail_json(msg='Could not parse Riak stats.')
+        if wait_timeout is not None and time.time() - start > wait_timeout:
+            module.fail_json(msg='Timeout, could not fetch Riak stats.')
+        time.sleep(interval)
+        interval = min(interval * 2, 5)
 
     node_name = stats['nodename']
     nodes = stats['ring_members']
@@ -225,33 +312,33 @@ def main():
             module.fail_json(msg=out)
 
 # this could take a while, recommend to run in async mode
+    waiter = ReadinessWaiter(module, http_conn)
     if wait_for_handoffs:
-        timeout = time.time() + wait_for_handoffs
-        while True:
-            cmd = '%s transfers' % riak_admin_bin
-            rc, out, err = module.run_command(cmd)
-            if 'No transfers active' in out:
-                result['handoffs'] = 'No transfers active.'
-                break
-            time.sleep(10)
-            if time.time() > timeout:
-                module.fail_json(msg='Timeout waiting for handoffs.')
-
+        # /stats does not report active transfers, so riak-admin is forked,
+        # at most as often as the former fixed 10s poll
+        waiter.add('handoffs', wait_for_handoffs,
+                   lambda stats: handoffs_check(module, riak_admin_bin),
+                   'Timeout waiting for handoffs.', interval=10)
+    if wait_for_ring:
+        waiter.add('ring', wait_for_ring,
+                   lambda stats: ring_members_connected(stats) and ring_check(module, riak_admin_bin),
+                   'Timeout waiting for nodes to agree on ring.')
     if wait_for_service:
-        cmd = [riak_admin_bin, 'wait_for_service', 'riak_%s' % wait_for_service, node_name ]
-        rc, out, err = module.run_command(cmd)
-        result['service'] = out
+        waiter.add('service', wait_timeout,
+                   lambda stats: stats.get('riak_%s_vnodes_running' % wait_for_service, 0) > 0,
+                   'Timeout waiting for riak_%s service.' % wait_for_service)
 
-    if wait_for_ring:
-        timeout = time.time() + wait_for_ring
-        while True:
-            if ring_check(module, riak_admin_bin):
-                break
-            time.sleep(10)
-        if time.time() > timeout:
-            module.fail_json(msg='Timeout waiting for nodes to agree on ring.')
+    if waiter.conditions:
+        result['waited'] = waiter.wait()
+    if 'handoffs' in result.get('waited', {}):
+        result['handoffs'] = 'No transfers active.'
+    if 'service' in result.get('waited', {}):
+        result['service'] = 'riak_%s is up' % wait_for_service
 
-    result['ring_ready'] = ring_check(module, riak_admin_bin)
+    if 'ring' in result.get('waited', {}):
+        result['ring_ready'] = True
+    else:
+        result['ring_ready'] = ring_check(module, riak_admin_bin)
 
     module.exit_json(**result)
 
@@ -70,6 +70,20 @@ options:
     required: false
     default: false
     choices: [ "false", "true" ]
+  commit_batches:
+    description:
+      - When importing without I(autocommit), commit the transaction after every N C(GO)-separated
+        batches instead of once at the end of the file. C(0) keeps the single commit at the end.
+    required: false
+    default: 0
+    version_added: "2.3"
+  insert_batch_size:
+    description:
+      - When importing, send runs of consecutive batches that contain only C(INSERT) statements to the
+        server in groups of up to this many batches per round trip. C(1) executes every batch separately.
+    required: false
+    default: 1
+    version_added: "2.3"
 notes:
    - Requires the pymssql Python package on the remote host. For Ubuntu, this
      is as easy as pip install pymssql (See M(pip).)
@@ -85,13 +99,21 @@ EXAMPLES = '''
 # Copy database dump file to remote host and restore it to database 'my_db'
 - copy: src=dump.sql dest=/tmp
 - mssql_db: name=my_db state=import target=/tmp/dump.sql
+# Import a large dump, committing every 500 batches and grouping INSERT-only batches
+- mssql_db: name=my_db state=import target=/tmp/dump.sql commit_batches=500 insert_batch_size=50
 '''
 
 RETURN  = '''
-#
+import_stats:
+    description: Statistics of the import when state=import
+    returned: when state is import
+    type: dict
+    sample: {"batches": 1200, "executions": 310, "commits": 3, "bytes": 1048576, "elapsed": 12.5, "batches_per_sec": 96.0}
 '''
 
 import os
+import re
+import time
 try:
     import pymssql
 except ImportError:
@@ -119,26 +141,93 @@ def db_delete(conn, cursor, db):
     cursor.execute("DROP DATABASE [%s]" % db)
     return not db_exists(conn, cursor, db)
 
-def db_import(conn, cursor, module, db, target):
-    if os.path.isfile(target):
-        backup = open(target, 'r')
-        try:
-            sqlQuery = "USE [%s]\n" % db
-            for line in backup:
-                if line is None:
-                    break
-                elif line.startswith('GO'):
-                    cursor.execute(sqlQuery)
-                    sqlQuery = "USE [%s]\n" % db
-                else:
-                    sqlQuery += line
-            cursor.execute(sqlQuery)
+GO_RE = re.compile(r'^\s*GO(?:\s+(\d+))?\s*(?:--.*)?$', re.IGNORECASE)
+INSERT_RE = re.compile(r'^\s*INSERT\s', re.IGNORECASE)
+
+
+def iter_batches(backup):
+    """Yield (batch, repeat, size, insert_only) for every GO-separated batch of the dump.
+
+    Lines are collected in a list and joined once per batch so that large
+    batches are built in linear time. A batch is insert_only when every
+    non-blank line of it is a single INSERT statement."""
+    lines = []
+    size = 0
+    insert_only = True
+    for line in backup:
+        size += len(line)
+        match = GO_RE.match(line)
+        if match:
+            batch = ''.join(lines)
+            if batch.strip():
+                yield batch, int(match.group(1) or 1), size, insert_only
+            lines = []
+            size = 0
+            insert_only = True
+        else:
+            lines.append(line)
+            if insert_only and line.strip() and not INSERT_RE.match(line):
+                insert_only = False
+    batch = ''.join(lines)
+    if batch.strip():
+        yield batch, 1, size, insert_only
+
+
+def db_import(conn, cursor, module, db, target, autocommit=False, commit_batches=0, insert_batch_size=1):
+    if not os.path.isfile(target):
+        return 1, "cannot find target file", "cannot find target file", None
+
+    header = "USE [%s]\n" % db
+    stats = dict(batches=0, executions=0, commits=0, bytes=0)
+    pending_inserts = []
+    uncommitted = [0]
+    start = time.time()
+
+    def execute(sql):
+        cursor.execute(header + sql)
+        stats['executions'] += 1
+
+    def commit(force=False):
+        if autocommit or not uncommitted[0]:
+            return
+        if force or (commit_batches and uncommitted[0] >= commit_batches):
             conn.commit()
-        finally:
-            backup.close()
-        return 0, "import successful", ""
+            stats['commits'] += 1
+            uncommitted[0] = 0
+
+    def flush_inserts():
+        if pending_inserts:
+            execute('\n'.join(pending_inserts))
+            del pending_inserts[:]
+
+    backup = open(target, 'r')
+    try:
+        for batch, repeat, size, insert_only in iter_batches(backup):
+            stats['bytes'] += size
+            for i in range(repeat):
+                stats['batches'] += 1
+                uncommitted[0] += 1
+                if insert_batch_size > 1 and insert_only:
+                    pending_inserts.append(batch)
+                    if len(pending_inserts) >= insert_batch_size:
+                        flush_inserts()
+                        commit()
+                else:
+                    flush_inserts()
+                    execute(batch)
+                    commit()
+        flush_inserts()
+        commit(force=True)
+    finally:
+        backup.close()
+
+    elapsed = time.time() - start
+    stats['elapsed'] = round(elapsed, 3)
+    if elapsed > 0:
+        stats['batches_per_sec'] = round(stats['batches'] / elapsed, 2)
     else:
-        return 1, "cannot find target file", "cannot find target file"
+        stats['batches_per_sec'] = float(stats['batches'])
+    return 0, "import successful", "", stats
 
 
 def main():
@@ -151,6 +240,8 @@ def main():
             login_port=dict(default='1433'),
             target=dict(default=None),
             autocommit=dict(type='bool', default=False),
+            commit_batches=dict(type='int', default=0),
+            insert_batch_size=dict(type='int', default=1),
             state=dict(
                 default='present', choices=['present', 'absent', 'import'])
         )
@@ -163,6 +254,8 @@ def main():
     state = module.params['state']
     autocommit = module.params['autocommit']
     target = module.params["target"]
+    commit_batches = module.params['commit_batches']
+    insert_batch_size = module.params['insert_batch_size']
 
     login_user = module.params['login_user']
     login_password = module.params['login_password']
@@ -173,6 +266,11 @@ def main():
     if login_port != "1433":
         login_querystring = "%s:%s" % (login_host, login_port)
 
+    if commit_batches < 0:
+        module.fail_json(msg="commit_batches must be 0 or a positive integer")
+    if insert_batch_size < 1:
+        module.fail_json(msg="insert_batch_size must be a positive integer")
+
     if login_user != "" and login_password == "":
         module.fail_json(msg="when supplying login_user arguments login_password must be provided")
 
@@ -197,12 +295,13 @@ def main():
                 module.fail_json(msg="error deleting database: " + str(e))
         elif state == "import":
             conn.autocommit(autocommit)
-            rc, stdout, stderr = db_import(conn, cursor, module, db, target)
+            rc, stdout, stderr, stats = db_import(conn, cursor, module, db, target, autocommit,
+                                                  commit_batches, insert_batch_size)
 
             if rc != 0:
                 module.fail_json(msg="%s" % stderr)
             else:
-                module.exit_json(changed=True, db=db, msg=stdout)
+                module.exit_json(changed=True, db=db, msg=stdout, import_stats=stats)
     else:
         if state == "present":
             try:
@@ -216,12 +315,13 @@ def main():
                 module.fail_json(msg="error creating database: " + str(e))
 
             conn.autocommit(autocommit)
-            rc, stdout, stderr = db_import(conn, cursor, module, db, target)
+            rc, stdout, stderr, stats = db_import(conn, cursor, module, db, target, autocommit,
+                                                  commit_batches, insert_batch_size)
 
             if rc != 0:
                 module.fail_json(msg="%s" % stderr)
             else:
-                module.exit_json(changed=True, db=db, msg=stdout)
+                module.exit_json(changed=True, db=db, msg=stdout, import_stats=stats)
 
     module.exit_json(changed=changed, db=db)
 
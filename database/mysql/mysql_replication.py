@@ -34,7 +34,7 @@ author: "Balazs Pocze (@banyek)"
 options:
     mode:
         description:
-            - module operating mode. Could be getslave (SHOW SLAVE STATUS), getmaster (SHOW MASTER STATUS), changemaster (CHANGE MASTER TO), startslave (START SLAVE), stopslave (STOP SLAVE), resetslave (RESET SLAVE), resetslaveall (RESET SLAVE ALL)
+            - module operating mode. Could be getslave (SHOW SLAVE STATUS), getmaster (SHOW MASTER STATUS), changemaster (CHANGE MASTER TO), startslave (START SLAVE), stopslave (STOP SLAVE), resetslave (RESET SLAVE), resetslaveall (RESET SLAVE ALL), waitforposition (SELECT MASTER_POS_WAIT()), waitforgtid (SELECT WAIT_FOR_EXECUTED_GTID_SET())
         required: False
         choices:
             - getslave
@@ -44,6 +44,8 @@ options:
             - startslave
             - resetslave
             - resetslaveall
+            - waitforposition
+            - waitforgtid
         default: getslave
     master_host:
         description:
@@ -97,6 +99,20 @@ options:
         required: false
         default: null
         version_added: "2.0"
+    master_gtid_set:
+        description:
+            - GTID set the slave has to execute before C(mode=waitforgtid) returns.
+              Requires MySQL 5.7.5 or later.
+        required: false
+        default: null
+        version_added: "2.3"
+    wait_timeout:
+        description:
+            - Number of seconds the server waits in C(mode=waitforposition) or C(mode=waitforgtid)
+              before the module fails. C(0) waits without a limit.
+        required: false
+        default: 60
+        version_added: "2.3"
 
 extends_documentation_fragment: mysql
 '''
@@ -113,9 +129,40 @@ EXAMPLES = '''
 
 # Check slave status using port 3308
 - mysql_replication: mode=getslave login_host=ansible.example.com login_port=3308
+
+# Block until the slave has applied the master up to a binlog position, for at most 5 minutes
+- mysql_replication: mode=waitforposition master_log_file=mysql-bin.000009 master_log_pos=4578 wait_timeout=300
+
+# Block until the slave has executed a GTID set
+- mysql_replication: mode=waitforgtid master_gtid_set="3E11FA47-71CA-11E1-9E33-C80AA9429562:1-5"
+'''
+
+RETURN = '''
+waited:
+    description: Seconds spent waiting for the slave in the waitforposition and waitforgtid modes
+    returned: when mode is waitforposition or waitforgtid
+    type: float
+    sample: 1.42
+lag_before:
+    description: Seconds_Behind_Master reported by the slave before waiting
+    returned: when mode is waitforposition or waitforgtid
+    type: int
+    sample: 12
+lag_after:
+    description: Seconds_Behind_Master reported by the slave after waiting
+    returned: when mode is waitforposition or waitforgtid
+    type: int
+    sample: 0
+apply_rate:
+    description: Bytes of master binlog applied per second while waiting, null when the
+                 relay master log file rotated during the wait
+    returned: when mode is waitforposition or waitforgtid
+    type: float
+    sample: 1048576.0
 '''
 
 import os
+import time
 import warnings
 
 try:
@@ -174,6 +221,50 @@ def start_slave(cursor):
     return started
 
 
+def wait_for_position(cursor, log_file, log_pos, timeout):
+    cursor.execute("SELECT MASTER_POS_WAIT(%s, %s, %s) AS result", (log_file, log_pos, timeout))
+    result = cursor.fetchone()['result']
+    if result is None:
+        return None
+    return int(result) != -1
+
+
+def wait_for_gtid(cursor, gtid_set, timeout):
+    cursor.execute("SELECT WAIT_FOR_EXECUTED_GTID_SET(%s, %s) AS result", (gtid_set, timeout))
+    result = cursor.fetchone()['result']
+    if result is None:
+        return None
+    return int(result) == 0
+
+
+def wait_for_slave(module, cursor, mode, timeout):
+    before = get_slave_status(cursor)
+    if before is None:
+        module.fail_json(msg="Server is not configured as mysql slave")
+
+    start = time.time()
+    if mode == "waitforposition":
+        reached = wait_for_position(cursor, module.params["master_log_file"], module.params["master_log_pos"], timeout)
+    else:
+        reached = wait_for_gtid(cursor, module.params["master_gtid_set"], timeout)
+    waited = time.time() - start
+
+    after = get_slave_status(cursor)
+    result = dict(waited=round(waited, 3),
+                  lag_before=before.get('Seconds_Behind_Master'),
+                  lag_after=after.get('Seconds_Behind_Master'),
+                  apply_rate=None)
+    if before.get('Relay_Master_Log_File') == after.get('Relay_Master_Log_File') and waited > 0:
+        applied = int(after['Exec_Master_Log_Pos']) - int(before['Exec_Master_Log_Pos'])
+        result['apply_rate'] = round(applied / waited, 2)
+
+    if reached is None:
+        module.fail_json(msg="Slave SQL thread is not running or replication is not configured", **result)
+    elif not reached:
+        module.fail_json(msg="Timed out after %s seconds waiting for the slave" % timeout, **result)
+    return result
+
+
 def changemaster(cursor, chm, chm_params):
     sql_param = ",".join(chm)
     query = 'CHANGE MASTER TO %s' % sql_param
@@ -188,7 +279,7 @@ def main():
             login_host=dict(default="localhost"),
             login_port=dict(default=3306, type='int'),
             login_unix_socket=dict(default=None),
-            mode=dict(default="getslave", choices=["getmaster", "getslave", "changemaster", "stopslave", "startslave", "resetslave", "resetslaveall"]),
+            mode=dict(default="getslave", choices=["getmaster", "getslave", "changemaster", "stopslave", "startslave", "resetslave", "resetslaveall", "waitforposition", "waitforgtid"]),
             master_auto_position=dict(default=False, type='bool'),
             master_host=dict(default=None),
             master_user=dict(default=None),
@@ -205,12 +296,18 @@ def main():
             master_ssl_cert=dict(default=None),
             master_ssl_key=dict(default=None),
             master_ssl_cipher=dict(default=None),
+            master_gtid_set=dict(default=None),
+            wait_timeout=dict(default=60, type='int'),
             connect_timeout=dict(default=30, type='int'),
             config_file=dict(default="~/.my.cnf"),
             ssl_cert=dict(default=None),
             ssl_key=dict(default=None),
             ssl_ca=dict(default=None),
-        )
+        ),
+        required_if=[
+            ["mode", "waitforposition", ["master_log_file", "master_log_pos"]],
+            ["mode", "waitforgtid", ["master_gtid_set"]],
+        ]
     )
     user = module.params["login_user"]
     password = module.params["login_password"]
@@ -236,6 +333,7 @@ def main():
     ssl_cert = module.params["ssl_cert"]
     ssl_key = module.params["ssl_key"]
     ssl_ca = module.params["ssl_ca"]
+    wait_timeout = module.params["wait_timeout"]
     connect_timeout = module.params['connect_timeout']
     config_file = module.params['config_file']
     config_file = os.path.expanduser(os.path.expandvars(config_file))
@@ -349,6 +447,9 @@ def main():
             module.exit_json(msg="Slave reset", changed=True)
         else:
             module.exit_json(msg="Slave already reset", changed=False)
+    elif mode in ["waitforposition", "waitforgtid"]:
+        result = wait_for_slave(module, cursor, mode, wait_timeout)
+        module.exit_json(msg="Slave caught up", changed=False, **result)
 
 # import module snippets
 from ansible.module_utils.basic import *
@@ -43,6 +43,22 @@ options:
         description:
             - type of the log
         required: false
+    config:
+        description:
+            - path of the LogEntries agent configuration file. When the agent keeps its
+              configuration locally (C(pull-server-side-config = False) in the C(Main)
+              section), the followed logs are read from it once. Otherwise the agent is
+              queried once with C(le followed), and per path if that listing fails.
+        required: false
+        default: /etc/le/config
+        version_added: "2.3"
+    agent_service:
+        description:
+            - name of the LogEntries agent service, restarted once after all logs were
+              followed or removed so it picks up the new configuration
+        required: false
+        default: null
+        version_added: "2.3"
 
 notes:
     - Requires the LogEntries agent which can be installed following the instructions at logentries.com
@@ -50,8 +66,15 @@ notes:
 EXAMPLES = '''
 - logentries: path=/var/log/nginx/access.log state=present name=nginx-access-log
 - logentries: path=/var/log/nginx/error.log state=absent
+# Follow many logs and restart the agent once
+- logentries: path=/var/log/app/a.log,/var/log/app/b.log,/var/log/app/c.log agent_service=logentries
 '''
 
+try:
+    import ConfigParser as configparser
+except ImportError:
+    import configparser
+
 def query_log_status(module, le_path, path, state="present"):
     """ Returns whether a log is followed or not. """
 
@@ -62,59 +85,110 @@ def query_log_status(module, le_path, path, state="present"):
 
         return False
 
-def follow_log(module, le_path, logs, name=None, logtype=None):
+def read_followed(module, config_path):
+    """ Returns the set of followed log paths from the agent configuration,
+    or None when it cannot be read or the agent pulls its configuration
+    from the server, where the logs followed with 'le follow' are kept. """
+
+    if not os.access(config_path, os.R_OK):
+        return None
+    config = configparser.RawConfigParser()
+    try:
+        config.read(config_path)
+        if not config.has_option('Main', 'pull-server-side-config') or \
+                config.getboolean('Main', 'pull-server-side-config'):
+            return None
+    except (configparser.Error, ValueError):
+        return None
+
+    followed = set()
+    for section in config.sections():
+        if config.has_option(section, 'path'):
+            followed.add(config.get(section, 'path'))
+    return followed
+
+def query_followed(module, le_path):
+    """ Returns the paths listed by a single 'le followed' call, or None
+    when the agent cannot list them. """
+
+    rc, out, err = module.run_command([le_path, 'followed'])
+    if rc != 0:
+        return None
+    return set(out.split())
+
+def followed_logs(module, le_path, config_path, logs):
+    """ Returns the subset of logs that are followed, reading the local agent
+    configuration or querying the agent once when possible. """
+
+    followed = read_followed(module, config_path)
+    if followed is None:
+        followed = query_followed(module, le_path)
+    if followed is not None:
+        return set([log for log in logs if log in followed])
+    return set([log for log in logs if query_log_status(module, le_path, log)])
+
+def restart_agent(module, service):
+    rc, out, err = module.run_command([module.get_bin_path('service', True), service, 'restart'])
+    if rc != 0:
+        module.fail_json(msg="failed to restart %s: %s" % (service, err.strip()))
+
+def follow_log(module, le_path, logs, name=None, logtype=None, config_path=None, service=None):
     """ Follows one or more logs if not already followed. """
 
-    followed_count = 0
-
-    for log in logs:
-        if query_log_status(module, le_path, log):
-            continue
+    followed = followed_logs(module, le_path, config_path, logs)
+    todo = [log for log in logs if log not in followed]
 
-        if module.check_mode:
-            module.exit_json(changed=True)
+    if not todo:
+        module.exit_json(changed=False, msg="logs(s) already followed")
+    if module.check_mode:
+        module.exit_json(changed=True)
 
+    errors = {}
+    for log in todo:
         cmd = [le_path, 'follow', log]
         if name:
             cmd.extend(['--name',name])
         if logtype:
             cmd.extend(['--type',logtype])
         rc, out, err = module.run_command(' '.join(cmd))
+        errors[log] = err.strip()
 
-        if not query_log_status(module, le_path, log):
-            module.fail_json(msg="failed to follow '%s': %s" % (log, err.strip()))
+    if service:
+        restart_agent(module, service)
 
-        followed_count += 1
+    followed = followed_logs(module, le_path, config_path, todo)
+    for log in todo:
+        if log not in followed:
+            module.fail_json(msg="failed to follow '%s': %s" % (log, errors[log]))
 
-    if followed_count > 0:
-        module.exit_json(changed=True, msg="followed %d log(s)" % (followed_count,))
+    module.exit_json(changed=True, msg="followed %d log(s)" % (len(todo),))
 
-    module.exit_json(changed=False, msg="logs(s) already followed")
-
-def unfollow_log(module, le_path, logs):
+def unfollow_log(module, le_path, logs, config_path=None, service=None):
     """ Unfollows one or more logs if followed. """
 
-    removed_count = 0
+    followed = followed_logs(module, le_path, config_path, logs)
+    todo = [log for log in logs if log in followed]
 
-    # Using a for loop incase of error, we can report the package that failed
-    for log in logs:
-        # Query the log first, to see if we even need to remove.
-        if not query_log_status(module, le_path, log):
-            continue
+    if not todo:
+        module.exit_json(changed=False, msg="logs(s) already unfollowed")
+    if module.check_mode:
+        module.exit_json(changed=True)
 
-        if module.check_mode:
-            module.exit_json(changed=True)
+    errors = {}
+    for log in todo:
         rc, out, err = module.run_command([le_path, 'rm', log])
+        errors[log] = err.strip()
 
-        if query_log_status(module, le_path, log):
-            module.fail_json(msg="failed to remove '%s': %s" % (log, err.strip()))
-
-        removed_count += 1
+    if service:
+        restart_agent(module, service)
 
-    if removed_count > 0:
-        module.exit_json(changed=True, msg="removed %d package(s)" % removed_count)
+    # Using a for loop incase of error, we can report the log that failed
+    followed = followed_logs(module, le_path, config_path, todo)
+    for log in todo:
+        if log in followed:
+            module.fail_json(msg="failed to remove '%s': %s" % (log, errors[log]))
 
-    module.exit_json(changed=False, msg="logs(s) already unfollowed")
+    module.exit_json(changed=True, msg="removed %d package(s)" % len(todo))
 
 def main():
     module = AnsibleModule(
@@ -122,7 +196,9 @@ def main():
             path = dict(required=True),
             state = dict(default="present", choices=["present", "followed", "absent", "unfollowed"]),
             name = dict(required=False, default=None, type='str'),
-            logtype = dict(required=False, default=None, type='str', aliases=['type'])
+            logtype = dict(required=False, default=None, type='str', aliases=['type']),
+            config = dict(required=False, default='/etc/le/config', type='path'),
+            agent_service = dict(required=False, default=None, type='str')
         ),
         supports_check_mode=True
     )
@@ -133,13 +209,14 @@ def main():
 
     # Handle multiple log files
     logs = p["path"].split(",")
-    logs = filter(None, logs)
+    logs = [log for log in logs if log]
 
     if p["state"] in ["present", "followed"]:
-        follow_log(module, le_path, logs, name=p['name'], logtype=p['logtype'])
+        follow_log(module, le_path, logs, name=p['name'], logtype=p['logtype'],
+                   config_path=p['config'], service=p['agent_service'])
 
     elif p["state"] in ["absent", "unfollowed"]:
-        unfollow_log(module, le_path, logs)
+        unfollow_log(module, le_path, logs, config_path=p['config'], service=p['agent_service'])
 
 # import module snippets
 from ansible.module_utils.basic import *
@@ -37,7 +37,9 @@ options:
         aliases: []
     checkid:
         description:
-            - Pingdom ID of the check.
+            - Pingdom ID of the check. A comma separated list or a list of IDs may be given;
+              their status is fetched with one call and only checks whose state differs
+              are changed.
         required: true
         default: null
         choices: []
@@ -63,6 +65,19 @@ options:
         default: null
         choices: []
         aliases: []
+    concurrency:
+        description:
+            - Number of checks changed at the same time.
+        required: false
+        default: 4
+        version_added: "2.3"
+    retries:
+        description:
+            - Number of times an API call is retried, with exponential backoff, when it fails
+              because of the API rate limit.
+        required: false
+        default: 5
+        version_added: "2.3"
 notes:
     - This module does not yet have support to add/remove checks.
 '''
@@ -81,8 +96,36 @@ EXAMPLES = '''
            key=apipassword123
            checkid=12345
            state=running
+
+# Pause several checks for a maintenance window.
+- pingdom: uid=example@example.com
+           passwd=password123
+           key=apipassword123
+           checkid=12345,12346,12347
+           state=paused
 '''
 
+RETURN = '''
+changed_count:
+    description: Number of checks whose state was changed
+    returned: success
+    type: int
+    sample: 2
+skipped_count:
+    description: Number of checks already in the requested state
+    returned: success
+    type: int
+    sample: 1
+checks:
+    description: Name and status of every requested check after the change
+    returned: success
+    type: list
+    sample: [{"checkid": "12345", "name": "www", "status": "paused"}]
+'''
+
+import threading
+import time
+
 try:
     import pingdom
     HAS_PINGDOM = True
@@ -91,28 +134,53 @@ except:
 
 
 
-def pause(checkid, uid, passwd, key):
-
-    c = pingdom.PingdomConnection(uid, passwd, key)
-    c.modify_check(checkid, paused=True)
-    check = c.get_check(checkid)
-    name = check.name
-    result = check.status
-    #if result != "paused":             # api output buggy - accept raw exception for now
-    #    return (True, name, result)
-    return (False, name, result)
-
-
-def unpause(checkid, uid, passwd, key):
-
-    c = pingdom.PingdomConnection(uid, passwd, key)
-    c.modify_check(checkid, paused=False)
-    check = c.get_check(checkid)
-    name = check.name
-    result = check.status
-    #if result != "up":                 # api output buggy - accept raw exception for now
-    #    return (True, name, result)
-    return (False, name, result)
+def with_backoff(func, retries, *args, **kwargs):
+    """ Call func, retrying with exponential backoff while the API answers
+    with a rate limit error. """
+
+    delay = 1
+    for attempt in range(retries + 1):
+        try:
+            return func(*args, **kwargs)
+        except Exception:
+            message = str(get_exception()).lower()
+            if attempt == retries or ('limit' not in message and '429' not in message):
+                raise
+        time.sleep(delay)
+        delay = delay * 2
+
+
+def set_paused(c, checkids, paused, concurrency, retries):
+    """ Pause or unpause the given checks with at most concurrency calls in
+    flight and return the list of failed checks with their error. """
+
+    pending = list(checkids)
+    failed = []
+    lock = threading.Lock()
+
+    def worker():
+        while True:
+            lock.acquire()
+            try:
+                if not pending:
+                    return
+                checkid = pending.pop(0)
+            finally:
+                lock.release()
+            try:
+                with_backoff(c.modify_check, retries, checkid, paused=paused)
+            except Exception:
+                e = get_exception()
+                failed.append(dict(checkid=checkid, msg=str(e)))
+
+    threads = []
+    for i in range(max(1, min(concurrency, len(checkids)))):
+        thread = threading.Thread(target=worker)
+        thread.start()
+        threads.append(thread)
+    for thread in threads:
+        thread.join()
+    return failed
 
 
 def main():
@@ -120,33 +188,66 @@ def main():
     module = AnsibleModule(
         argument_spec=dict(
         state=dict(required=True, choices=['running', 'paused', 'started', 'stopped']),
-        checkid=dict(required=True),
+        checkid=dict(required=True, type='list'),
         uid=dict(required=True),
-        passwd=dict(required=True),
-        key=dict(required=True)
+        passwd=dict(required=True, no_log=True),
+        key=dict(required=True, no_log=True),
+        concurrency=dict(default=4, type='int'),
+        retries=dict(default=5, type='int')
         )
     )
 
     if not HAS_PINGDOM:
         module.fail_json(msg="Missing required pingdom module (check docs)")
 
-    checkid = module.params['checkid']
+    checkids = [str(checkid) for checkid in module.params['checkid']]
     state = module.params['state']
     uid = module.params['uid']
     passwd = module.params['passwd']
     key = module.params['key']
+    retries = module.params['retries']
+    paused = state in ("paused", "stopped")
 
-    if (state == "paused" or state == "stopped"):
-        (rc, name, result) = pause(checkid, uid, passwd, key)
-
-    if (state == "running" or state == "started"):
-        (rc, name, result) = unpause(checkid, uid, passwd, key)
-
-    if rc != 0:
-        module.fail_json(checkid=checkid, name=name, status=result)
-
-    module.exit_json(checkid=checkid, name=name, status=result)
+    c = pingdom.PingdomConnection(uid, passwd, key)
+    try:
+        current = {}
+        for check in with_backoff(c.get_all_checks, retries):
+            current[str(check.id)] = check
+    except Exception:
+        e = get_exception()
+        module.fail_json(msg="failed to list checks: %s" % e)
+
+    missing = [checkid for checkid in checkids if checkid not in current]
+    if missing:
+        module.fail_json(msg="check(s) %s not found" % ', '.join(missing))
+
+    todo = [checkid for checkid in checkids if (current[checkid].status == "paused") != paused]
+    failed = set_paused(c, todo, paused, module.params['concurrency'], retries)
+    if failed:
+        module.fail_json(msg="failed", failed=failed,
+                         changed_count=len(todo) - len(failed),
+                         skipped_count=len(checkids) - len(todo))
+
+    if todo:
+        # One more listing reports the status of every changed check
+        try:
+            for check in with_backoff(c.get_all_checks, retries):
+                current[str(check.id)] = check
+        except Exception:
+            e = get_exception()
+            module.fail_json(msg="failed to list checks: %s" % e)
+
+    checks = []
+    for checkid in checkids:
+        checks.append(dict(checkid=checkid, name=current[checkid].name, status=current[checkid].status))
+
+    result = dict(changed=bool(todo), checks=checks,
+                  changed_count=len(todo), skipped_count=len(checkids) - len(todo))
+    if len(checks) == 1:
+        result.update(checks[0])
+    module.exit_json(**result)
 
 # import module snippets
 from ansible.module_utils.basic import *
+from ansible.module_utils.pycompat24 import get_exception
 main()
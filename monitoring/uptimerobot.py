@@ -35,7 +35,9 @@ options:
         aliases: []
     monitorid:
         description:
-            - ID of the monitor to check.
+            - ID of the monitor to check. A comma separated list or a list of IDs may be
+              given; their status is fetched with one call and only monitors whose state
+              differs are changed.
         required: true
         default: null
         choices: []
@@ -47,6 +49,19 @@ options:
         default: null
         choices: []
         aliases: []
+    concurrency:
+        description:
+            - Number of monitors changed at the same time.
+        required: false
+        default: 4
+        version_added: "2.3"
+    retries:
+        description:
+            - Number of times an API call is retried, with exponential backoff, when it fails
+              because of the API rate limit.
+        required: false
+        default: 5
+        version_added: "2.3"
 notes:
     - Support for adding and removing monitors and alert contacts has not yet been implemented.
 '''
@@ -62,6 +77,24 @@ EXAMPLES = '''
            apikey=12345-1234512345
            state=started
 
+# Pause several monitors for a maintenance window.
+- uptimerobot: monitorid=12345,12346,12347
+           apikey=12345-1234512345
+           state=paused
+
+'''
+
+RETURN = '''
+changed_count:
+    description: Number of monitors whose state was changed
+    returned: success
+    type: int
+    sample: 2
+skipped_count:
+    description: Number of monitors already in the requested state
+    returned: success
+    type: int
+    sample: 1
 '''
 
 try:
@@ -73,9 +106,14 @@ except ImportError:
         # Let snippet from module_utils/basic.py return a proper error in this case
         pass
 
-import urllib
+import threading
 import time
 
+try:
+    from urllib import urlencode
+except ImportError:
+    from urllib.parse import urlencode
+
 API_BASE = "http://api.uptimerobot.com/"
 
 API_ACTIONS = dict(
@@ -87,41 +125,134 @@ API_FORMAT = 'json'
 API_NOJSONCALLBACK = 1
 CHANGED_STATE = False
 SUPPORTS_CHECK_MODE = False
+MONITOR_PAUSED = '0'
 
 
 def checkID(module, params):
 
-    data = urllib.urlencode(params)
+    data = urlencode(params)
     full_uri = API_BASE + API_ACTIONS['status'] + data
     req, info = fetch_url(module, full_uri)
+    if req is None:
+        raise Exception("HTTP %s: %s" % (info['status'], info['msg']))
     result = req.read()
     jsonresult = json.loads(result)
     req.close()
     return jsonresult
 
 
-def startMonitor(module, params):
+def editMonitor(module, params):
 
-    params['monitorStatus'] = 1
-    data = urllib.urlencode(params)
+    data = urlencode(params)
     full_uri = API_BASE + API_ACTIONS['editMonitor'] + data
     req, info = fetch_url(module, full_uri)
+    if req is None:
+        raise Exception("HTTP %s: %s" % (info['status'], info['msg']))
     result = req.read()
     jsonresult = json.loads(result)
     req.close()
-    return jsonresult['stat']
+    return jsonresult
+
+
+def startMonitor(module, params):
+
+    params['monitorStatus'] = 1
+    return editMonitor(module, params)['stat']
 
 
 def pauseMonitor(module, params):
 
     params['monitorStatus'] = 0
-    data = urllib.urlencode(params)
-    full_uri = API_BASE + API_ACTIONS['editMonitor'] + data
-    req, info = fetch_url(module, full_uri)
-    result = req.read()
-    jsonresult = json.loads(result)
-    req.close()
-    return jsonresult['stat']
+    return editMonitor(module, params)['stat']
+
+
+def withBackoff(func, retries, *args):
+    """ Call func, retrying with exponential backoff while the API answers
+    with a rate limit error. """
+
+    delay = 1
+    for attempt in range(retries + 1):
+        try:
+            return func(*args)
+        except Exception:
+            message = str(get_exception()).lower()
+            if attempt == retries or ('limit' not in message and '429' not in message):
+                raise
+        time.sleep(delay)
+        delay = delay * 2
+
+
+def checkMonitors(module, params, retries):
+    """ Fetch the status of all requested monitors, following the
+    offset/limit pagination of getMonitors. """
+
+    def call(page_params):
+        result = checkID(module, page_params)
+        if result['stat'] != "ok" and 'limit' in str(result.get('message', '')).lower():
+            raise Exception(result['message'])
+        return result
+
+    monitors = []
+    offset = 0
+    while True:
+        page_params = dict(params)
+        page_params['offset'] = offset
+        result = withBackoff(call, retries, page_params)
+        if result['stat'] != "ok":
+            return result
+        page = result['monitors']['monitor']
+        monitors.extend(page)
+        offset += len(page)
+        if not page or offset >= int(result.get('total', offset)):
+            break
+    result['monitors']['monitor'] = monitors
+    return result
+
+
+def setMonitors(module, params, monitors, state, concurrency, retries):
+    """ Start or pause the given monitor IDs with at most concurrency calls
+    in flight and return the list of failed IDs with their result. """
+
+    pending = list(monitors)
+    failed = []
+    lock = threading.Lock()
+
+    def change(monitorid):
+        monitor_params = dict(params)
+        monitor_params['monitorID'] = monitorid
+        monitor_params['monitors'] = monitorid
+        if state == 'started':
+            monitor_params['monitorStatus'] = 1
+        else:
+            monitor_params['monitorStatus'] = 0
+        result = editMonitor(module, monitor_params)
+        if result['stat'] != 'ok':
+            raise Exception(result.get('message', result['stat']))
+        return result['stat']
+
+    def worker():
+        while True:
+            lock.acquire()
+            try:
+                if not pending:
+                    return
+                monitorid = pending.pop(0)
+            finally:
+                lock.release()
+            try:
+                withBackoff(change, retries, monitorid)
+            except Exception:
+                e = get_exception()
+                failed.append(dict(monitorid=monitorid, result=str(e)))
+
+    threads = []
+    for i in range(max(1, min(concurrency, len(monitors)))):
+        thread = threading.Thread(target=worker)
+        thread.start()
+        threads.append(thread)
+    for thread in threads:
+        thread.join()
+    return failed
 
 
 def main():
@@ -130,20 +261,29 @@ def main():
         argument_spec = dict(
             state     = dict(required=True, choices=['started', 'paused']),
             apikey      = dict(required=True),
-            monitorid   = dict(required=True)
+            monitorid   = dict(required=True, type='list'),
+            concurrency = dict(default=4, type='int'),
+            retries     = dict(default=5, type='int')
         ),
         supports_check_mode=SUPPORTS_CHECK_MODE
     )
 
+    monitorids = [str(monitorid) for monitorid in module.params['monitorid']]
+    state = module.params['state']
+    retries = module.params['retries']
+
     params = dict(
         apiKey=module.params['apikey'],
-        monitors=module.params['monitorid'],
-        monitorID=module.params['monitorid'],
+        monitors='-'.join(monitorids),
         format=API_FORMAT,
         noJsonCallback=API_NOJSONCALLBACK
     )
 
-    check_result = checkID(module, params)
+    try:
+        check_result = checkMonitors(module, params, retries)
+    except Exception:
+        e = get_exception()
+        module.fail_json(msg="failed", result=str(e))
 
     if check_result['stat'] != "ok":
         module.fail_json(
@@ -151,18 +291,37 @@ def main():
             result=check_result['message']
         )
 
-    if module.params['state'] == 'started':
-        monitor_result = startMonitor(module, params)
-    else:
-        monitor_result = pauseMonitor(module, params)
+    current = {}
+    for monitor in check_result['monitors']['monitor']:
+        current[str(monitor['id'])] = str(monitor['status'])
+
+    missing = [monitorid for monitorid in monitorids if monitorid not in current]
+    if missing:
+        module.fail_json(msg="monitor(s) %s not found" % ', '.join(missing))
+
+    todo = []
+    for monitorid in monitorids:
+        paused = current[monitorid] == MONITOR_PAUSED
+        if (state == 'paused') != paused:
+            todo.append(monitorid)
+
+    failed = setMonitors(module, params, todo, state, module.params['concurrency'], retries)
+    if failed:
+        module.fail_json(msg="failed", failed=failed,
+                         changed_count=len(todo) - len(failed),
+                         skipped_count=len(monitorids) - len(todo))
 
     module.exit_json(
         msg="success",
-        result=monitor_result
+        result="ok",
+        changed=bool(todo),
+        changed_count=len(todo),
+        skipped_count=len(monitorids) - len(todo)
     )
 
 
 from ansible.module_utils.basic import *
 from ansible.module_utils.urls import *
+from ansible.module_utils.pycompat24 import get_exception
 if __name__ == '__main__':
     main()
@@ -380,6 +380,7 @@ tenant_ip: "192.168.200.21/23"
 '''
 # import ansible.module_utils.basic
 import os
+import re
 import sys
 import dbus
 from gi.repository import NetworkManager, NMClient
@@ -434,6 +435,7 @@ class Nmcli(object):
 
     def __init__(self, module):
         self.module=module
+        self._connections=None
         self.state=module.params['state']
         self.autoconnect=module.params['autoconnect']
         self.conn_name=module.params['conn_name']
@@ -470,91 +472,47 @@ class Nmcli(object):
     def execute_command(self, cmd, use_unsafe_shell=False, data=None):
         return self.module.run_command(cmd, use_unsafe_shell=use_unsafe_shell, data=data)
 
-    def merge_secrets(self, proxy, config, setting_name):
-        try:
-            # returns a dict of dicts mapping name::setting, where setting is a dict
-            # mapping key::value.  Each member of the 'setting' dict is a secret
-            secrets=proxy.GetSecrets(setting_name)
-
-            # Copy the secrets into our connection config
-            for setting in secrets:
-                for key in secrets[setting]:
-                    config[setting_name][key]=secrets[setting][key]
-        except Exception, e:
-            pass
-
-    def dict_to_string(self, d):
-        # Try to trivially translate a dictionary's elements into nice string
-        # formatting.
-        dstr=""
-        for key in d:
-            val=d[key]
-            str_val=""
-            add_string=True
-            if type(val)==type(dbus.Array([])):
-                for elt in val:
-                    if type(elt)==type(dbus.Byte(1)):
-                        str_val+="%s " % int(elt)
-                    elif type(elt)==type(dbus.String("")):
-                        str_val+="%s" % elt
-            elif type(val)==type(dbus.Dictionary({})):
-                dstr+=self.dict_to_string(val)
-                add_string=False
-            else:
-                str_val=val
-            if add_string:
-                dstr+="%s: %s\n" % ( key, str_val)
-        return dstr
-
-    def connection_to_string(self, config):
-        # dump a connection configuration to use in list_connection_info
-        setting_list=[]
-        for setting_name in config:
-            setting_list.append(self.dict_to_string(config[setting_name]))
-        return setting_list
-        # print ""
+    def settings_interface(self):
+        proxy=self.bus.get_object("org.freedesktop.NetworkManager", "/org/freedesktop/NetworkManager/Settings")
+        return dbus.Interface(proxy, "org.freedesktop.NetworkManager.Settings")
 
     def list_connection_info(self):
-        # Ask the settings service for the list of connections it provides
-        bus=dbus.SystemBus()
-
-        service_name="org.freedesktop.NetworkManager"
-        proxy=bus.get_object(service_name, "/org/freedesktop/NetworkManager/Settings")
-        settings=dbus.Interface(proxy, "org.freedesktop.NetworkManager.Settings")
-        connection_paths=settings.ListConnections()
-        connection_list=[]
-        # List each connection's name, UUID, and type
-        for path in connection_paths:
-            con_proxy=bus.get_object(service_name, path)
-            settings_connection=dbus.Interface(con_proxy, "org.freedesktop.NetworkManager.Settings.Connection")
-            config=settings_connection.GetSettings()
-
-            # Now get secrets too; we grab the secrets for each type of connection
-            # (since there isn't a "get all secrets" call because most of the time
-            # you only need 'wifi' secrets or '802.1x' secrets, not everything) and
-            # merge that into the configuration data - To use at a later stage
-            self.merge_secrets(settings_connection, config, '802-11-wireless')
-            self.merge_secrets(settings_connection, config, '802-11-wireless-security')
-            self.merge_secrets(settings_connection, config, '802-1x')
-            self.merge_secrets(settings_connection, config, 'gsm')
-            self.merge_secrets(settings_connection, config, 'cdma')
-            self.merge_secrets(settings_connection, config, 'ppp')
-
-            # Get the details of the 'connection' setting
+        # Index of the connections by id, uuid and type, built once per run.
+        # Only the names are listed, no settings or secrets are read
+        if self._connections is not None:
+            return self._connections
+        rc, out, err=self.execute_command([self.module.get_bin_path('nmcli', True), '-t', '-f', 'NAME,UUID,TYPE', 'con', 'show'])
+        if rc==0:
+            self._connections=[]
+            for line in out.splitlines():
+                # terse output escapes colons and backslashes inside the fields
+                fields=[re.sub(r'\\(.)', r'\1', field) for field in re.split(r'(?<!\\):', line)]
+                if len(fields)==3:
+                    self._connections.append({'id': fields[0], 'uuid': fields[1], 'type': fields[2]})
+            return self._connections
+
+        # older nmcli releases, ask the settings service over D-Bus
+        self._connections=[]
+        for path in self.settings_interface().ListConnections():
+            config=self.connection_interface(path).GetSettings()
             s_con=config['connection']
-            connection_list.append(s_con['id'])
-            connection_list.append(s_con['uuid'])
-            connection_list.append(s_con['type'])
-            connection_list.append(self.connection_to_string(config))
-        return connection_list
+            self._connections.append({'id': s_con['id'], 'uuid': s_con['uuid'], 'type': s_con['type'], 'path': path})
+        return self._connections
 
-    def connection_exists(self):
-        # we are going to use name and type in this instance to find if that connection exists and is of type x
-        connections=self.list_connection_info()
+    def connection_interface(self, path):
+        con_proxy=self.bus.get_object("org.freedesktop.NetworkManager", path)
+        return dbus.Interface(con_proxy, "org.freedesktop.NetworkManager.Settings.Connection")
 
-        for con_item in connections:
-            if self.conn_name==con_item:
-                return True
+    def find_connection(self, name=None):
+        if name is None:
+            name=self.conn_name
+        for connection in self.list_connection_info():
+            if name==connection['id'] or name==connection['uuid']:
+                return connection
+        return None
+
+    def connection_exists(self):
+        return self.find_connection() is not None
 
     def down_connection(self):
         cmd=[self.module.get_bin_path('nmcli', True)]
@@ -34,25 +34,35 @@ description:
     - Set column values in record in database table.
 options:
     table:
-        required: true
+        required: false
         description:
-            - Identifies the table in the database.
+            - Identifies the table in the database. Required unless I(entries) is given.
     record:
-        required: true
+        required: false
         description:
-            - Identifies the recoard in the table.
+            - Identifies the recoard in the table. Required unless I(entries) is given.
     column:
-        required: true
+        required: false
         description:
-            - Identifies the column in the record.
+            - Identifies the column in the record. Required unless I(entries) is given.
     key:
-        required: true
+        required: false
         description:
-            - Identifies the key in the record column
+            - Identifies the key in the record column. Required unless I(entries) is given.
     value:
-        required: true
+        required: false
         description:
-            - Expected value for the table, record, column and key.
+            - Expected value for the table, record, column and key. Required unless
+              I(entries) is given.
+    entries:
+        required: false
+        default: null
+        version_added: "2.3"
+        description:
+            - List of dicts with the I(table), I(record), I(col), I(key) and I(value)
+              of several column keys to set. All the records are read with one
+              C(ovs-vsctl --format=json list) call, values are compared exactly and
+              all changes are committed in a single ovs-vsctl transaction.
     timeout:
         required: false
         default: 5
@@ -69,12 +79,108 @@ EXAMPLES = '''
 # Disable in band copy
 - openvswitch_db: table=Bridge record=br-int col=other_config
                   key=disable-in-band value=true
+
+# Set several keys in one transaction
+- openvswitch_db:
+    entries:
+      - { table: Bridge, record: br-int, col: other_config, key: disable-in-band, value: true }
+      - { table: Port, record: eth1, col: other_config, key: priority-tags, value: true }
+      - { table: Interface, record: eth1, col: external_ids, key: iface-id, value: vm1-eth1 }
 '''
 
+import re
+
+try:
+    import json
+except ImportError:
+    import simplejson as json
+
+ENTRY_KEYS = ['table', 'record', 'col', 'key', 'value']
+
+# Values that ovs-vsctl parses as a bare string
+BARE_VALUE = re.compile(r'^[A-Za-z0-9_.:/-]+$')
+
+
+def ovsdb_to_python(datum):
+    """ Convert an OVSDB JSON datum to a python value, maps to dicts. """
+    if isinstance(datum, list) and len(datum) == 2:
+        if datum[0] == 'map':
+            result = {}
+            for (key, value) in datum[1]:
+                result[ovsdb_to_python(key)] = ovsdb_to_python(value)
+            return result
+        if datum[0] == 'set':
+            return [ovsdb_to_python(value) for value in datum[1]]
+        if datum[0] in ('uuid', 'named-uuid'):
+            return datum[1]
+    if isinstance(datum, bool):
+        return str(datum).lower()
+    return datum
+
+
+def quote_value(value):
+    if BARE_VALUE.match(value):
+        return value
+    return json.dumps(value)
+
+
+def get_entries(module):
+    """ Validate the entries and return them with the value as a string. """
+    if module.params['entries'] is None:
+        missing = [key for key in ENTRY_KEYS if module.params[key] is None]
+        if missing:
+            module.fail_json(msg="missing required arguments: %s" % ','.join(missing))
+        items = [module.params]
+    else:
+        items = module.params['entries']
+
+    entries = []
+    for item in items:
+        if not isinstance(item, dict):
+            module.fail_json(msg="Each item of entries must be a dict")
+        missing = [key for key in ENTRY_KEYS if item.get(key) is None]
+        if missing:
+            module.fail_json(msg="Entry %s is missing %s" % (item, ','.join(missing)))
+        entry = dict((key, str(item[key])) for key in ENTRY_KEYS)
+        if isinstance(item['value'], bool):
+            entry['value'] = entry['value'].lower()
+        entries.append(entry)
+    return entries
+
+
+def read_records(module, ovs_vsctl, entries):
+    """ Read the columns of all records with one ovs-vsctl call. """
+    records = []
+    columns = {}
+    for entry in entries:
+        record = (entry['table'], entry['record'])
+        if record not in columns:
+            records.append(record)
+            columns[record] = []
+        if entry['col'] not in columns[record]:
+            columns[record].append(entry['col'])
+
+    cmd = [ovs_vsctl, '-t', str(module.params['timeout']), '--format=json']
+    for record in records:
+        cmd.extend(['--', '--columns=%s' % ','.join(columns[record]), 'list', record[0], record[1]])
+    (rtc, out, err) = module.run_command(cmd)
+    if rtc != 0:
+        module.fail_json(msg=err, cmd=' '.join(cmd))
 
-def cmd_run(module, cmd, check_rc=True):
-    """ Log and run ovs-vsctl command. """
-    return module.run_command(cmd.split(" "), check_rc=check_rc)
+    ##
+    # ovs-vsctl prints one JSON table per list command, in order.
+    tables = [json.loads(line) for line in out.splitlines() if line.strip()]
+    if len(tables) != len(records):
+        module.fail_json(msg="Unexpected output of ovs-vsctl list", stdout=out)
+
+    current = {}
+    for (record, table) in zip(records, tables):
+        if not table['data']:
+            module.fail_json(msg="no row %s in table %s" % (record[1], record[0]))
+        row = dict(zip(table['headings'], table['data'][0]))
+        for col in columns[record]:
+            current[record + (col,)] = ovsdb_to_python(row.get(col))
+    return current
 
 
 def params_set(module):
@@ -82,27 +188,36 @@ def params_set(module):
 
     changed = False
 
+    ovs_vsctl = module.get_bin_path("ovs-vsctl", True)
+    entries = get_entries(module)
+    current = read_records(module, ovs_vsctl, entries)
+
     ##
-    # Place in params dictionary in order to support the string format below.
-    module.params["ovs-vsctl"] = module.get_bin_path("ovs-vsctl", True)
-
-    fmt = "%(ovs-vsctl)s -t %(timeout)s get %(table)s %(record)s " \
-          "%(col)s:%(key)s"
-
-    cmd = fmt % module.params
-
-    (_, output, _) = cmd_run(module, cmd, False)
-    if module.params['value'] not in output:
-        fmt = "%(ovs-vsctl)s -t %(timeout)s set %(table)s %(record)s " \
-              "%(col)s:%(key)s=%(value)s"
-        cmd = fmt % module.params
-        ##
-        # Check if flow exists and is the same.
-        (rtc, _, err) = cmd_run(module, cmd)
-        if rtc != 0:
-            module.fail_json(msg=err)
+    # Group the changed keys by record, one set command per record.
+    records = []
+    updates = {}
+    changes = []
+    for entry in entries:
+        record = (entry['table'], entry['record'])
+        col = current[record + (entry['col'],)]
+        if isinstance(col, dict) and col.get(entry['key']) == entry['value']:
+            continue
+        if record not in updates:
+            records.append(record)
+            updates[record] = []
+        updates[record].append('%s:%s=%s' % (entry['col'], entry['key'], quote_value(entry['value'])))
+        changes.append(entry)
+
+    if records:
         changed = True
-    module.exit_json(changed=changed)
+        cmd = [ovs_vsctl, '-t', str(module.params['timeout'])]
+        for record in records:
+            cmd.extend(['--', 'set', record[0], record[1]] + updates[record])
+        if not module.check_mode:
+            (rtc, _, err) = module.run_command(cmd)
+            if rtc != 0:
+                module.fail_json(msg=err, cmd=' '.join(cmd))
+    module.exit_json(changed=changed, changes=changes)
 
 
 # pylint: disable=E0602
@@ -110,13 +225,17 @@ def main():
     """ Entry point for ansible module. """
     module = AnsibleModule(
         argument_spec={
-            'table': {'required': True},
-            'record': {'required': True},
-            'col': {'required': True},
-            'key': {'required': True},
-            'value': {'required': True},
+            'table': {'required': False},
+            'record': {'required': False},
+            'col': {'required': False},
+            'key': {'required': False},
+            'value': {'required': False},
+            'entries': {'required': False, 'type': 'list'},
             'timeout': {'default': 5, 'type': 'int'},
         },
+        mutually_exclusive=[['entries', 'table'], ['entries', 'record'],
+                            ['entries', 'col'], ['entries', 'key'],
+                            ['entries', 'value']],
         supports_check_mode=True,
     )
 
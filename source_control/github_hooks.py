@@ -28,6 +28,10 @@ except ImportError:
         pass
 
 import base64
+import os
+import re
+import threading
+import time
 
 DOCUMENTATION = '''
 ---
@@ -48,7 +52,36 @@ options:
   repo:
     description:
       - "This is the API url for the repository you want to manage hooks for. It should be in the form of: https://api.github.com/repos/user:/repo:. Note this is different than the normal repo url."
-    required: true
+      - Required unless I(repos) is given.
+    required: false
+  repos:
+    description:
+      - List of repository API urls, in the same form as I(repo), to run the action against in one task.
+        Repositories are processed concurrently.
+    required: false
+    default: null
+    version_added: "2.3"
+  concurrency:
+    description:
+      - Number of repositories handled at the same time when I(repos) is given.
+    required: false
+    default: 4
+    version_added: "2.3"
+  etag_cache:
+    description:
+      - Path of a file in which hook listings are stored with their ETag. Later runs send
+        C(If-None-Match) and reuse the stored listing when github answers C(304 Not Modified),
+        which does not count against the rate limit.
+    required: false
+    default: null
+    version_added: "2.3"
+  retries:
+    description:
+      - Number of times a request is retried when github answers with a (secondary) rate limit error.
+        The wait honours the C(Retry-After) header and otherwise backs off exponentially.
+    required: false
+    default: 5
+    version_added: "2.3"
   hookurl:
     description:
       - When creating a new hook, this is the url that you want github to post to. It is only required when creating a new hook.
@@ -81,45 +114,158 @@ EXAMPLES = '''
 
 # Cleaning all hooks for this repo that had an error on the last update. Since this works for all hooks in a repo it is probably best that this would be called from a handler.
 - local_action: github_hooks action=cleanall user={{ gituser }} oauthkey={{ oauthkey }} repo={{ repo }}
+
+# Create the same hook on many repositories, reusing cached listings
+- local_action:
+    module: github_hooks
+    action: create
+    hookurl: http://11.111.111.111:2222
+    user: "{{ gituser }}"
+    oauthkey: "{{ oauthkey }}"
+    etag_cache: /var/cache/ansible/github_hooks.json
+    concurrency: 8
+    repos: "{{ repo_api_urls }}"
 '''
 
-def _list(module, hookurl, oauthkey, repo, user):
-    url = "%s/hooks" % repo
-    auth = base64.encodestring('%s:%s' % (user, oauthkey)).replace('\n', '')
-    headers = {
-        'Authorization': 'Basic %s' % auth,
-    }
-    response, info = fetch_url(module, url, headers=headers)
-    if info['status'] != 200:
-        return False, ''
-    else:
-        return False, response.read()
+RETURN = '''
+result:
+    description: Response of the github API for the action
+    returned: when repo is given
+    type: string
+results:
+    description: Per repository response when I(repos) is given
+    returned: when repos is given
+    type: list
+    sample: [{"repo": "https://api.github.com/repos/pcgentry/Github-Auto-Deploy", "result": "[]"}]
+'''
+
+LINK_NEXT_RE = re.compile(r'<([^>]+)>;\s*rel="next"')
+
+
+class GithubClient(object):
+    """ Shared state for all requests of one task: the authorization header
+    is built once, hook listings are cached by ETag and requests are retried
+    with backoff when github signals a (secondary) rate limit. """
+
+    def __init__(self, module, user, oauthkey, etag_cache=None, retries=5):
+        self.module = module
+        auth = base64.b64encode(('%s:%s' % (user, oauthkey)).encode('utf-8')).decode('ascii')
+        self.headers = {
+            'Authorization': 'Basic %s' % auth,
+        }
+        self.retries = retries
+        self.etag_cache = etag_cache
+        self.etags = {}
+        self.etags_changed = False
+        self.lock = threading.Lock()
+        if etag_cache and os.path.exists(etag_cache):
+            try:
+                f = open(etag_cache)
+                try:
+                    self.etags = json.load(f)
+                finally:
+                    f.close()
+            except ValueError:
+                self.etags = {}
 
-def _clean504(module, hookurl, oauthkey, repo, user):
-    current_hooks = _list(hookurl, oauthkey, repo, user)[1]
+    def request(self, url, data=None, method=None, headers=None):
+        all_headers = dict(self.headers)
+        if headers:
+            all_headers.update(headers)
+        delay = 1
+        for attempt in range(self.retries + 1):
+            response, info = fetch_url(self.module, url, data=data, headers=all_headers, method=method)
+            if info['status'] not in (403, 429) or attempt == self.retries:
+                return response, info
+            body = str(info.get('body', ''))
+            if info['status'] == 403 and info.get('x-ratelimit-remaining') != '0' and 'rate limit' not in body:
+                return response, info
+            retry_after = info.get('retry-after')
+            if retry_after:
+                time.sleep(int(retry_after))
+            elif info.get('x-ratelimit-remaining') == '0' and info.get('x-ratelimit-reset'):
+                time.sleep(max(1, int(info['x-ratelimit-reset']) - int(time.time())))
+            else:
+                time.sleep(delay)
+                delay = delay * 2
+        return response, info
+
+    def get_cached(self, url):
+        """ GET url with If-None-Match, returning (status, body) and
+        reusing the cached body on 304 """
+        self.lock.acquire()
+        try:
+            cached = self.etags.get(url)
+        finally:
+            self.lock.release()
+        headers = {}
+        if cached:
+            headers['If-None-Match'] = cached['etag']
+        response, info = self.request(url, headers=headers)
+        if info['status'] == 304 and cached:
+            return 200, cached['body'], cached.get('next')
+        if info['status'] != 200:
+            return info['status'], '', None
+        body = response.read()
+        if not isinstance(body, str):
+            body = body.decode('utf-8')
+        match = LINK_NEXT_RE.search(info.get('link', '') or '')
+        next_url = None
+        if match:
+            next_url = match.group(1)
+        if info.get('etag'):
+            self.lock.acquire()
+            try:
+                self.etags[url] = dict(etag=info['etag'], body=body, next=next_url)
+                self.etags_changed = True
+            finally:
+                self.lock.release()
+        return 200, body, next_url
+
+    def save(self):
+        if self.etag_cache and self.etags_changed:
+            f = open(self.etag_cache, 'w')
+            try:
+                json.dump(self.etags, f)
+            finally:
+                f.close()
+
+
+def _list(client, repo):
+    url = "%s/hooks?per_page=100" % repo
+    hooks = []
+    while url:
+        status, body, url = client.get_cached(url)
+        if status != 200:
+            return False, ''
+        hooks.extend(json.loads(body))
+    return False, json.dumps(hooks)
+
+def _clean504(client, repo):
+    current_hooks = _list(client, repo)[1]
+    if not current_hooks:
+        return 1, current_hooks
     decoded = json.loads(current_hooks)
 
     for hook in decoded:
         if hook['last_response']['code'] == 504:
-            # print "Last response was an ERROR for hook:"
-            # print hook['id']
-            _delete(module, hookurl, oauthkey, repo, user, hook['id'])
-            
+            _delete(client, repo, hook['id'])
+
     return 0, current_hooks
 
-def _cleanall(module, hookurl, oauthkey, repo, user):
-    current_hooks = _list(hookurl, oauthkey, repo, user)[1]
+def _cleanall(client, repo):
+    current_hooks = _list(client, repo)[1]
+    if not current_hooks:
+        return 1, current_hooks
     decoded = json.loads(current_hooks)
 
     for hook in decoded:
         if hook['last_response']['code'] != 200:
-            # print "Last response was an ERROR for hook:"
-            # print hook['id']
-            _delete(module, hookurl, oauthkey, repo, user, hook['id'])
-            
+            _delete(client, repo, hook['id'])
+
     return 0, current_hooks
 
-def _create(module, hookurl, oauthkey, repo, user, content_type):
+def _create(client, repo, hookurl, content_type):
     url = "%s/hooks" % repo
     values = {
         "active": True,
@@ -130,24 +276,55 @@ def _create(module, hookurl, oauthkey, repo, user, content_type):
             }
         }
     data = json.dumps(values)
-    auth = base64.encodestring('%s:%s' % (user, oauthkey)).replace('\n', '')
-    headers = {
-        'Authorization': 'Basic %s' % auth,
-    }
-    response, info = fetch_url(module, url, data=data, headers=headers)
-    if info['status'] != 200:
+    response, info = client.request(url, data=data)
+    if info['status'] not in (200, 201):
         return 0, '[]'
     else:
         return 0, response.read()
 
-def _delete(module, hookurl, oauthkey, repo, user, hookid):
+def _delete(client, repo, hookid):
     url = "%s/hooks/%s" % (repo, hookid)
-    auth = base64.encodestring('%s:%s' % (user, oauthkey)).replace('\n', '')
-    headers = {
-        'Authorization': 'Basic %s' % auth,
-    }
-    response, info = fetch_url(module, url, data=data, headers=headers, method='DELETE')
-    return response.read()
+    response, info = client.request(url, method='DELETE')
+    return info['status']
+
+def run_action(client, action, repo, hookurl, content_type):
+    if action == "list":
+        return _list(client, repo)
+    if action == "clean504":
+        return _clean504(client, repo)
+    if action == "cleanall":
+        return _cleanall(client, repo)
+    return _create(client, repo, hookurl, content_type)
+
+def run_concurrently(client, action, repos, hookurl, content_type, concurrency):
+    results = [None] * len(repos)
+    pending = list(enumerate(repos))
+    lock = threading.Lock()
+
+    def worker():
+        while True:
+            lock.acquire()
+            try:
+                if not pending:
+                    return
+                index, repo = pending.pop(0)
+            finally:
+                lock.release()
+            try:
+                rc, out = run_action(client, action, repo, hookurl, content_type)
+            except Exception:
+                e = get_exception()
+                rc, out = 1, str(e)
+            results[index] = dict(repo=repo, rc=rc, result=out)
+
+    threads = []
+    for i in range(max(1, min(concurrency, len(repos)))):
+        thread = threading.Thread(target=worker)
+        thread.start()
+        threads.append(thread)
+    for thread in threads:
+        thread.join()
+    return results
 
 def main():
     module = AnsibleModule(
@@ -155,31 +332,39 @@ def main():
         action=dict(required=True, choices=['list','clean504','cleanall','create']),
         hookurl=dict(required=False),
         oauthkey=dict(required=True, no_log=True),
-        repo=dict(required=True),
+        repo=dict(required=False),
+        repos=dict(required=False, type='list'),
         user=dict(required=True),
         validate_certs=dict(default='yes', type='bool'),
         content_type=dict(default='json', choices=['json', 'form']),
-        )
+        concurrency=dict(default=4, type='int'),
+        etag_cache=dict(required=False, type='path'),
+        retries=dict(default=5, type='int'),
+        ),
+        required_one_of=[['repo', 'repos']],
+        mutually_exclusive=[['repo', 'repos']],
     )
 
     action = module.params['action']
     hookurl = module.params['hookurl']
-    oauthkey = module.params['oauthkey']
     repo = module.params['repo']
-    user = module.params['user']
+    repos = module.params['repos']
     content_type = module.params['content_type']
 
-    if action == "list":
-        (rc, out) = _list(module, hookurl, oauthkey, repo, user)
-
-    if action == "clean504":
-        (rc, out) = _clean504(module, hookurl, oauthkey, repo, user)
+    client = GithubClient(module, module.params['user'], module.params['oauthkey'],
+                          module.params['etag_cache'], module.params['retries'])
 
-    if action == "cleanall":
-        (rc, out) = _cleanall(module, hookurl, oauthkey, repo, user)
+    if repos is not None:
+        results = run_concurrently(client, action, repos, hookurl, content_type,
+                                   module.params['concurrency'])
+        client.save()
+        failed = [result['repo'] for result in results if result['rc'] != 0]
+        if failed:
+            module.fail_json(msg="failed for %s" % ', '.join(failed), results=results)
+        module.exit_json(msg="success", results=results)
 
-    if action == "create":
-        (rc, out) = _create(module, hookurl, oauthkey, repo, user, content_type)
+    (rc, out) = run_action(client, action, repo, hookurl, content_type)
+    client.save()
 
     if rc != 0:
         module.fail_json(msg="failed", result=out)
@@ -190,5 +375,6 @@ def main():
 # import module snippets
 from ansible.module_utils.basic import *
 from ansible.module_utils.urls import *
+from ansible.module_utils.pycompat24 import get_exception
 
 main()
@@ -65,7 +65,8 @@ options:
     name:
         description:
             - The name of the project
-        required: true
+            - Required unless I(projects) is given.
+        required: false
     path:
         description:
             - The path of the project you want to create, this will be server_url/<group>/path
@@ -129,6 +130,20 @@ options:
         required: false
         default: "present"
         choices: ["present", "absent"]
+    projects:
+        description:
+            - List of projects to reconcile in one task. Each item is a dict which accepts the
+              options name, group, path, description, issues_enabled, merge_requests_enabled,
+              wiki_enabled, snippets_enabled, public, visibility_level, import_url and state.
+              Options missing from an item are taken from the module arguments.
+            - Namespace and project lookups are cached for the whole task, so projects sharing
+              a group resolve it only once.
+        required: false
+        default: null
+        version_added: "2.3"
+notes:
+    - Namespaces and projects are looked up directly by their path, so I(group) is matched against
+      the path or name of a group or user namespace and the project against its I(path).
 '''
 
 EXAMPLES = '''
@@ -153,113 +168,193 @@ EXAMPLES = '''
                 snippets_enabled=true
                 import_url="http://git.example.com/example/lab.git"
                 state=present
+
+- name: "Reconcile several projects in one task"
+  local_action:
+    module: gitlab_project
+    server_url: "https://gitlab.dj-wasabi.local"
+    login_token: "WnUzDsxjy8230-Dy_k"
+    group: ansible
+    projects:
+      - name: roles
+      - name: playbooks
+        wiki_enabled: false
+      - name: old_stuff
+        state: absent
 '''
 
-RETURN = '''# '''
+RETURN = '''
+projects:
+    description: Per project result of the projects mode
+    returned: when projects is given
+    type: list
+    sample: [{"name": "roles", "changed": true, "state": "present"}]
+'''
 
 try:
     import gitlab
+    import requests
     HAS_GITLAB_PACKAGE = True
 except:
     HAS_GITLAB_PACKAGE = False
 
+try:
+    from urllib import quote
+except ImportError:
+    from urllib.parse import quote
+
 from ansible.module_utils.basic import *
 from ansible.module_utils.pycompat24 import get_exception
 
 
+class GitLabLookup(object):
+    """Resolve namespaces, users and projects with direct GET calls by path
+    instead of paging through every group or searching projects, caching
+    every answer for the rest of the run.
+
+    The class is duplicated in the gitlab_project and gitlab_user modules and
+    should be moved into a shared module_utils."""
+
+    def __init__(self, git):
+        self._gitlab = git
+        self._cache = {}
+
+    def get(self, path, **params):
+        key = (path, tuple(sorted(params.items())))
+        if key not in self._cache:
+            response = requests.get(self._gitlab.api_url + path, params=params,
+                                    headers=self._gitlab.headers, verify=self._gitlab.verify_ssl,
+                                    timeout=getattr(self._gitlab, 'timeout', None))
+            if response.status_code == 200:
+                self._cache[key] = response.json()
+            elif response.status_code == 404:
+                self._cache[key] = None
+            else:
+                raise Exception("GET %s returned %s: %s" % (path, response.status_code, response.text))
+        return self._cache[key]
+
+    def find(self, path, match, **params):
+        """Return the first item of the paged list at path for which match
+        is true, only requesting the next page while none matched"""
+        params['per_page'] = 100
+        page = 1
+        while True:
+            params['page'] = page
+            items = self.get(path, **params) or []
+            for item in items:
+                if match(item):
+                    return item
+            if len(items) < params['per_page']:
+                return None
+            page += 1
+
+    def forget(self, path):
+        for key in list(self._cache):
+            if key[0] == path:
+                del self._cache[key]
+
+    def user(self, username):
+        name = username.lower()
+        return self.find('/users', lambda user: user['username'].lower() == name,
+                         username=username)
+
+    def currentUser(self):
+        return self.get('/user')
+
+    def namespace(self, name):
+        if name is None:
+            name = self.currentUser()['username']
+        name = name.lower()
+        return self.find('/namespaces',
+                         lambda namespace: name in (namespace['path'].lower(),
+                                                    namespace.get('name', '').lower()),
+                         search=name)
+
+    def projectPath(self, namespace_path, project_path):
+        return '/projects/%s' % quote('%s/%s' % (namespace_path, project_path), safe='')
+
+    def project(self, namespace_path, project_path):
+        return self.get(self.projectPath(namespace_path, project_path))
+
+
+PROJECT_ITEM_OPTIONS = ['name', 'group', 'path', 'description', 'issues_enabled',
+                        'merge_requests_enabled', 'wiki_enabled', 'snippets_enabled',
+                        'public', 'visibility_level', 'import_url', 'state']
+
+
+def projectItemParams(module, item):
+    """Merge an item of projects over the module arguments, checking every
+    value against the argument_spec of the module's own options. Booleans
+    are converted and numbers turned into strings, other values are kept"""
+    if not isinstance(item, dict) or not item.get('name'):
+        module.fail_json(msg="Each item of projects must be a dict with a name")
+    params = dict(module.params)
+    params['path'] = None
+    for key, value in item.items():
+        if key not in PROJECT_ITEM_OPTIONS:
+            module.fail_json(msg="Unsupported option %s in projects item %s" % (key, item['name']))
+        spec = module.argument_spec[key]
+        if value is not None:
+            if spec.get('type') == 'bool':
+                value = module.boolean(value)
+            elif isinstance(value, int):
+                value = str(value)
+        if 'choices' in spec and value not in spec['choices']:
+            module.fail_json(msg="Value of %s in projects item %s must be one of: %s, got: %s"
+                             % (key, item['name'], ", ".join(spec['choices']), value))
+        params[key] = value
+    return params
+
+
 class GitLabProject(object):
     def __init__(self, module, git):
         self._module = module
         self._gitlab = git
+        self._lookup = GitLabLookup(git)
 
-    def createOrUpdateProject(self, project_exists, group_name, import_url, arguments):
-        is_user = False
-        group_id = self.getGroupId(group_name)
-        if not group_id:
-            group_id = self.getUserId(group_name)
-            is_user = True
-
-        if project_exists:
+    def createOrUpdateProject(self, group_name, import_url, arguments):
+        project = self.getProject(group_name, arguments['path'])
+        if project is not None:
             # Edit project
-            return self.updateProject(group_name, arguments)
-        else:
-            # Create project
-            if self._module.check_mode:
-                self._module.exit_json(changed=True)
-            return self.createProject(is_user, group_id, import_url, arguments)
-
-    def createProject(self, is_user, user_id, import_url, arguments):
-        if is_user:
-            return self._gitlab.createprojectuser(user_id=user_id, import_url=import_url, **arguments)
-        else:
-            group_id = user_id
-            return self._gitlab.createproject(namespace_id=group_id, import_url=import_url, **arguments)
-
-    def deleteProject(self, group_name, project_name):
-        if self.existsGroup(group_name):
-            project_owner = group_name
-        else:
-            project_owner = self._gitlab.currentuser()['username']
-
-        search_results = self._gitlab.searchproject(search=project_name)
-        for result in search_results:
-            owner = result['namespace']['name']
-            if owner == project_owner:
-                return self._gitlab.deleteproject(result['id'])
-
-    def existsProject(self, group_name, project_name):
-        if self.existsGroup(group_name):
-            project_owner = group_name
-        else:
-            project_owner = self._gitlab.currentuser()['username']
-
-        search_results = self._gitlab.searchproject(search=project_name)
-        for result in search_results:
-            owner = result['namespace']['name']
-            if owner == project_owner:
-                return True
-        return False
+            return self.updateProject(project, arguments)
+
+        # Create project
+        if self._module.check_mode:
+            return True
+        namespace = self.getNamespace(group_name)
+        if group_name is None:
+            return self._gitlab.createproject(import_url=import_url, **arguments)
+        if namespace is None:
+            self._module.fail_json(msg="Group or user %s does not exist" % group_name)
+        if namespace['kind'] == 'user':
+            user = self._lookup.user(namespace['path'])
+            return self._gitlab.createprojectuser(user_id=user['id'], import_url=import_url, **arguments)
+        return self._gitlab.createproject(namespace_id=namespace['id'], import_url=import_url, **arguments)
+
+    def deleteProject(self, group_name, project_path):
+        project = self.getProject(group_name, project_path)
+        if project is None:
+            return False
+        if self._module.check_mode:
+            return True
+        return self._gitlab.deleteproject(project['id'])
 
-    def existsGroup(self, group_name):
-        if group_name is not None:
-            # Find the group, if group not exists we try for user
-            for group in self._gitlab.getall(self._gitlab.getgroups):
-                if group['name'] == group_name:
-                    return True
-
-            user_name = group_name
-            user_data = self._gitlab.getusers(search=user_name)
-            for data in user_data:
-                if 'id' in user_data:
-                    return True
-        return False
-
-    def getGroupId(self, group_name):
-        if group_name is not None:
-            # Find the group, if group not exists we try for user
-            for group in self._gitlab.getall(self._gitlab.getgroups):
-                if group['name'] == group_name:
-                    return group['id']
-
-    def getProjectId(self, group_name, project_name):
-        if self.existsGroup(group_name):
-            project_owner = group_name
-        else:
-            project_owner = self._gitlab.currentuser()['username']
+    def existsProject(self, group_name, project_path):
+        return self.getProject(group_name, project_path) is not None
 
-        search_results = self._gitlab.searchproject(search=project_name)
-        for result in search_results:
-            owner = result['namespace']['name']
-            if owner == project_owner:
-                return result['id']
+    def getNamespace(self, group_name):
+        return self._lookup.namespace(group_name)
 
-    def getUserId(self, user_name):
-        user_data = self._gitlab.getusers(search=user_name)
+    def getProject(self, group_name, project_path):
+        namespace = self.getNamespace(group_name)
+        if namespace is None:
+            return None
+        return self._lookup.project(namespace['path'], project_path)
 
-        for data in user_data:
-            if 'id' in data:
-                return data['id']
-        return self._gitlab.currentuser()['id']
+    def forgetProject(self, group_name, project_path):
+        namespace = self.getNamespace(group_name)
+        if namespace is not None:
+            self._lookup.forget(self._lookup.projectPath(namespace['path'], project_path))
 
     def to_bool(self, value):
         if value:
@@ -267,11 +362,8 @@ class GitLabProject(object):
         else:
             return 0
 
-    def updateProject(self, group_name, arguments):
+    def updateProject(self, project_data, arguments):
         project_changed = False
-        project_name = arguments['name']
-        project_id = self.getProjectId(group_name, project_name)
-        project_data = self._gitlab.getproject(project_id=project_id)
 
         for arg_key, arg_value in arguments.items():
             project_data_value = project_data[arg_key]
@@ -287,11 +379,45 @@ class GitLabProject(object):
 
         if project_changed:
             if self._module.check_mode:
-                self._module.exit_json(changed=True)
-            return self._gitlab.editproject(project_id=project_id, **arguments)
+                return True
+            return self._gitlab.editproject(project_id=project_data['id'], **arguments)
         else:
             return False
 
+    def projectArguments(self, params):
+        project_name = params['name']
+        project_path = params['path']
+
+        # Set project_path to project_name if it is empty.
+        if project_path is None:
+            project_path = project_name.replace(" ", "_")
+
+        # Gitlab API makes no difference between upper and lower cases, so we lower them.
+        return {"name": project_name.lower(),
+                "path": project_path.lower(),
+                "description": params['description'],
+                "issues_enabled": self.to_bool(params['issues_enabled']),
+                "merge_requests_enabled": self.to_bool(params['merge_requests_enabled']),
+                "wiki_enabled": self.to_bool(params['wiki_enabled']),
+                "snippets_enabled": self.to_bool(params['snippets_enabled']),
+                "public": self.to_bool(params['public']),
+                "visibility_level": int(params['visibility_level'])}
+
+    def reconcileProject(self, params):
+        group_name = params['group']
+        if group_name is not None:
+            group_name = group_name.lower()
+        arguments = self.projectArguments(params)
+
+        if params['state'] == "absent":
+            changed = bool(self.deleteProject(group_name, arguments['path']))
+        else:
+            changed = bool(self.createOrUpdateProject(group_name, params['import_url'], arguments))
+        if changed and not self._module.check_mode:
+            # later items of the run must not see the cached state of the project
+            self.forgetProject(group_name, arguments['path'])
+        return changed
+
 
 def main():
     module = AnsibleModule(
@@ -302,7 +428,7 @@ def main():
             login_password=dict(required=False, no_log=True),
             login_token=dict(required=False, no_log=True),
             group=dict(required=False),
-            name=dict(required=True),
+            name=dict(required=False),
             path=dict(required=False),
             description=dict(required=False),
             issues_enabled=dict(default=True, type='bool'),
@@ -313,7 +439,9 @@ def main():
             visibility_level=dict(default="0", choices=["0", "10", "20"]),
             import_url=dict(required=False),
             state=dict(default="present", choices=["present", 'absent']),
+            projects=dict(required=False, type='list'),
         ),
+        required_one_of=[['name', 'projects']],
         supports_check_mode=True
     )
 
@@ -325,18 +453,7 @@ def main():
     login_user = module.params['login_user']
     login_password = module.params['login_password']
     login_token = module.params['login_token']
-    group_name = module.params['group']
-    project_name = module.params['name']
-    project_path = module.params['path']
-    description = module.params['description']
-    issues_enabled = module.params['issues_enabled']
-    merge_requests_enabled = module.params['merge_requests_enabled']
-    wiki_enabled = module.params['wiki_enabled']
-    snippets_enabled = module.params['snippets_enabled']
-    public = module.params['public']
-    visibility_level = module.params['visibility_level']
-    import_url = module.params['import_url']
-    state = module.params['state']
+    projects = module.params['projects']
 
     # We need both login_user and login_password or login_token, otherwise we fail.
     if login_user is not None and login_password is not None:
@@ -346,16 +463,6 @@ def main():
     else:
         module.fail_json(msg="No login credentials are given. Use login_user with login_password, or login_token")
 
-    # Set project_path to project_name if it is empty.
-    if project_path is None:
-        project_path = project_name.replace(" ", "_")
-
-    # Gitlab API makes no difference between upper and lower cases, so we lower them.
-    project_name = project_name.lower()
-    project_path = project_path.lower()
-    if group_name is not None:
-        group_name = group_name.lower()
-
     # Lets make an connection to the Gitlab server_url, with either login_user and login_password
     # or with login_token
     try:
@@ -368,33 +475,34 @@ def main():
         e = get_exception()
         module.fail_json(msg="Failed to connect to Gitlab server: %s " % e)
 
-    # Validate if project exists and take action based on "state"
     project = GitLabProject(module, git)
-    project_exists = project.existsProject(group_name, project_name)
-
-    # Creating the project dict
-    arguments = {"name": project_name,
-                 "path": project_path,
-                 "description": description,
-                 "issues_enabled": project.to_bool(issues_enabled),
-                 "merge_requests_enabled": project.to_bool(merge_requests_enabled),
-                 "wiki_enabled": project.to_bool(wiki_enabled),
-                 "snippets_enabled": project.to_bool(snippets_enabled),
-                 "public": project.to_bool(public),
-                 "visibility_level": int(visibility_level)}
-
-    if project_exists and state == "absent":
-        project.deleteProject(group_name, project_name)
-        module.exit_json(changed=True, result="Successfully deleted project %s" % project_name)
-    else:
-        if state == "absent":
-            module.exit_json(changed=False, result="Project deleted or does not exists")
-        else:
-            if project.createOrUpdateProject(project_exists, group_name, import_url, arguments):
-                module.exit_json(changed=True, result="Successfully created or updated the project %s" % project_name)
-            else:
-                module.exit_json(changed=False)
 
+    if projects is not None:
+        # check every item before changing anything
+        items = [projectItemParams(module, item) for item in projects]
+        results = []
+        for params in items:
+            try:
+                changed = project.reconcileProject(params)
+            except Exception:
+                e = get_exception()
+                module.fail_json(msg="Failed to reconcile project %s: %s" % (params['name'], e), projects=results)
+            results.append(dict(name=params['name'], state=params['state'], changed=changed))
+        changed = False
+        for result in results:
+            if result['changed']:
+                changed = True
+        module.exit_json(changed=changed, projects=results)
+
+    project_name = module.params['name'].lower()
+    if project.reconcileProject(module.params):
+        if module.params['state'] == "absent":
+            module.exit_json(changed=True, result="Successfully deleted project %s" % project_name)
+        module.exit_json(changed=True, result="Successfully created or updated the project %s" % project_name)
+    elif module.params['state'] == "absent":
+        module.exit_json(changed=False, result="Project deleted or does not exists")
+    else:
+        module.exit_json(changed=False)
 
 
 if __name__ == '__main__':
@@ -133,18 +133,86 @@ RETURN = '''# '''
 
 try:
     import gitlab
+    import requests
     HAS_GITLAB_PACKAGE = True
 except:
     HAS_GITLAB_PACKAGE = False
 
+try:
+    from urllib import quote
+except ImportError:
+    from urllib.parse import quote
+
 from ansible.module_utils.pycompat24 import get_exception
 from ansible.module_utils.basic import *
 
 
+class GitLabLookup(object):
+    """Resolve groups and users with direct GET calls by path or username
+    instead of paging through every group, caching every answer for the
+    rest of the run.
+
+    The class is duplicated in the gitlab_project and gitlab_user modules and
+    should be moved into a shared module_utils."""
+
+    def __init__(self, git):
+        self._gitlab = git
+        self._cache = {}
+
+    def get(self, path, **params):
+        key = (path, tuple(sorted(params.items())))
+        if key not in self._cache:
+            response = requests.get(self._gitlab.api_url + path, params=params,
+                                    headers=self._gitlab.headers, verify=self._gitlab.verify_ssl,
+                                    timeout=getattr(self._gitlab, 'timeout', None))
+            if response.status_code == 200:
+                self._cache[key] = response.json()
+            elif response.status_code == 404:
+                self._cache[key] = None
+            else:
+                raise Exception("GET %s returned %s: %s" % (path, response.status_code, response.text))
+        return self._cache[key]
+
+    def find(self, path, match, **params):
+        """Return the first item of the paged list at path for which match
+        is true, only requesting the next page while none matched"""
+        params['per_page'] = 100
+        page = 1
+        while True:
+            params['page'] = page
+            items = self.get(path, **params) or []
+            for item in items:
+                if match(item):
+                    return item
+            if len(items) < params['per_page']:
+                return None
+            page += 1
+
+    def forget(self, path):
+        for key in list(self._cache):
+            if key[0] == path:
+                del self._cache[key]
+
+    def user(self, username):
+        name = username.lower()
+        return self.find('/users', lambda user: user['username'].lower() == name,
+                         username=username)
+
+    def group(self, group_name):
+        group = self.get('/groups/%s' % quote(group_name, safe=''))
+        if group is not None:
+            return group
+        name = group_name.lower()
+        return self.find('/groups',
+                         lambda group: name in (group['path'].lower(), group['name'].lower()),
+                         search=group_name)
+
+
 class GitLabUser(object):
     def __init__(self, module, git):
         self._module = module
         self._gitlab = git
+        self._lookup = GitLabLookup(git)
 
     def addToGroup(self, group_id, user_id, access_level):
         if access_level == "guest":
@@ -184,6 +252,7 @@ class GitLabUser(object):
         user_name = arguments['name']
         user_email = arguments['email']
         if self._gitlab.createuser(password=user_password, **arguments):
+            self._lookup.forget('/users')
             user_id = self.getUserId(user_username)
             if self._gitlab.addsshkeyuser(user_id=user_id, title=user_sshkey_name, key=user_sshkey_file):
                 user_changed = True
@@ -208,28 +277,20 @@ class GitLabUser(object):
             self._module.exit_json(changed=False, result="User %s already deleted or something went wrong" % user_username)
 
     def existsGroup(self, group_name):
-        for group in self._gitlab.getall(self._gitlab.getgroups):
-            if group['name'] == group_name:
-                return True
-        return False
+        return self._lookup.group(group_name) is not None
 
     def existsUser(self, username):
-        found_user = self._gitlab.getusers(search=username)
-        for user in found_user:
-            if user['id'] != '':
-                return True
-        return False
+        return self._lookup.user(username) is not None
 
     def getGroupId(self, group_name):
-        for group in self._gitlab.getall(self._gitlab.getgroups):
-            if group['name'] == group_name:
-                return group['id']
+        group = self._lookup.group(group_name)
+        if group is not None:
+            return group['id']
 
     def getUserId(self, username):
-        found_user = self._gitlab.getusers(search=username)
-        for user in found_user:
-            if user['id'] != '':
-                return user['id']
+        user = self._lookup.user(username)
+        if user is not None:
+            return user['id']
 
     def updateUser(self, group_id, user_sshkey_name, user_sshkey_file, access_level, arguments):
         user_changed = False
@@ -37,9 +37,19 @@ version_added: "2.0"
 options:
   name:
     description:
-      - Name of the crontab variable.
+      - Name of the crontab variable. Required unless I(vars) is given.
     default: null
-    required: true
+    required: false
+  vars:
+    description:
+      - A dictionary of crontab variable names and values to manage in one task,
+        mutually exclusive with I(name). With C(state=present) a variable whose
+        value is null is removed, with C(state=absent) all the listed variables
+        are removed. The crontab is parsed once, all the changes are applied in
+        memory and it is installed once, only if the result differs.
+    required: false
+    default: null
+    version_added: "2.3"
   value:
     description:
       - The value to set this variable to.  Required if state=present.
@@ -68,6 +78,14 @@ options:
       - The specific user whose crontab should be modified.
     required: false
     default: root
+  users:
+    description:
+      - A list of users whose crontabs should be modified in the same way, mutually
+        exclusive with I(user) and I(cron_file). The results are returned per user
+        in C(users).
+    required: false
+    default: null
+    version_added: "2.3"
   cron_file:
     description:
       - If specified, uses this file instead of an individual user's crontab.
@@ -78,7 +96,8 @@ options:
   backup:
     description:
       - If set, create a backup of the crontab before it is modified.
-        The location of the backup is returned in the C(backup) variable by this module.
+        The location of the backup is returned in the C(backup) variable by this module,
+        or in the C(backup_file) of every user with I(users).
     required: false
     default: false
 requirements:
@@ -98,6 +117,15 @@ EXAMPLES = '''
 # Adds a variable to a file under /etc/cron.d
 - cronvar: name="LOGFILE" value="/var/log/yum-autoupdate.log"
         user="root" cron_file=ansible_yum-autoupdate
+
+# Set several variables in the crontabs of several users, removing LEGACY
+- cronvar:
+    users: [ app1, app2, app3 ]
+    backup: yes
+    vars:
+      MAILTO: ops@example.com
+      PATH: /usr/local/bin:/usr/bin:/bin
+      LEGACY: ~
 '''
 
 import os
@@ -111,6 +139,9 @@ from ansible.module_utils.pycompat24 import get_exception
 
 CRONCMD = "/usr/bin/crontab"
 
+# Platforms where crontab can not read or write the crontab of another user
+SU_PLATFORMS = ['SunOS', 'HP-UX', 'AIX']
+
 class CronVarError(Exception):
     pass
 
@@ -155,9 +186,13 @@ class CronVar(object):
                 return
             except:
                 raise CronVarError("Unexpected error:", sys.exc_info()[0])
-        else:
+        elif platform.system() in SU_PLATFORMS:
             # using safely quoted shell for now, but this really should be two non-shell calls instead.  FIXME
             (rc, out, err) = self.module.run_command(self._read_user_execute(), use_unsafe_shell=True)
+        else:
+            (rc, out, err) = self.module.run_command(self._user_args() + ['-l'])
+
+        if not self.cron_file:
 
             if rc != 0 and rc != 1: # 1 can mean that there are no jobs.
                 raise CronVarError("Unable to read crontab")
@@ -195,8 +230,11 @@ class CronVar(object):
 
         # Add the entire crontab back to the user crontab
         if not self.cron_file:
-            # quoting shell args for now but really this should be two non-shell calls.  FIXME
-            (rc, out, err) = self.module.run_command(self._write_execute(path), use_unsafe_shell=True)
+            if platform.system() in SU_PLATFORMS:
+                # quoting shell args for now but really this should be two non-shell calls.  FIXME
+                (rc, out, err) = self.module.run_command(self._write_execute(path), use_unsafe_shell=True)
+            else:
+                (rc, out, err) = self.module.run_command(self._user_args() + [path])
             os.unlink(path)
 
             if rc != 0:
@@ -234,6 +272,16 @@ class CronVar(object):
                 pass
         return None
 
+    def get_vars(self):
+        variables = {}
+        for l in self.lines:
+            try:
+                (var_name, value) = self.parse_for_var(l)
+                variables[var_name] = value
+            except CronVarError:
+                pass
+        return variables
+
     def get_var_names(self):
         var_names = []
         for l in self.lines:
@@ -292,6 +340,14 @@ class CronVar(object):
             result += '\n'
         return result
 
+    def _user_args(self):
+        """
+        Returns the crontab arguments selecting the user, for non-shell calls
+        """
+        if self.user:
+            return [CRONCMD, '-u', self.user]
+        return [CRONCMD]
+
     def _read_user_execute(self):
         """
         Returns the command line for reading a crontab
@@ -323,6 +379,53 @@ class CronVar(object):
 
 #==================================================
 
+def update_crontab(module, user, cron_file, variables, ensure_present, insertbefore, insertafter, backup):
+    """
+    Apply all the variable changes to one crontab in memory and install it
+    once, only if the rendered crontab differs.
+    """
+    cronvar = CronVar(module, user, cron_file)
+
+    module.debug('cronvar instantiated - user: "%s"' % cronvar.user)
+
+    original = cronvar.render()
+    current = cronvar.get_vars()
+
+    # variables added without a position are inserted at the top, or right
+    # after insertafter, so add them in reverse to keep them in order
+    if insertbefore is None:
+        variables = list(reversed(variables))
+
+    for (name, value) in variables:
+        if ensure_present and value is not None:
+            if name not in current:
+                cronvar.add_variable(name, value, insertbefore, insertafter)
+            elif current[name] != value:
+                cronvar.update_variable(name, value)
+            current[name] = value
+        elif name in current:
+            cronvar.remove_variable(name)
+            del current[name]
+
+    changed = cronvar.render() != original
+    res_args = {
+        "vars": cronvar.get_var_names(),
+        "changed": changed
+    }
+
+    if changed:
+        # if requested make a backup before making a change
+        if backup:
+            (_, backup_file) = tempfile.mkstemp(prefix='cronvar')
+            fileh = open(backup_file, 'w')
+            fileh.write(original)
+            fileh.close()
+            res_args['backup_file'] = backup_file
+        cronvar.write()
+
+    return res_args
+
+
 def main():
     # The following example playbooks:
     #
@@ -340,22 +443,26 @@ def main():
 
     module = AnsibleModule(
         argument_spec=dict(
-            name=dict(required=True),
+            name=dict(required=False),
             value=dict(required=False),
+            vars=dict(required=False, type='dict'),
             user=dict(required=False),
+            users=dict(required=False, type='list'),
             cron_file=dict(required=False),
             insertafter=dict(default=None),
             insertbefore=dict(default=None),
             state=dict(default='present', choices=['present', 'absent']),
             backup=dict(default=False, type='bool'),
         ),
-        mutually_exclusive=[['insertbefore', 'insertafter']],
+        mutually_exclusive=[['insertbefore', 'insertafter'], ['name', 'vars'],
+                            ['users', 'user'], ['users', 'cron_file']],
         supports_check_mode=False,
     )
 
     name = module.params['name']
     value = module.params['value']
     user = module.params['user']
+    users = module.params['users']
     cron_file = module.params['cron_file']
     insertafter = module.params['insertafter']
     insertbefore = module.params['insertbefore']
@@ -363,66 +470,43 @@ def main():
     backup = module.params['backup']
     ensure_present = state == 'present'
 
-    changed = False
-    res_args = dict()
-
-    # Ensure all files generated are only writable by the owning user.  Primarily relevant for the cron_file option.
-    os.umask(int('022',8))
-    cronvar = CronVar(module, user, cron_file)
-
-    module.debug('cronvar instantiated - name: "%s"' % name)
-
     # --- user input validation ---
 
-    if name is None and ensure_present:
-        module.fail_json(msg="You must specify 'name' to insert a new cron variabale")
-
-    if value is None and ensure_present:
-        module.fail_json(msg="You must specify 'value' to insert a new cron variable")
-
-    if name is None and not ensure_present:
-        module.fail_json(msg="You must specify 'name' to remove a cron variable")
-
-    # if requested make a backup before making a change
-    if backup:
-        (_, backup_file) = tempfile.mkstemp(prefix='cronvar')
-        cronvar.write(backup_file)
-
-    if cronvar.cron_file and not name and not ensure_present:
-        changed = cronvar.remove_job_file()
-        module.exit_json(changed=changed, cron_file=cron_file, state=state)
-
-    old_value = cronvar.find_variable(name)
-
-    if ensure_present:
-        if old_value is None:
-            cronvar.add_variable(name, value, insertbefore, insertafter)
-            changed = True
-        elif old_value != value:
-            cronvar.update_variable(name, value)
-            changed = True
+    if module.params['vars'] is not None:
+        variables = []
+        for var_name in sorted(module.params['vars'].keys()):
+            var_value = module.params['vars'][var_name]
+            if var_value is not None:
+                var_value = str(var_value)
+            variables.append((var_name, var_value))
     else:
-        if old_value is not None:
-            cronvar.remove_variable(name)
-            changed = True
+        if name is None and ensure_present:
+            module.fail_json(msg="You must specify 'name' to insert a new cron variabale")
 
-    res_args = {
-        "vars": cronvar.get_var_names(),
-        "changed": changed
-    }
+        if value is None and ensure_present:
+            module.fail_json(msg="You must specify 'value' to insert a new cron variable")
 
-    if changed:
-        cronvar.write()
+        if name is None and not ensure_present:
+            module.fail_json(msg="You must specify 'name' to remove a cron variable")
 
-    # retain the backup only if crontab or cron file have changed
-    if backup:
-        if changed:
-            res_args['backup_file'] = backup_file
-        else:
-            os.unlink(backup_file)
+        variables = [(name, value)]
 
-    if cron_file:
-        res_args['cron_file'] = cron_file
+    # Ensure all files generated are only writable by the owning user.  Primarily relevant for the cron_file option.
+    os.umask(int('022',8))
+
+    if users is None:
+        res_args = update_crontab(module, user, cron_file, variables, ensure_present,
+                                  insertbefore, insertafter, backup)
+        if cron_file:
+            res_args['cron_file'] = cron_file
+        module.exit_json(**res_args)
+
+    res_args = dict(changed=False, users={})
+    for user in users:
+        res_args['users'][user] = update_crontab(module, user, None, variables, ensure_present,
+                                                 insertbefore, insertafter, backup)
+        if res_args['users'][user]['changed']:
+            res_args['changed'] = True
 
     module.exit_json(**res_args)
 
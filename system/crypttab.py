@@ -30,8 +30,8 @@ options:
     description:
       - Name of the encrypted block device as it appears in the C(/etc/crypttab) file, or
         optionaly prefixed with C(/dev/mapper/), as it appears in the filesystem. I(/dev/mapper/)
-        will be stripped from I(name).
-    required: true
+        will be stripped from I(name). Required unless I(entries) is given.
+    required: false
     default: null
     aliases: []
   state:
@@ -40,8 +40,8 @@ options:
         if already present. Use I(absent) to remove a line with matching I(name).
         Use I(opts_present) to add options to those already present; options with
         different values will be updated. Use I(opts_absent) to remove options from
-        the existing set.
-    required: true
+        the existing set. Required unless I(entries) is given.
+    required: false
     choices: [ "present", "absent", "opts_present", "opts_absent"]
     default: null
   backing_device:
@@ -66,6 +66,15 @@ options:
         in a chroot environment.
     required: false
     default: /etc/crypttab
+  entries:
+    description:
+      - A list of dicts with the I(name), I(state), I(backing_device), I(password)
+        and I(opts) of several devices. I(state) defaults to the I(state) of the
+        task, or C(present). The file is parsed once, all the entries are applied
+        in memory and it is written once with an atomic move.
+    required: false
+    default: null
+    version_added: "2.3"
 
 notes: []
 requirements: []
@@ -80,31 +89,87 @@ EXAMPLES = '''
   crypttab: name={{ item.device }} state=opts_present opts=discard
   with_items: ansible_mounts
   when: '/dev/mapper/luks-' in {{ item.device }}
+
+- name: Set up several devices at once
+  crypttab:
+    entries:
+      - { name: luks-home, backing_device: /dev/sdb1, opts: discard }
+      - { name: luks-data, backing_device: "UUID=0a1b2c3d-4e5f-6a7b-8c9d-0e1f2a3b4c5d", password: /root/data.key }
+      - { name: luks-old, state: absent }
 '''
 
 from ansible.module_utils.basic import *
 from ansible.module_utils.pycompat24 import get_exception
 
+ENTRY_KEYS = ['name', 'state', 'backing_device', 'password', 'opts']
+
+STATES = ['present', 'absent', 'opts_present', 'opts_absent']
+
 def main():
 
     module = AnsibleModule(
         argument_spec = dict(
-            name           = dict(required=True),
-            state          = dict(required=True, choices=['present', 'absent', 'opts_present', 'opts_absent']),
+            name           = dict(default=None),
+            state          = dict(default=None, choices=STATES),
             backing_device = dict(default=None),
             password       = dict(default=None),
             opts           = dict(default=None),
-            path           = dict(default='/etc/crypttab')
+            path           = dict(default='/etc/crypttab'),
+            entries        = dict(default=None, type='list')
         ),
+        mutually_exclusive = [['entries', 'name'], ['entries', 'backing_device'],
+                              ['entries', 'password'], ['entries', 'opts']],
         supports_check_mode = True
     )
 
-    backing_device = module.params['backing_device']
-    password       = module.params['password']
-    opts           = module.params['opts']
-    state          = module.params['state']
     path           = module.params['path']
-    name           = module.params['name']
+
+    if module.params['entries'] is None:
+        for required in ('name', 'state'):
+            if module.params[required] is None:
+                module.fail_json(msg="missing required arguments: %s" % required)
+        entries = [dict((key, module.params[key]) for key in ENTRY_KEYS)]
+    else:
+        entries = module.params['entries']
+
+    try:
+        crypttab = Crypttab(path)
+    except Exception:
+        e = get_exception()
+        module.fail_json(msg="failed to open and parse crypttab file: %s" % e,
+                         **module.params)
+
+    changed, reasons = False, []
+    for entry in entries:
+        if not isinstance(entry, dict):
+            module.fail_json(msg="Each item of entries must be a dict", **module.params)
+        entry_changed, reason = apply_entry(module, crypttab, entry)
+        changed = changed or entry_changed
+        reasons.append(reason)
+
+    if changed and not module.check_mode:
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+        f = os.fdopen(fd, 'w')
+        try:
+            f.write(str(crypttab))
+        finally:
+            f.close()
+        module.atomic_move(tmp_path, path)
+
+    module.exit_json(changed=changed, msg=', '.join(reasons), **module.params)
+
+
+def apply_entry(module, crypttab, entry):
+    backing_device = entry.get('backing_device')
+    password       = entry.get('password')
+    opts           = entry.get('opts')
+    state          = entry.get('state') or module.params['state'] or 'present'
+    name           = entry.get('name')
+    if name is None:
+        module.fail_json(msg="missing 'name' in entry %s" % entry, **module.params)
+    if state not in STATES:
+        module.fail_json(msg="invalid state '%s' for %s, expected one of %s" % (state, name, ', '.join(STATES)),
+                         **module.params)
     if name.startswith('/dev/mapper/'):
         name = name[len('/dev/mapper/'):]
 
@@ -126,13 +191,7 @@ def main():
             module.fail_json(msg="invalid '%s': contains white space or is empty" % arg_name,
                              **module.params)
 
-    try:
-        crypttab = Crypttab(path)
-        existing_line = crypttab.match(name)
-    except Exception:
-        e = get_exception()
-        module.fail_json(msg="failed to open and parse crypttab file: %s" % e,
-                         **module.params)
+    existing_line = crypttab.match(name)
 
     if 'present' in state and existing_line is None and backing_device is None:
         module.fail_json(msg="'backing_device' required to add a new entry",
@@ -160,23 +219,16 @@ def main():
         if existing_line is not None:
             changed, reason = existing_line.opts.remove(opts)
 
-
-    if changed and not module.check_mode:
-        try:
-            f = open(path, 'wb')
-            f.write(str(crypttab))
-        finally:
-            f.close()
-
-    module.exit_json(changed=changed, msg=reason, **module.params)
+    return changed, reason
 
 
 class Crypttab(object):
 
-    _lines = []
-
     def __init__(self, path):
         self.path = path
+        self._lines = []
+        # first valid line of every name, as returned by match()
+        self._index = {}
         if not os.path.exists(path):
             if not os.path.exists(os.path.dirname(path)):
                 os.makedirs(os.path.dirname(path))
@@ -185,12 +237,17 @@ class Crypttab(object):
         try:
             f = open(path, 'r')
             for line in f.readlines():
-                self._lines.append(Line(line))
+                self._append(Line(line))
         finally:
             f.close()
 
-    def add(self, line):
+    def _append(self, line):
         self._lines.append(line)
+        if line.valid() and line.name not in self._index:
+            self._index[line.name] = line
+
+    def add(self, line):
+        self._append(line)
         return True, 'added line'
 
     def lines(self):
@@ -199,15 +256,25 @@ class Crypttab(object):
                 yield line
 
     def match(self, name):
+        line = self._index.get(name)
+        if line is None:
+            return None
+        if line.valid() and line.name == name:
+            return line
+        # the indexed line was removed, look for a later duplicate
+        del self._index[name]
         for line in self.lines():
             if line.name == name:
+                self._index[name] = line
                 return line
         return None
 
     def __str__(self):
         lines = []
         for line in self._lines:
-            lines.append(str(line))
+            # skip removed lines, keep comments and blank lines as they were
+            if line.valid() or line.line:
+                lines.append(str(line).rstrip('\n'))
         crypttab = '\n'.join(lines)
         if len(crypttab) == 0:
             crypttab += '\n'
@@ -287,7 +354,7 @@ class Line(object):
                 if self.password is not None:
                     fields.append(self.password)
                 else:
-                    self.password('none')
+                    fields.append('none')
             if self.opts:
                 fields.append(str(self.opts))
             return ' '.join(fields)
@@ -50,6 +50,36 @@ options:
         default: True
         description:
             - If a supplied key is missing this will make the task fail if True
+    keys:
+        required: False
+        default: None
+        version_added: "2.3"
+        description:
+            - list of keys to look up with a single getent invocation. Mutually exclusive
+              with I(key). With I(fail_key=False), keys that are not found are set to None.
+    fields:
+        required: False
+        default: None
+        version_added: "2.3"
+        description:
+            - list of 0-based indexes of the values to keep for every entry, counted after the
+              entry name, for example C([1, 4]) to keep only the uid and the home directory
+              of passwd entries. By default all values are kept.
+    limit:
+        required: False
+        default: None
+        version_added: "2.3"
+        description:
+            - when enumerating a whole database, stop after this many matching entries.
+              The output of getent is streamed, so enumeration of directory-backed
+              databases stops as soon as the limit is reached.
+    filter:
+        required: False
+        default: None
+        version_added: "2.3"
+        description:
+            - when enumerating a whole database, only keep entries whose name matches this
+              regular expression
 
 notes:
    - "Not all databases support enumeration, check system documentation for details"
@@ -78,11 +108,65 @@ EXAMPLES = '''
 - getent: database=shadow key=www-data split=:
 - debug: var=getent_shadow
 
+# get the uid and home directory of several users with one lookup
+- getent:
+    database: passwd
+    keys: [ root, www-data, postgres ]
+    fields: [ 1, 4 ]
+    fail_key: False
+- debug: var=getent_passwd
+
+# get at most 100 groups starting with "app", stop enumerating after that
+- getent: database=group filter=^app limit=100
+
 '''
 
+import re
+import signal
+import subprocess
+
 from ansible.module_utils.basic import *
 from ansible.module_utils.pycompat24 import get_exception
 
+# Keys passed to a single getent invocation
+KEYS_PER_CALL = 500
+
+# column holding the numeric id that getent also accepts as a key
+ID_COLUMNS = { 'passwd': 2, 'group': 2 }
+
+
+def project(record, fields):
+    values = record[1:]
+    if fields is None:
+        return values
+    return [values[i] for i in fields if i < len(values)]
+
+
+def enumerate_database(module, cmd, split, fields, limit, name_filter):
+    """ Stream the enumeration of a database, keeping only the projected
+    fields of matching entries and stopping once limit entries were read """
+    entries = {}
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                            universal_newlines=True)
+    truncated = False
+    for line in proc.stdout:
+        record = line.rstrip('\n').split(split)
+        if name_filter is not None and not name_filter.search(record[0]):
+            continue
+        if limit is not None and len(entries) >= limit:
+            truncated = True
+            break
+        entries[record[0]] = project(record, fields)
+    if truncated:
+        os.kill(proc.pid, signal.SIGTERM)
+    proc.stdout.close()
+    err = proc.stderr.read()
+    proc.stderr.close()
+    rc = proc.wait()
+    if truncated:
+        rc = 0
+    return rc, entries, err
+
 def main():
     module = AnsibleModule(
         argument_spec = dict(
@@ -90,7 +174,12 @@ def main():
             key      = dict(required=False, default=None),
             split    = dict(required=False, default=None),
             fail_key = dict(required=False, type='bool', default=True),
+            keys     = dict(required=False, type='list', default=None),
+            fields   = dict(required=False, type='list', default=None),
+            limit    = dict(required=False, type='int', default=None),
+            filter   = dict(required=False, default=None),
         ),
+        mutually_exclusive = [['key', 'keys']],
         supports_check_mode = True,
     )
 
@@ -100,40 +189,80 @@ def main():
     key      = module.params.get('key')
     split    = module.params.get('split')
     fail_key = module.params.get('fail_key')
+    keys     = module.params.get('keys')
+    fields   = module.params.get('fields')
+    limit    = module.params.get('limit')
 
     getent_bin = module.get_bin_path('getent', True)
 
-    if key is not None:
-        cmd = [ getent_bin, database, key ]
-    else:
-        cmd = [ getent_bin, database ]
-
     if split is None and database in colon:
         split = ':'
 
-    try:
-        rc, out, err = module.run_command(cmd)
-    except Exception:
-        e = get_exception()
-        module.fail_json(msg=str(e))
+    if fields is not None:
+        try:
+            fields = [int(field) for field in fields]
+        except ValueError:
+            module.fail_json(msg="fields must be a list of integer indexes")
+
+    name_filter = None
+    if module.params.get('filter') is not None:
+        try:
+            name_filter = re.compile(module.params['filter'])
+        except re.error:
+            e = get_exception()
+            module.fail_json(msg="Invalid filter: %s" % e)
+
+    if key is not None:
+        keys = [ key ]
 
     msg = "Unexpected failure!"
     dbtree = 'getent_%s' % database
     results = { dbtree: {} }
 
-    if rc == 0:
-        for line in out.splitlines():
-            record = line.split(split)
-            results[dbtree][record[0]] = record[1:]
+    if keys is None:
+        try:
+            rc, results[dbtree], err = enumerate_database(module, [ getent_bin, database ],
+                                                          split, fields, limit, name_filter)
+        except Exception:
+            e = get_exception()
+            module.fail_json(msg=str(e))
+        if rc == 0:
+            module.exit_json(ansible_facts=results)
+    else:
+        rc = 0
+        found = set()
+        id_column = ID_COLUMNS.get(database)
+        for start in range(0, len(keys), KEYS_PER_CALL):
+            cmd = [ getent_bin, database ] + keys[start:start + KEYS_PER_CALL]
+            try:
+                chunk_rc, out, err = module.run_command(cmd)
+            except Exception:
+                e = get_exception()
+                module.fail_json(msg=str(e))
+
+            for line in out.splitlines():
+                record = line.split(split)
+                results[dbtree][record[0]] = project(record, fields)
+                found.add(record[0])
+                if id_column is not None and len(record) > id_column:
+                    found.add(record[id_column])
+            if chunk_rc not in (0, 2):
+                rc = chunk_rc
+                break
+            if chunk_rc == 2:
+                rc = 2
 
-        module.exit_json(ansible_facts=results)
+        if rc == 0:
+            module.exit_json(ansible_facts=results)
 
-    elif rc == 1:
+    if rc == 1:
         msg = "Missing arguments, or database unknown."
     elif rc == 2:
         msg = "One or more supplied key could not be found in the database."
         if not fail_key:
-            results[dbtree][key] = None
+            for missing in keys:
+                if missing not in found:
+                    results[dbtree][missing] = None
             module.exit_json(ansible_facts=results, msg=msg)
     elif rc == 3:
         msg = "Enumeration not supported on this database."
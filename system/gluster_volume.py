@@ -94,7 +94,15 @@ options:
     required: false
     default: null
     description:
-      - Quota value for limit-usage (be sure to use 10.0MB instead of 10MB, see quota list)
+      - Quota value for limit-usage, for example 10MB or 1.5GB
+  quotas:
+    required: false
+    default: null
+    version_added: "2.3"
+    description:
+      - A dictionary of directories and their quota value for limit-usage. The limits are
+        compared in bytes against a single C(quota list --xml) snapshot and only the
+        directories whose limit differs are changed.
   force:
     required: false
     default: null
@@ -104,6 +112,7 @@ options:
 notes:
   - "Requires cli tools for GlusterFS on servers"
   - "Will add new bricks, but not remove them"
+  - "Changed options are set with a single C(volume set) transaction where gluster accepts it"
 author: "Taneli Leppä (@rosmo)"
 """
 
@@ -121,6 +130,14 @@ EXAMPLES = """
 - name: limit usage
   gluster_volume: state=present name=test1 directory=/foo quota=20.0MB
 
+- name: limit usage of several directories
+  gluster_volume:
+    state: present
+    name: test1
+    quotas:
+      /foo: 20MB
+      /bar: 1GB
+
 - name: stop gluster volume
   gluster_volume: state=stopped name=test1
 
@@ -135,11 +152,19 @@ EXAMPLES = """
 import shutil
 import time
 import socket
+import xml.etree.ElementTree as ET
 from ansible.module_utils.pycompat24 import get_exception
 from ansible.module_utils.basic import *
 
 glusterbin = ''
 
+TRANSPORTS = { '0': 'tcp', '1': 'rdma', '2': 'tcp,rdma' }
+
+SIZE_UNITS = { '': 1, 'B': 1, 'K': 1024, 'M': 1024 ** 2, 'G': 1024 ** 3, 'T': 1024 ** 4, 'P': 1024 ** 5 }
+
+# Options that glusterd only accepts on their own in a volume set command
+SINGLE_OPTIONS = [ 'group', 'history' ]
+
 def run_gluster(gargs, **kwargs):
     global glusterbin
     global module
@@ -174,75 +199,88 @@ def run_gluster_yes(gargs):
         module.fail_json(msg='error running gluster (%s) command (rc=%d): %s' % (' '.join(args), rc, out or err))
     return out
 
+def parse_xml(gargs, out):
+    global module
+    try:
+        root = ET.fromstring(out)
+    except Exception:
+        e = get_exception()
+        module.fail_json(msg='error parsing gluster (%s) xml output: %s' % (' '.join(gargs), str(e)))
+    return root
+
+def run_gluster_xml(gargs, nofail=False):
+    gargs = gargs + [ '--xml' ]
+    if nofail:
+        out = run_gluster_nofail(gargs)
+        if not out:
+            return None
+    else:
+        out = run_gluster(gargs)
+    root = parse_xml(gargs, out)
+    if root.findtext('opRet', '0') != '0':
+        if nofail:
+            return None
+        module.fail_json(msg='error running gluster (%s) command: %s' % (' '.join(gargs), root.findtext('opErrstr')))
+    return root
+
 def get_peers():
-    out = run_gluster([ 'peer', 'status'])
-    i = 0
+    root = run_gluster_xml([ 'peer', 'status' ])
     peers = {}
-    hostname = None
-    uuid = None
-    state = None
-    for row in out.split('\n'):
-        if ': ' in row:
-            key, value = row.split(': ')
-            if key.lower() == 'hostname':
-                hostname = value
-            if key.lower() == 'uuid':
-                uuid = value
-            if key.lower() == 'state':
-                state = value
-                peers[hostname] = [ uuid, state ]
+    for peer in root.findall('peerStatus/peer'):
+        value = [ peer.findtext('uuid'), peer.findtext('stateStr') ]
+        peers[peer.findtext('hostname')] = value
+        # peers probed under several names are known by all of them
+        for hostname in peer.findall('hostnames/hostname'):
+            peers[hostname.text] = value
     return peers
 
 def get_volumes():
-    out = run_gluster([ 'volume', 'info' ])
+    root = run_gluster_xml([ 'volume', 'info' ])
 
     volumes = {}
-    volume = {}
-    for row in out.split('\n'):
-        if ': ' in row:
-            key, value = row.split(': ')
-            if key.lower() == 'volume name':
-                volume['name'] = value
-                volume['options'] = {}
-                volume['quota'] = False
-            if key.lower() == 'volume id':
-                volume['id'] = value
-            if key.lower() == 'status':
-                volume['status'] = value
-            if key.lower() == 'transport-type':
-                volume['transport'] = value
-            if key.lower() != 'bricks' and key.lower()[:5] == 'brick':
-                if not 'bricks' in volume:
-                    volume['bricks'] = []
-                volume['bricks'].append(value)
-            # Volume options
-            if '.' in key:
-                if not 'options' in volume:
-                    volume['options'] = {}
-                volume['options'][key] = value
-                if key == 'features.quota' and value == 'on':
-                    volume['quota'] = True
-        else:
-            if row.lower() != 'bricks:' and row.lower() != 'options reconfigured:':
-                if len(volume) > 0:
-                    volumes[volume['name']] = volume
-                volume = {}
+    for vol in root.findall('volInfo/volumes/volume'):
+        volume = {}
+        volume['name'] = vol.findtext('name')
+        volume['id'] = vol.findtext('id')
+        volume['status'] = vol.findtext('statusStr')
+        volume['transport'] = TRANSPORTS.get(vol.findtext('transport'), vol.findtext('transport'))
+        volume['bricks'] = []
+        for brick in vol.findall('bricks/brick'):
+            volume['bricks'].append(brick.findtext('name') or brick.text.strip())
+        volume['options'] = {}
+        for option in vol.findall('options/option'):
+            volume['options'][option.findtext('name')] = option.findtext('value')
+        volume['quota'] = volume['options'].get('features.quota') == 'on'
+        volumes[volume['name']] = volume
     return volumes
 
 def get_quotas(name, nofail):
     quotas = {}
-    if nofail:
-        out = run_gluster_nofail([ 'volume', 'quota', name, 'list' ])
-        if not out:
-            return quotas
-    else:
-        out = run_gluster([ 'volume', 'quota', name, 'list' ])
-    for row in out.split('\n'):
-        if row[:1] == '/':
-            q = re.split('\s+', row)
-            quotas[q[0]] = q[1]
+    root = run_gluster_xml([ 'volume', 'quota', name, 'list' ], nofail)
+    if root is None:
+        return quotas
+    for limit in root.findall('volQuota/limit'):
+        quotas[limit.findtext('path')] = limit.findtext('hard_limit')
     return quotas
 
+def parse_size(value):
+    """ Return a size such as 10MB, 10.0MB or 10485760 in bytes, None if it
+    can not be parsed """
+    m = re.match(r'^\s*([0-9.]+)\s*([BKMGTP]?)B?\s*$', str(value), re.IGNORECASE)
+    if not m:
+        return None
+    try:
+        return int(float(m.group(1)) * SIZE_UNITS[m.group(2).upper()])
+    except ValueError:
+        return None
+
+def quota_differs(current, wanted):
+    current_bytes = parse_size(current)
+    wanted_bytes = parse_size(wanted)
+    if current_bytes is None or wanted_bytes is None:
+        return current != wanted
+    return current_bytes != wanted_bytes
+
 def wait_for_peer(host):
     for x in range(0, 4):
         peers = get_peers()
@@ -291,6 +329,22 @@ def stop_volume(name):
 def set_volume_option(name, option, parameter):
     run_gluster([ 'volume', 'set', name, option, parameter ])
 
+def set_volume_options(name, options):
+    """ Set several options in one glusterd transaction, one by one if this
+    gluster version does not take several key/value pairs """
+    batch = []
+    for option in sorted(options.keys()):
+        if option in SINGLE_OPTIONS:
+            set_volume_option(name, option, options[option])
+        else:
+            batch.extend([ option, str(options[option]) ])
+    if len(batch) == 2:
+        set_volume_option(name, batch[0], batch[1])
+    elif batch:
+        if run_gluster_nofail([ 'volume', 'set', name ] + batch) is None:
+            for i in range(0, len(batch), 2):
+                set_volume_option(name, batch[i], batch[i + 1])
+
 def add_bricks(name, new_bricks, force):
     args = [ 'volume', 'add-brick', name ]
     args.extend(new_bricks)
@@ -326,6 +380,7 @@ def main():
             rebalance=dict(required=False, default=False, type='bool'),
             options=dict(required=False, default={}, type='dict'),
             quota=dict(required=False),
+            quotas=dict(required=False, default=None, type='dict'),
             directory=dict(required=False, default=None),
             force=dict(required=False, default=False, type='bool'),
             )
@@ -367,14 +422,19 @@ def main():
     options = module.params['options']
     quota = module.params['quota']
     directory = module.params['directory']
+    wanted_quotas = module.params['quotas'] or {}
+    if quota:
+        wanted_quotas[directory] = quota
 
 
     # get current state info
     peers = get_peers()
     volumes = get_volumes()
     quotas = {}
+    quotas_read = False
     if volume_name in volumes and volumes[volume_name]['quota'] and volumes[volume_name]['status'].lower() == 'started':
         quotas = get_quotas(volume_name, True)
+        quotas_read = True
 
     # do the work!
     if action == 'absent':
@@ -396,6 +456,7 @@ def main():
         if volume_name in volumes:
             if volumes[volume_name]['status'].lower() != 'started' and start_on_create:
                 start_volume(volume_name)
+                volumes[volume_name]['status'] = 'Started'
                 changed = True
 
             # switch bricks
@@ -416,22 +477,36 @@ def main():
 
             if new_bricks:
                 add_bricks(volume_name, new_bricks, force)
+                volumes[volume_name]['bricks'].extend(new_bricks)
                 changed = True
 
             # handle quotas
-            if quota:
+            if wanted_quotas:
                 if not volumes[volume_name]['quota']:
                     enable_quota(volume_name)
-                quotas = get_quotas(volume_name, False)
-                if directory not in quotas or quotas[directory] != quota:
-                    set_quota(volume_name, directory, quota)
+                    volumes[volume_name]['quota'] = True
+                    volumes[volume_name]['options']['features.quota'] = 'on'
                     changed = True
+                if not quotas_read:
+                    quotas = get_quotas(volume_name, False)
+                    quotas_read = True
+                for quota_dir in sorted(wanted_quotas.keys()):
+                    quota_value = str(wanted_quotas[quota_dir])
+                    if quota_dir not in quotas or quota_differs(quotas[quota_dir], quota_value):
+                        set_quota(volume_name, quota_dir, quota_value)
+                        quotas[quota_dir] = str(parse_size(quota_value) or quota_value)
+                        changed = True
 
             # set options
+            changed_options = {}
             for option in options.keys():
-                if option not in volumes[volume_name]['options'] or volumes[volume_name]['options'][option] != options[option]:
-                    set_volume_option(volume_name, option, options[option])
-                    changed = True
+                if option not in volumes[volume_name]['options'] or volumes[volume_name]['options'][option] != str(options[option]):
+                    changed_options[option] = options[option]
+            if changed_options:
+                set_volume_options(volume_name, changed_options)
+                for option in changed_options.keys():
+                    volumes[volume_name]['options'][option] = str(changed_options[option])
+                changed = True
 
         else:
             module.fail_json(msg='failed to create volume %s' % volume_name)
@@ -442,17 +517,21 @@ def main():
     if action == 'started':
         if volumes[volume_name]['status'].lower() != 'started':
             start_volume(volume_name)
+            volumes[volume_name]['status'] = 'Started'
             changed = True
 
     if action == 'stopped':
         if volumes[volume_name]['status'].lower() != 'stopped':
             stop_volume(volume_name)
+            volumes[volume_name]['status'] = 'Stopped'
             changed = True
 
-    if changed:
-        volumes = get_volumes()
-        if rebalance:
-            do_rebalance(volume_name)
+    # the snapshot is kept up to date above instead of reading it again
+    if changed and rebalance:
+        do_rebalance(volume_name)
+
+    if action == 'absent' and changed:
+        del volumes[volume_name]
 
     facts = {}
     facts['glusterfs'] = { 'peers': peers, 'volumes': volumes, 'quotas': quotas }
@@ -28,9 +28,18 @@ options:
     name:
         description:
              - Name and encoding of the locale, such as "en_GB.UTF-8".
-        required: true
+               Required unless I(names) is given.
+        required: false
         default: null
         aliases: []
+    names:
+        description:
+             - List of locales to manage in one task, mutually exclusive with I(name).
+               /etc/locale.gen is edited in a single pass and, where C(localedef) is
+               available, only the changed locales are compiled, in parallel.
+        required: false
+        default: null
+        version_added: "2.3"
     state:
       description:
            - Whether the locale shall be present.
@@ -42,12 +51,23 @@ options:
 EXAMPLES = '''
 # Ensure a locale exists.
 - locale_gen: name=de_CH.UTF-8 state=present
+
+# Ensure several locales exist, compiling only the missing ones
+- locale_gen:
+    names: [ de_CH.UTF-8, fr_CH.UTF-8, it_CH.UTF-8, en_GB.UTF-8 ]
 '''
 
 import os
 import os.path
 from subprocess import Popen, PIPE, call
 import re
+import threading
+
+try:
+    from multiprocessing import cpu_count
+except ImportError:
+    def cpu_count():
+        return 1
 
 from ansible.module_utils.basic import *
 from ansible.module_utils.pycompat24 import get_exception
@@ -90,10 +110,22 @@ def is_available(name, ubuntuMode):
     fd.close()
     return False
 
+_installed_locales = None
+
+def installed_locales():
+    """Returns the normalized names of the installed locales, mapped to the
+    name listed by locale -a. The listing is read once per run."""
+    global _installed_locales
+    if _installed_locales is None:
+        output = Popen(["locale", "-a"], stdout=PIPE, universal_newlines=True).communicate()[0]
+        _installed_locales = {}
+        for line in output.splitlines():
+            _installed_locales[fix_case(line)] = line
+    return _installed_locales
+
 def is_present(name):
     """Checks if the given locale is currently installed."""
-    output = Popen(["locale", "-a"], stdout=PIPE).communicate()[0]
-    return any(fix_case(name) == fix_case(line) for line in output.splitlines())
+    return fix_case(name) in installed_locales()
 
 def fix_case(name):
     """locale -a might return the encoding in either lower or upper case.
@@ -117,14 +149,28 @@ def replace_line(existing_line, new_line):
 
 def set_locale(name, enabled=True):
     """ Sets the state of the locale. Defaults to enabled. """
-    search_string = '#{0,1}\s*%s (?P<charset>.+)' % name
-    if enabled:
-        new_string = '%s \g<charset>' % (name)
-    else:
-        new_string = '# %s \g<charset>' % (name)
+    return set_locales({name: enabled})
+
+def set_locales(states):
+    """ Sets the state of several locales in one pass over /etc/locale.gen.
+    states maps each locale to True to enable it or False to disable it.
+    Returns the charset of every locale found. """
+    line_re = re.compile('^#{0,1}\s*(?P<locale>\S+) (?P<charset>.+)')
+    charsets = {}
+    lines = []
     try:
         f = open("/etc/locale.gen", "r")
-        lines = [re.sub(search_string, new_string, line) for line in f]
+        for line in f:
+            m = line_re.match(line)
+            if m and m.group('locale') in states:
+                name = m.group('locale')
+                charset = m.group('charset').rstrip()
+                charsets[name] = charset
+                if states[name]:
+                    line = '%s %s\n' % (name, charset)
+                else:
+                    line = '# %s %s\n' % (name, charset)
+            lines.append(line)
     finally:
         f.close()
     try:
@@ -132,6 +178,88 @@ def set_locale(name, enabled=True):
         f.write("".join(lines))
     finally:
         f.close()
+    return charsets
+
+def run_concurrently(func, items, limit):
+    """ Call func for every item with at most limit calls in flight and
+    return the results in the order of items
+    """
+    results = [None] * len(items)
+    pending = list(enumerate(items))
+    lock = threading.Lock()
+
+    def worker():
+        while True:
+            lock.acquire()
+            try:
+                if not pending:
+                    return
+                (index, item) = pending.pop(0)
+            finally:
+                lock.release()
+            try:
+                results[index] = func(item)
+            except Exception:
+                e = get_exception()
+                results[index] = (1, str(e))
+
+    threads = []
+    for i in range(max(1, min(limit, len(items)))):
+        thread = threading.Thread(target=worker)
+        thread.start()
+        threads.append(thread)
+    for thread in threads:
+        thread.join()
+    return results
+
+def run_localedef(args):
+    process = Popen(args, stdout=PIPE, stderr=PIPE, universal_newlines=True)
+    (out, err) = process.communicate()
+    return (process.returncode, err or out)
+
+def compile_locales(localedef, names, charsets):
+    """Compile only the given locales into the locale archive, one
+    localedef per locale, as many at once as there are cores."""
+    missing = [name for name in names if charsets.get(name) is None]
+    if missing:
+        raise EnvironmentError(1, "No charset found in /etc/locale.gen for %s" % ", ".join(missing))
+    commands = []
+    for name in names:
+        # de_CH.UTF-8 is compiled from the de_CH source, sr_RS@latin from sr_RS@latin
+        source = re.sub('\\.[^@]*', '', name)
+        command = [localedef, '-i', source, '-c', '-f', charsets[name]]
+        if os.path.exists('/usr/share/locale/locale.alias'):
+            command.extend(['-A', '/usr/share/locale/locale.alias'])
+        commands.append(command + [name])
+    for (command, result) in zip(commands, run_concurrently(run_localedef, commands, cpu_count())):
+        # -c makes localedef exit with 1 on warnings, the locale is still written
+        if result[0] not in (0, 1):
+            raise EnvironmentError(result[0], "localedef failed to execute for %s: %s" % (command[-1], result[1]))
+
+def delete_locales(localedef, names):
+    """Delete the given locales from the locale archive with a single call."""
+    archived = [installed_locales()[fix_case(name)] for name in names if is_present(name)]
+    if archived:
+        result = run_localedef([localedef, '--delete-from-archive'] + archived)
+        if result[0] != 0:
+            raise EnvironmentError(result[0], "localedef failed to execute: %s" % result[1])
+
+def apply_changes(targetState, names, localedef=None):
+    """Create or remove several locales with a single edit of /etc/locale.gen.
+
+    With localedef, only the given locales are compiled or deleted, otherwise
+    a single locale-gen regenerates all the enabled locales.
+    """
+    charsets = set_locales(dict((name, targetState == "present") for name in names))
+
+    if localedef is None:
+        localeGenExitValue = call("locale-gen")
+        if localeGenExitValue!=0:
+            raise EnvironmentError(localeGenExitValue, "locale.gen failed to execute, it returned "+str(localeGenExitValue))
+    elif targetState == "present":
+        compile_locales(localedef, names, charsets)
+    else:
+        delete_locales(localedef, names)
 
 def apply_change(targetState, name):
     """Create or remove locale.
@@ -156,12 +284,16 @@ def apply_change_ubuntu(targetState, name):
     
     Keyword arguments:
     targetState -- Desired state, either present or absent.
-    name -- Name including encoding such as de_CH.UTF-8.
+    name -- Name including encoding such as de_CH.UTF-8, or a list of them.
     """
+    if isinstance(name, list):
+        names = name
+    else:
+        names = [name]
     if targetState=="present":
         # Create locale.
         # Ubuntu's patched locale-gen automatically adds the new locale to /var/lib/locales/supported.d/local
-        localeGenExitValue = call(["locale-gen", name])
+        localeGenExitValue = call(["locale-gen"] + names)
     else:
         # Delete locale involves discarding the locale from /var/lib/locales/supported.d/local and regenerating all locales.
         try:
@@ -173,7 +305,7 @@ def apply_change_ubuntu(targetState, name):
             f = open("/var/lib/locales/supported.d/local", "w")
             for line in content:
                 locale, charset = line.split(' ')
-                if locale != name:
+                if locale not in names:
                     f.write(line)
         finally:
             f.close()
@@ -191,14 +323,21 @@ def main():
 
     module = AnsibleModule(
         argument_spec = dict(
-            name = dict(required=True),
+            name = dict(required=False),
+            names = dict(required=False, type='list'),
             state = dict(choices=['present','absent'], default='present'),
         ),
+        mutually_exclusive=[['name', 'names']],
+        required_one_of=[['name', 'names']],
         supports_check_mode=True
     )
 
     name = module.params['name']
     state = module.params['state']
+    if module.params['names'] is not None:
+        names = module.params['names']
+    else:
+        names = [name]
 
     if not os.path.exists("/etc/locale.gen"):
         if os.path.exists("/var/lib/locales/supported.d/"):
@@ -210,30 +349,41 @@ def main():
         # We found the common way to manage locales.
         ubuntuMode = False
 
-    if not is_available(name, ubuntuMode):
+    unavailable = [locale for locale in names if not is_available(locale, ubuntuMode)]
+    if unavailable:
         module.fail_json(msg="The locales you've entered is not available "
-                             "on your system.")
+                             "on your system.", unavailable=unavailable)
+
+    # only the locales whose state differs are edited and compiled
+    to_change = []
+    for locale in names:
+        if is_present(locale):
+            prev_state = "present"
+        else:
+            prev_state = "absent"
+        if prev_state!=state and locale not in to_change:
+            to_change.append(locale)
+    changed = bool(to_change)
 
-    if is_present(name):
-        prev_state = "present"
-    else:
-        prev_state = "absent"
-    changed = (prev_state!=state)
-    
     if module.check_mode:
-        module.exit_json(changed=changed)
+        module.exit_json(changed=changed, changed_locales=to_change)
     else:
         if changed:
             try:
                 if ubuntuMode==False:
-                    apply_change(state, name)
+                    if module.params['names'] is None:
+                        apply_change(state, name)
+                    else:
+                        apply_changes(state, to_change, module.get_bin_path('localedef'))
                 else:
-                    apply_change_ubuntu(state, name)
+                    apply_change_ubuntu(state, to_change)
             except EnvironmentError:
                 e = get_exception()
                 module.fail_json(msg=e.strerror, exitValue=e.errno)
 
-        module.exit_json(name=name, changed=changed, msg="OK")
+        if module.params['names'] is None:
+            module.exit_json(name=name, changed=changed, msg="OK")
+        module.exit_json(names=names, changed=changed, changed_locales=to_change, msg="OK")
 
 
 main()
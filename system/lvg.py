@@ -79,16 +79,6 @@ EXAMPLES = '''
 - lvg: vg=vg.services state=absent
 '''
 
-def parse_vgs(data):
-    vgs = []
-    for line in data.splitlines():
-        parts = line.strip().split(';')
-        vgs.append({
-            'name': parts[0],
-            'pv_count': int(parts[1]),
-            'lv_count': int(parts[2]),
-        })
-    return vgs
 
 def find_mapper_device_name(module, dm_device):
         dmsetup_cmd = module.get_bin_path('dmsetup', True)
@@ -101,6 +91,7 @@ def find_mapper_device_name(module, dm_device):
 
 def parse_pvs(module, data):
     pvs = []
+    vgs = {}
     dm_prefix = '/dev/dm-'
     for line in data.splitlines():
         parts = line.strip().split(';')
@@ -110,7 +101,45 @@ def parse_pvs(module, data):
             'name': parts[0],
             'vg_name': parts[1],
         })
-    return pvs
+        if parts[1] and parts[1] not in vgs:
+            vgs[parts[1]] = {
+                'name': parts[1],
+                'pv_count': int(parts[2]),
+                'lv_count': int(parts[3]),
+            }
+    return pvs, vgs
+
+
+class LvmReport(object):
+    """ Physical volumes and volume group counters read with a single pvs
+    call, reused for the whole module run instead of separate pvs and vgs
+    scans. """
+
+    def __init__(self, module, vg):
+        self.module = module
+        self.vg = vg
+        self.pvs = None
+        self.vgs = None
+
+    def load(self, all_pvs):
+        """ Read the snapshot unless already done. Unless all_pvs is set,
+        only the physical volumes of the volume group are reported. """
+        if self.pvs is not None:
+            return
+        pvs_cmd = self.module.get_bin_path('pvs', True)
+        cmd = [pvs_cmd, '--noheadings', '--separator', ';', '-o', 'pv_name,vg_name,pv_count,lv_count']
+        rc, out, err = 1, '', ''
+        if not all_pvs:
+            rc, out, err = self.module.run_command(cmd + ['--select', 'vg_name=%s' % self.vg])
+        if rc != 0:
+            # LVM releases before 2.02.107 have no --select
+            rc, out, err = self.module.run_command(cmd)
+        if rc != 0:
+            self.module.fail_json(msg="Failed executing pvs command.", rc=rc, err=err)
+        self.pvs, self.vgs = parse_pvs(self.module, out)
+
+    def this_vg(self):
+        return self.vgs.get(self.vg)
 
 def main():
     module = AnsibleModule(
@@ -131,6 +160,7 @@ def main():
     pesize = module.params['pesize']
     vgoptions = module.params['vg_options'].split()
 
+    dev_list = []
     if module.params['pvs']:
         dev_list = module.params['pvs']
     elif state == 'present':
@@ -146,34 +176,21 @@ def main():
             if not os.path.exists(test_dev):
                 module.fail_json(msg="Device %s not found."%test_dev)
 
-        ### get pv list
-        pvs_cmd = module.get_bin_path('pvs', True)
-        rc,current_pvs,err = module.run_command("%s --noheadings -o pv_name,vg_name --separator ';'" % pvs_cmd)
-        if rc != 0:
-            module.fail_json(msg="Failed executing pvs command.",rc=rc, err=err)
+    ### get pv list and volume group counters, other volume groups are
+    ### only needed to check that the given devices are not in use
+    report = LvmReport(module, vg)
+    report.load(all_pvs=(state == 'present'))
+    pvs = report.pvs
 
+    if state=='present':
         ### check pv for devices
-        pvs = parse_pvs(module, current_pvs)
         used_pvs = [ pv for pv in pvs if pv['name'] in dev_list and pv['vg_name'] and pv['vg_name'] != vg ]
         if used_pvs:
             module.fail_json(msg="Device %s is already in %s volume group."%(used_pvs[0]['name'],used_pvs[0]['vg_name']))
 
-    vgs_cmd = module.get_bin_path('vgs', True)
-    rc,current_vgs,err = module.run_command("%s --noheadings -o vg_name,pv_count,lv_count --separator ';'" % vgs_cmd)
-
-    if rc != 0:
-        module.fail_json(msg="Failed executing vgs command.",rc=rc, err=err)
-
     changed = False
 
-    vgs = parse_vgs(current_vgs)
-
-    for test_vg in vgs:
-        if test_vg['name'] == vg:
-            this_vg = test_vg
-            break
-    else:
-        this_vg = None
+    this_vg = report.this_vg()
 
     if this_vg is None:
         if state == 'present':
@@ -81,6 +81,8 @@ options:
     default: yes
 notes:
   - Filesystems on top of the volume are not resized.
+  - The volume group is read with a single C(lvm fullreport) (LVM 2.02.158 and later) or
+    C(lvs) call limited to I(vg), which is reused for the whole task.
 '''
 
 EXAMPLES = '''
@@ -129,32 +131,118 @@ EXAMPLES = '''
 
 import re
 
+try:
+    import json
+except ImportError:
+    import simplejson as json
+
 decimal_point = re.compile(r"(\d+)")
 
+VG_FIELDS = 'vg_name,vg_size,vg_free,vg_extent_size'
+LV_FIELDS = 'lv_name,lv_size'
+
 def mkversion(major, minor, patch):
     return (1000 * 1000 * int(major)) + (1000 * int(minor)) + int(patch)
 
-def parse_lvs(data):
-    lvs = []
-    for line in data.splitlines():
-        parts = line.strip().split(';')
-        lvs.append({
-            'name': parts[0].replace('[','').replace(']',''),
-            'size': int(decimal_point.match(parts[1]).group(1))
-        })
-    return lvs
-
-def parse_vgs(data):
-    vgs = []
-    for line in data.splitlines():
-        parts = line.strip().split(';')
-        vgs.append({
-            'name': parts[0],
-            'size': int(decimal_point.match(parts[1]).group(1)),
-            'free': int(decimal_point.match(parts[2]).group(1)),
-            'ext_size': int(decimal_point.match(parts[3]).group(1))
-        })
-    return vgs
+def to_int(value):
+    return int(decimal_point.match(value.strip()).group(1))
+
+def parse_lv(name, size):
+    return {
+        'name': name.strip().replace('[','').replace(']',''),
+        'size': to_int(size)
+    }
+
+def parse_vg(name, size, free, ext_size):
+    return {
+        'name': name.strip(),
+        'size': to_int(size),
+        'free': to_int(free),
+        'ext_size': to_int(ext_size)
+    }
+
+
+class LvmReport(object):
+    """ Snapshot of one volume group and its logical volumes.
+
+    The snapshot is read once per module run with a single reporting command
+    limited to the volume group: ``lvm fullreport`` in JSON on LVM releases
+    that have it, a combined ``lvs`` call with the volume group columns
+    otherwise. Every device scan costs seconds on hosts with many LUNs. """
+
+    FULLREPORT_VERSION = mkversion(2, 2, 158)
+
+    def __init__(self, module, vg, unit, version):
+        self.module = module
+        self.vg = vg
+        self.unit = unit
+        self.version = version
+        self.this_vg = None
+        self.lvs = None
+
+    def load(self):
+        """ Read the snapshot unless already done, returns (rc, err) """
+        if self.lvs is not None:
+            return 0, ''
+        if self.version >= self.FULLREPORT_VERSION:
+            rc, err = self._load_fullreport()
+            if rc == 0:
+                return rc, err
+        return self._load_lvs()
+
+    def _load_fullreport(self):
+        lvm_cmd = self.module.get_bin_path("lvm", required=True)
+        rc, out, err = self.module.run_command([lvm_cmd, 'fullreport', '-a', '--reportformat', 'json',
+                                                '--units', self.unit, '--nosuffix',
+                                                '--configreport', 'vg', '-o', VG_FIELDS,
+                                                '--configreport', 'lv', '-o', LV_FIELDS,
+                                                self.vg])
+        if rc != 0:
+            return rc, err
+        try:
+            reports = json.loads(out)['report']
+        except (ValueError, KeyError):
+            return 1, 'Unable to parse lvm fullreport output'
+        for report in reports:
+            vgs = report.get('vg', [])
+            if not vgs or vgs[0]['vg_name'] != self.vg:
+                continue
+            self.this_vg = parse_vg(vgs[0]['vg_name'], vgs[0]['vg_size'], vgs[0]['vg_free'], vgs[0]['vg_extent_size'])
+            self.lvs = [parse_lv(lv['lv_name'], lv['lv_size']) for lv in report.get('lv', [])]
+            return 0, ''
+        return 5, 'Volume group "%s" not found' % self.vg
+
+    def _load_lvs(self):
+        lvs_cmd = self.module.get_bin_path("lvs", required=True)
+        rc, out, err = self.module.run_command([lvs_cmd, '-a', '--noheadings', '--nosuffix',
+                                                '--units', self.unit, '--separator', ';',
+                                                '-o', '%s,%s' % (VG_FIELDS, LV_FIELDS), self.vg])
+        if rc != 0:
+            return rc, err
+        self.lvs = []
+        for line in out.splitlines():
+            parts = line.strip().split(';')
+            if len(parts) < 6:
+                continue
+            self.this_vg = parse_vg(*parts[0:4])
+            self.lvs.append(parse_lv(*parts[4:6]))
+        if self.this_vg is None:
+            # lvs prints no row for a volume group without logical volumes
+            vgs_cmd = self.module.get_bin_path("vgs", required=True)
+            rc, out, err = self.module.run_command([vgs_cmd, '--noheadings', '--nosuffix',
+                                                    '--units', self.unit, '--separator', ';',
+                                                    '-o', VG_FIELDS, self.vg])
+            if rc != 0:
+                self.lvs = None
+                return rc, err
+            self.this_vg = parse_vg(*out.strip().split(';')[0:4])
+        return 0, ''
+
+    def find_lv(self, name):
+        for test_lv in self.lvs:
+            if test_lv['name'] == name:
+                return test_lv
+        return None
 
 
 def get_lvm_version(module):
@@ -253,10 +341,9 @@ def main():
     else:
         unit = size_unit
 
-    # Get information on volume group requested
-    vgs_cmd = module.get_bin_path("vgs", required=True)
-    rc, current_vgs, err = module.run_command(
-        "%s --noheadings -o vg_name,size,free,vg_extent_size --units %s --separator ';' %s" % (vgs_cmd, unit, vg))
+    # Get information on the volume group and its logical volumes
+    report = LvmReport(module, vg, unit, version_found)
+    rc, err = report.load()
 
     if rc != 0:
         if state == 'absent':
@@ -264,34 +351,15 @@ def main():
         else:
             module.fail_json(msg="Volume group %s does not exist." % vg, rc=rc, err=err)
 
-    vgs = parse_vgs(current_vgs)
-    this_vg = vgs[0]
-
-    # Get information on logical volume requested
-    lvs_cmd = module.get_bin_path("lvs", required=True)
-    rc, current_lvs, err = module.run_command(
-        "%s -a --noheadings --nosuffix -o lv_name,size --units %s --separator ';' %s" % (lvs_cmd, unit, vg))
-
-    if rc != 0:
-        if state == 'absent':
-            module.exit_json(changed=False, stdout="Volume group %s does not exist." % vg, stderr=False)
-        else:
-            module.fail_json(msg="Volume group %s does not exist." % vg, rc=rc, err=err)
+    this_vg = report.this_vg
 
     changed = False
 
-    lvs = parse_lvs(current_lvs)
-
     if snapshot is None:
         check_lv = lv
     else:
         check_lv = snapshot
-    for test_lv in lvs:
-        if test_lv['name'] == check_lv:
-            this_lv = test_lv
-            break
-    else:
-        this_lv = None
+    this_lv = report.find_lv(check_lv)
 
     if state == 'present' and not size:
         if this_lv is None:
@@ -36,22 +36,32 @@ description:
 options:
   domain:
     description:
-      - A username, @groupname, wildcard, uid/gid range.
-    required: true
+      - A username, @groupname, wildcard, uid/gid range. Required unless I(limits) is given.
+    required: false
   limit_type:
     description:
-      - Limit type, see C(man limits) for an explanation
-    required: true
+      - Limit type, see C(man limits) for an explanation. Required unless I(limits) is given.
+    required: false
     choices: [ "hard", "soft", "-" ]
   limit_item:
     description:
-      - The limit to be set
-    required: true
+      - The limit to be set. Required unless I(limits) is given.
+    required: false
     choices: [ "core", "data", "fsize", "memlock", "nofile", "rss", "stack", "cpu", "nproc", "as", "maxlogins", "maxsyslogins", "priority", "locks", "sigpending", "msgqueue", "nice", "rtprio", "chroot" ]
   value:
     description:
-      - The value of the limit.
-    required: true
+      - The value of the limit. Required unless I(limits) is given.
+    required: false
+  limits:
+    description:
+      - A list of limits to set in one task, each a dict with I(domain), I(limit_type),
+        I(limit_item) and I(value), and optionally I(use_min), I(use_max), I(comment)
+        and I(dest), which default to the options of the task.
+      - Every file is parsed once, all its limits are applied in memory and it is
+        written once with an atomic move, keeping comments and the order of the lines.
+    required: false
+    default: null
+    version_added: "2.3"
   backup:
     description:
       - Create a backup file including the timestamp information so you can get
@@ -96,171 +106,225 @@ EXAMPLES = '''
 
 # Add or modify memlock, both soft and hard, limit for the user james with a comment.
 - pam_limits: domain=james limit_type=- limit_item=memlock value=unlimited comment="unlimited memory lock for james"
-'''
 
-def main():
-
-    pam_items = [ 'core', 'data', 'fsize', 'memlock', 'nofile', 'rss', 'stack', 'cpu', 'nproc', 'as', 'maxlogins', 'maxsyslogins', 'priority', 'locks', 'sigpending', 'msgqueue', 'nice', 'rtprio', 'chroot' ]
-
-    pam_types = [ 'soft', 'hard', '-' ]
-
-    limits_conf = '/etc/security/limits.conf'
-
-    module = AnsibleModule(
-        # not checking because of daisy chain to file module
-        argument_spec = dict(
-            domain            = dict(required=True, type='str'),
-            limit_type        = dict(required=True, type='str', choices=pam_types),
-            limit_item        = dict(required=True, type='str', choices=pam_items),
-            value             = dict(required=True, type='str'),
-            use_max           = dict(default=False, type='bool'),
-            use_min           = dict(default=False, type='bool'),
-            backup            = dict(default=False, type='bool'),
-            dest              = dict(default=limits_conf, type='str'),
-            comment           = dict(required=False, default='', type='str')
-        )
-    )
-
-    domain      =       module.params['domain']
-    limit_type  =       module.params['limit_type']
-    limit_item  =       module.params['limit_item']
-    value       =       module.params['value']
-    use_max     =       module.params['use_max']
-    use_min     =       module.params['use_min']
-    backup      =       module.params['backup']
-    limits_conf =       module.params['dest']
-    new_comment =       module.params['comment']
-
-    changed = False
-
-    if os.path.isfile(limits_conf):
-        if not os.access(limits_conf, os.W_OK):
-            module.fail_json(msg="%s is not writable. Use sudo" % (limits_conf) )
-    else:
-        module.fail_json(msg="%s is not visible (check presence, access rights, use sudo)" % (limits_conf) )
+# Set several limits, writing each file once
+- pam_limits:
+    limits:
+      - { domain: '*', limit_type: soft, limit_item: nofile, value: 64000 }
+      - { domain: '*', limit_type: hard, limit_item: nofile, value: 64000 }
+      - { domain: '*', limit_type: hard, limit_item: core, value: 0 }
+      - { domain: '@db', limit_type: '-', limit_item: memlock, value: unlimited, dest: /etc/security/limits.d/90-db.conf }
+'''
 
-    if use_max and use_min:
-        module.fail_json(msg="Cannot use use_min and use_max at the same time." )
+UNLIMITED = [ 'unlimited', 'infinity', '-1' ]
 
-    if not (value in ['unlimited', 'infinity', '-1'] or value.isdigit()):
-        module.fail_json(msg="Argument 'value' can be one of 'unlimited', 'infinity', '-1' or positive number. Refer to manual pages for more details.")
+LIMIT_KEYS = [ 'domain', 'limit_type', 'limit_item', 'value', 'use_max', 'use_min', 'dest', 'comment' ]
 
-    # Backup
-    if backup:
-        backup_file = module.backup_local(limits_conf)
 
+def parse_limits(module, limits_conf):
+    """ Read a limits file, return its lines and an index of the line numbers
+    of every (domain, type, item) """
     space_pattern = re.compile(r'\s+')
+    f = open(limits_conf, 'r')
+    try:
+        lines = f.readlines()
+    finally:
+        f.close()
 
-    message = ''
-    f = open (limits_conf, 'r')
-    # Tempfile
-    nf = tempfile.NamedTemporaryFile(delete = False)
-
-    found = False
-    new_value = value
-
-    for line in f:
-
+    index = {}
+    for (i, line) in enumerate(lines):
         if line.startswith('#'):
-            nf.write(line)
             continue
-
         newline = re.sub(space_pattern, ' ', line).strip()
-        if not newline:
-            nf.write(line)
+        # Remove comment in line
+        line_fields = newline.split('#',1)[0].rstrip().split(' ')
+        if len(line_fields) != 4:
             continue
 
-        # Remove comment in line
-        newline = newline.split('#',1)[0]
-        try:
-            old_comment = line.split('#',1)[1]
-        except:
-            old_comment = ''
+        if not (line_fields[3] in UNLIMITED or line_fields[3].isdigit()):
+            module.fail_json(msg="Invalid configuration of '%s'. Current value of %s is unsupported." % (limits_conf, line_fields[2]))
 
-        newline = newline.rstrip()
+        index.setdefault(tuple(line_fields[0:3]), []).append(i)
+    return lines, index
 
-        if not new_comment:
-            new_comment = old_comment
 
-        if new_comment:
-            new_comment = "\t#"+new_comment
+def apply_limit(lines, index, limit):
+    """ Apply one limit to the parsed lines, return whether they changed and
+    the resulting line """
+    key = (limit['domain'], limit['limit_type'], limit['limit_item'])
+    value = limit['value']
+    changed = False
+    message = ''
 
-        line_fields = newline.split(' ')
+    for i in index.get(key, []):
+        line = lines[i]
+        actual_value = re.sub(r'\s+', ' ', line).strip().split('#',1)[0].rstrip().split(' ')[3]
+        new_value = value
 
-        if len(line_fields) != 4:
-            nf.write(line)
+        if value == actual_value:
+            message = line
             continue
 
-        line_domain     = line_fields[0]
-        line_type       = line_fields[1]
-        line_item       = line_fields[2]
-        actual_value    = line_fields[3]
-
-        if not (actual_value in ['unlimited', 'infinity', '-1'] or actual_value.isdigit()):
-            module.fail_json(msg="Invalid configuration of '%s'. Current value of %s is unsupported." % (limits_conf, line_item))
-
-        # Found the line
-        if line_domain == domain and line_type == limit_type and line_item == limit_item:
-            found = True
-            if value == actual_value:
-                message = line
-                nf.write(line)
-                continue
-
-            actual_value_unlimited = actual_value in ['unlimited', 'infinity', '-1']
-            value_unlimited = value in ['unlimited', 'infinity', '-1']
-
-            if use_max:
-                if value.isdigit() and actual_value.isdigit():
-                    new_value = max(int(value), int(actual_value))
-                elif actual_value_unlimited:
-                    new_value = actual_value
-                else:
-                    new_value = value
-
-            if use_min:
-                if value.isdigit() and actual_value.isdigit():
-                    new_value = min(int(value), int(actual_value))
-                elif value_unlimited:
-                    new_value = actual_value
-                else:
-                    new_value = value
-
-            # Change line only if value has changed
-            if new_value != actual_value:
-                changed = True
-                new_limit = domain + "\t" + limit_type + "\t" + limit_item + "\t" + str(new_value) + new_comment + "\n"
-                message = new_limit
-                nf.write(new_limit)
+        actual_value_unlimited = actual_value in UNLIMITED
+        value_unlimited = value in UNLIMITED
+
+        if limit['use_max']:
+            if value.isdigit() and actual_value.isdigit():
+                new_value = max(int(value), int(actual_value))
+            elif actual_value_unlimited:
+                new_value = actual_value
             else:
-                message = line
-                nf.write(line)
-        else:
-            nf.write(line)
+                new_value = value
 
-    if not found:
+        if limit['use_min']:
+            if value.isdigit() and actual_value.isdigit():
+                new_value = min(int(value), int(actual_value))
+            elif value_unlimited:
+                new_value = actual_value
+            else:
+                new_value = value
+
+        # Change line only if value has changed
+        if str(new_value) != actual_value:
+            changed = True
+            comment = limit['comment']
+            if not comment and '#' in line:
+                comment = line.split('#',1)[1].rstrip('\n')
+            lines[i] = format_limit(key, new_value, comment)
+        message = lines[i]
+
+    if key not in index:
         changed = True
-        new_limit = domain + "\t" + limit_type + "\t" + limit_item + "\t" + str(new_value) + new_comment + "\n"
-        message = new_limit
-        nf.write(new_limit)
+        if lines and not lines[-1].endswith('\n'):
+            lines[-1] += '\n'
+        lines.append(format_limit(key, value, limit['comment']))
+        index[key] = [ len(lines) - 1 ]
+        message = lines[-1]
 
-    f.close()
-    nf.flush()
+    return changed, message
 
-    # Copy tempfile to newfile
-    module.atomic_move(nf.name, f.name)
 
-    try:
-        nf.close()
-    except:
-        pass
-   
-    res_args = dict(
-        changed = changed, msg = message
+def format_limit(key, value, comment):
+    if comment:
+        comment = "\t#" + comment
+    return "\t".join(list(key) + [ str(value) ]) + comment + "\n"
+
+def main():
+
+    pam_items = [ 'core', 'data', 'fsize', 'memlock', 'nofile', 'rss', 'stack', 'cpu', 'nproc', 'as', 'maxlogins', 'maxsyslogins', 'priority', 'locks', 'sigpending', 'msgqueue', 'nice', 'rtprio', 'chroot' ]
+
+    pam_types = [ 'soft', 'hard', '-' ]
+
+    limits_conf = '/etc/security/limits.conf'
+
+    module = AnsibleModule(
+        # not checking because of daisy chain to file module
+        argument_spec = dict(
+            domain            = dict(required=False, type='str'),
+            limit_type        = dict(required=False, type='str', choices=pam_types),
+            limit_item        = dict(required=False, type='str', choices=pam_items),
+            value             = dict(required=False, type='str'),
+            limits            = dict(required=False, type='list'),
+            use_max           = dict(default=False, type='bool'),
+            use_min           = dict(default=False, type='bool'),
+            backup            = dict(default=False, type='bool'),
+            dest              = dict(default=limits_conf, type='str'),
+            comment           = dict(required=False, default='', type='str')
+        ),
+        mutually_exclusive = [ [ 'limits', 'domain' ], [ 'limits', 'limit_type' ],
+                               [ 'limits', 'limit_item' ], [ 'limits', 'value' ] ],
+        required_one_of = [ [ 'limits', 'domain' ] ]
     )
 
-    if backup:
-        res_args['backup_file'] = backup_file
+    backup      =       module.params['backup']
+
+    if module.params['limits'] is None:
+        for required in [ 'domain', 'limit_type', 'limit_item', 'value' ]:
+            if module.params[required] is None:
+                module.fail_json(msg="missing required arguments: %s" % required)
+        items = [ dict((key, module.params[key]) for key in LIMIT_KEYS) ]
+    else:
+        items = module.params['limits']
+
+    # Group the limits by file, keeping their order
+    files = []
+    file_limits = {}
+    for item in items:
+        if not isinstance(item, dict):
+            module.fail_json(msg="Each item of limits must be a dict")
+        limit = {}
+        for key in LIMIT_KEYS:
+            limit[key] = item.get(key, module.params[key])
+        for required in [ 'domain', 'limit_type', 'limit_item', 'value' ]:
+            if limit[required] is None:
+                module.fail_json(msg="Limit %s is missing %s" % (item, required))
+        limit['value'] = str(limit['value'])
+        limit['use_max'] = module.boolean(limit['use_max'])
+        limit['use_min'] = module.boolean(limit['use_min'])
+        limit['comment'] = limit['comment'] or ''
+
+        if limit['limit_type'] not in pam_types:
+            module.fail_json(msg="limit_type must be one of %s, got %s" % (', '.join(pam_types), limit['limit_type']))
+        if limit['limit_item'] not in pam_items:
+            module.fail_json(msg="limit_item must be one of %s, got %s" % (', '.join(pam_items), limit['limit_item']))
+        if limit['use_max'] and limit['use_min']:
+            module.fail_json(msg="Cannot use use_min and use_max at the same time." )
+        if not (limit['value'] in UNLIMITED or limit['value'].isdigit()):
+            module.fail_json(msg="Argument 'value' can be one of 'unlimited', 'infinity', '-1' or positive number. Refer to manual pages for more details.")
+
+        if limit['dest'] not in file_limits:
+            files.append(limit['dest'])
+            file_limits[limit['dest']] = []
+        file_limits[limit['dest']].append(limit)
+
+    for limits_conf in files:
+        if os.path.isfile(limits_conf):
+            if not os.access(limits_conf, os.W_OK):
+                module.fail_json(msg="%s is not writable. Use sudo" % (limits_conf) )
+        else:
+            module.fail_json(msg="%s is not visible (check presence, access rights, use sudo)" % (limits_conf) )
+
+    changed = False
+    messages = []
+    backup_files = {}
+
+    for limits_conf in files:
+        # Backup
+        if backup:
+            backup_files[limits_conf] = module.backup_local(limits_conf)
+
+        lines, index = parse_limits(module, limits_conf)
+        file_changed = False
+        for limit in file_limits[limits_conf]:
+            (limit_changed, message) = apply_limit(lines, index, limit)
+            file_changed = file_changed or limit_changed
+            messages.append(message)
+
+        if file_changed:
+            changed = True
+            # Tempfile
+            nf = tempfile.NamedTemporaryFile(mode = 'w', delete = False)
+            try:
+                nf.write(''.join(lines))
+                nf.flush()
+            finally:
+                nf.close()
+
+            # Copy tempfile to newfile
+            module.atomic_move(nf.name, limits_conf)
+
+    if module.params['limits'] is None:
+        res_args = dict(
+            changed = changed, msg = messages[0]
+        )
+        if backup:
+            res_args['backup_file'] = backup_files[files[0]]
+    else:
+        res_args = dict(
+            changed = changed, msg = ''.join(messages)
+        )
+        if backup:
+            res_args['backup_files'] = backup_files
 
     module.exit_json(**res_args)
 
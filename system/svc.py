@@ -28,9 +28,26 @@ description:
     - Controls daemontools services on remote hosts using the svc utility.
 options:
     name:
-        required: true
+        required: false
+        description:
+            - Name of the service to manage. Required unless I(names) is given.
+    names:
+        required: false
+        version_added: "2.3"
+        description:
+            - List of services to manage in one task, mutually exclusive with I(name).
+              All the services are queried with a single svstat call, the control
+              signal is sent to all the services that need it with a single svc call,
+              and the task waits until each service reached the target state, read
+              from its C(supervise/status) file.
+    timeout:
+        required: false
+        default: 30
+        version_added: "2.3"
         description:
-            - Name of the service to manage.
+            - With I(names), how many seconds to wait for the services to reach the
+              target state of C(started), C(stopped), C(restarted) or C(killed).
+              Use 0 to not wait.
     state:
         required: false
         choices: [ started, stopped, restarted, reloaded, once ]
@@ -83,10 +100,25 @@ EXAMPLES = '''
 
 # Example using alt svc directory location
  - svc: name=dnscache state=reloaded service_dir=/var/service
+
+# Example action to restart several services and wait until they are all up again
+ - svc:
+     names: [ dnscache, tinydns, axfrdns ]
+     state: restarted
+     timeout: 60
 '''
 
 import platform
 import shlex
+import struct
+import time
+
+# supervise/status starts with a TAI64N label, TAI64 counts from 2^62 plus
+# the 10 seconds TAI was ahead of UTC in 1970
+TAI64_EPOCH = 4611686018427387914
+
+# signal sent by svc for each state
+SVC_FLAGS = { 'started': '-u', 'stopped': '-d', 'restarted': '-t', 'killed': '-k', 'reloaded': '-1', 'once': '-o' }
 from ansible.module_utils.pycompat24 import get_exception
 from ansible.module_utils.basic import *
 
@@ -120,13 +152,13 @@ class Svc(object):
 
 
 
-    def __init__(self, module):
+    def __init__(self, module, name=None, status=True):
         self.extra_paths = [ '/command', '/usr/local/bin' ]
         self.report_vars = ['state', 'enabled', 'downed', 'svc_full', 'src_full', 'pid', 'duration', 'full_state']
 
         self.module         = module
 
-        self.name           = module.params['name']
+        self.name           = name or module.params['name']
         self.service_dir    = module.params['service_dir']
         self.service_src    = module.params['service_src']
         self.enabled        = None
@@ -144,7 +176,8 @@ class Svc(object):
         self.enabled = os.path.lexists(self.svc_full)
         if self.enabled:
             self.downed = os.path.lexists('%s/down' % self.svc_full)
-            self.get_status()
+            if status:
+                self.get_status()
         else:
             self.downed = os.path.lexists('%s/down' % self.src_full)
             self.state = 'stopped'
@@ -178,28 +211,32 @@ class Svc(object):
         if err is not None and err:
             self.full_state = self.state = err
         else:
-            self.full_state = out
+            self.parse_status(out)
+
+    def parse_status(self, out):
+        self.full_state = out
 
-            m = re.search('\(pid (\d+)\)', out)
-            if m:
-                self.pid = m.group(1)
+        self.pid = None
+        m = re.search('\(pid (\d+)\)', out)
+        if m:
+            self.pid = m.group(1)
 
-            m = re.search('(\d+) seconds', out)
-            if m:
-                self.duration = m.group(1)
+        m = re.search('(\d+) seconds', out)
+        if m:
+            self.duration = m.group(1)
 
-            if re.search(' up ', out):
-                self.state = 'start'
-            elif re.search(' down ', out):
-                self.state = 'stopp'
-            else:
-                self.state = 'unknown'
-                return
+        if re.search(' up ', out):
+            self.state = 'start'
+        elif re.search(' down ', out):
+            self.state = 'stopp'
+        else:
+            self.state = 'unknown'
+            return
 
-            if re.search(' want ', out):
-                self.state += 'ing'
-            else:
-                self.state += 'ed'
+        if re.search(' want ', out):
+            self.state += 'ing'
+        else:
+            self.state += 'ed'
 
     def start(self):
         return self.execute_command([self.svc_cmd, '-u', self.svc_full])
@@ -230,20 +267,180 @@ class Svc(object):
             self.module.fail_json(msg="failed to execute: %s" % str(e))
         return (rc, out, err)
 
-    def report(self):
-        self.get_status()
+    def read_supervise_status(self):
+        """
+        Returns the (pid, want, since) recorded by supervise in the binary
+        supervise/status file, pid is 0 when the service is down.
+        """
+        try:
+            f = open('%s/supervise/status' % self.svc_full, 'rb')
+            try:
+                data = f.read(18)
+            finally:
+                f.close()
+        except IOError:
+            return None
+        if len(data) < 18:
+            return None
+        since = struct.unpack('>Q', data[0:8])[0] - TAI64_EPOCH
+        pid = struct.unpack('<I', data[12:16])[0]
+        return (pid, data[17:18], since)
+
+    def report(self, refresh=True):
+        if refresh:
+            self.get_status()
         states = {}
         for k in self.report_vars:
             states[k] = self.__dict__[k]
         return states
 
+def load_statuses(module, svcs):
+    """
+    Query all the enabled services with a single svstat call, svstat prints
+    one 'dir: status' line per service directory.
+    """
+    enabled = [ svc for svc in svcs if svc.enabled ]
+    if not enabled:
+        return
+    (rc, out, err) = enabled[0].execute_command([enabled[0].svstat_cmd] + [ svc.svc_full for svc in enabled ])
+    lines = {}
+    for line in out.splitlines():
+        if ': ' in line:
+            (path, status) = line.split(': ', 1)
+            lines[path] = line
+    for svc in enabled:
+        if svc.svc_full in lines:
+            svc.parse_status(lines[svc.svc_full])
+        else:
+            svc.full_state = svc.state = err or 'unknown'
+
+def control_services(module, svcs, state):
+    """
+    Send the svc signal for state to all the services that need it with a
+    single svc call, returns the services signaled with their status before.
+    """
+    if state in ('started', 'stopped'):
+        targets = [ svc for svc in svcs if svc.state != state ]
+    else:
+        targets = list(svcs)
+    targets = [ svc for svc in targets if svc.enabled ]
+    before = []
+    for svc in targets:
+        before.append((svc, svc.read_supervise_status()))
+    if targets and not module.check_mode:
+        (rc, out, err) = targets[0].execute_command([targets[0].svc_cmd, SVC_FLAGS[state]] + [ svc.svc_full for svc in targets ])
+        if rc != 0:
+            module.fail_json(msg="svc %s failed: %s" % (SVC_FLAGS[state], err or out))
+    return before
+
+def reached(state, before, now):
+    if now is None:
+        return False
+    (pid, want, since) = now
+    if state == 'started':
+        return pid != 0
+    if state == 'stopped':
+        return pid == 0
+    # restarted or killed, a service that was up is up again with a new pid
+    if before is None or before[0] == 0:
+        return True
+    return pid != 0 and (pid != before[0] or since != before[2])
+
+def wait_for_services(module, signaled, state, timeout):
+    """
+    Poll the supervise/status files of the signaled services until they all
+    reached state or the deadline passed, returns the names still pending.
+    """
+    if state not in ('started', 'stopped', 'restarted', 'killed'):
+        return []
+    deadline = time.time() + timeout
+    pending = list(signaled)
+    while pending:
+        pending = [ (svc, before) for (svc, before) in pending if not reached(state, before, svc.read_supervise_status()) ]
+        if not pending or time.time() >= deadline:
+            break
+        time.sleep(0.1)
+    return [ svc.name for (svc, before) in pending ]
+
+def set_downed(module, svc, downed):
+    d_file = "%s/down" % svc.svc_full
+    try:
+        if downed:
+            open(d_file, "a").close()
+        else:
+            os.unlink(d_file)
+    except (OSError, IOError):
+        e = get_exception()
+        module.fail_json(msg="Could change downed file: %s " % (str(e)))
+
+def set_enabled(module, svc, enabled):
+    try:
+        if enabled:
+            svc.enable()
+        else:
+            svc.disable()
+    except (OSError, IOError):
+        e = get_exception()
+        module.fail_json(msg="Could change service link: %s" % str(e))
+
+def main_names(module):
+    state = module.params['state']
+    enabled = module.params['enabled']
+    downed = module.params['downed']
+    timeout = module.params['timeout']
+
+    svcs = [ Svc(module, name, status=False) for name in module.params['names'] ]
+    changed = []
+
+    if enabled is not None:
+        for svc in svcs:
+            if enabled != svc.enabled:
+                changed.append(svc.name)
+                if not module.check_mode:
+                    set_enabled(module, svc, enabled)
+                    svc.enabled = enabled
+
+    load_statuses(module, svcs)
+
+    pending = []
+    if state is not None:
+        signaled = control_services(module, svcs, state)
+        for (svc, before) in signaled:
+            if svc.name not in changed:
+                changed.append(svc.name)
+        if not module.check_mode and timeout > 0:
+            pending = wait_for_services(module, signaled, state, timeout)
+
+    if downed is not None:
+        for svc in svcs:
+            if downed != svc.downed:
+                if svc.name not in changed:
+                    changed.append(svc.name)
+                if not module.check_mode:
+                    set_downed(module, svc, downed)
+                    svc.downed = downed
+
+    if changed and not module.check_mode:
+        load_statuses(module, svcs)
+
+    report = {}
+    for svc in svcs:
+        report[svc.name] = svc.report(refresh=False)
+
+    if pending:
+        module.fail_json(msg="Timeout waiting for services to be %s: %s" % (state, ', '.join(pending)),
+                         changed=True, svcs=report)
+    module.exit_json(changed=bool(changed), changed_names=changed, svcs=report)
+
 # ===========================================
 # Main control flow
 
 def main():
     module = AnsibleModule(
         argument_spec = dict(
-            name = dict(required=True),
+            name = dict(required=False),
+            names = dict(required=False, type='list'),
+            timeout = dict(required=False, default=30, type='int'),
             state = dict(choices=['started', 'stopped', 'restarted', 'killed', 'reloaded', 'once']),
             enabled = dict(required=False, type='bool'),
             downed = dict(required=False, type='bool'),
@@ -251,11 +448,16 @@ def main():
             service_dir = dict(required=False, default='/service'),
             service_src = dict(required=False, default='/etc/service'),
         ),
+        mutually_exclusive=[['name', 'names']],
+        required_one_of=[['name', 'names']],
         supports_check_mode=True,
     )
 
     module.run_command_environ_update = dict(LANG='C', LC_ALL='C', LC_MESSAGES='C', LC_CTYPE='C')
 
+    if module.params['names'] is not None:
+        main_names(module)
+
     state = module.params['state']
     enabled = module.params['enabled']
     downed = module.params['downed']
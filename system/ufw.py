@@ -121,6 +121,23 @@ options:
       - Apply the rule to routed/forwarded packets.
     required: false
     choices: ['yes', 'no']
+  rules:
+    description:
+      - List of rules to converge in one task. Each item is a dict accepting the
+        rule options C(rule), C(direction), C(interface), C(log), C(from_ip), C(from_port),
+        C(to_ip), C(to_port), C(proto), C(name), C(route) and C(delete), including their aliases.
+      - The C(### tuple) lines of the user rules files are parsed once and only the rules
+        that are missing, or present but marked C(delete), are passed to ufw. Check mode
+        reports the same difference without running ufw.
+    required: false
+    version_added: "2.3"
+  purge:
+    description:
+      - With I(rules), also delete every existing user rule that is not listed.
+    required: false
+    default: 'no'
+    choices: ['yes', 'no']
+    version_added: "2.3"
 '''
 
 EXAMPLES = '''
@@ -176,10 +193,194 @@ ufw: rule=deny proto=tcp src=2001:db8::/32 port=25
 # Deny forwarded/routed traffic from subnet 1.2.3.0/24 to subnet 4.5.6.0/24.
 # Can be used to further restrict a global FORWARD policy set to allow
 ufw: rule=deny route=yes src=1.2.3.0/24 dest=4.5.6.0/24
+
+# Converge a whole ruleset, removing any user rule that is not listed
+ufw:
+  purge: yes
+  rules:
+    - { rule: allow, name: OpenSSH }
+    - { rule: allow, port: 443, proto: tcp }
+    - { rule: allow, src: 10.0.0.0/8, port: 5432, proto: tcp }
 '''
 
+import socket
 from operator import itemgetter
 
+RULES_FILES = ['/etc/ufw/user.rules', '/etc/ufw/user6.rules',
+               '/lib/ufw/user.rules', '/lib/ufw/user6.rules']
+
+RULE_KEYS = ['rule', 'direction', 'interface', 'log', 'from_ip', 'from_port',
+             'to_ip', 'to_port', 'proto', 'app', 'route', 'delete']
+
+RULE_ALIASES = {'src': 'from_ip', 'from': 'from_ip', 'dest': 'to_ip', 'to': 'to_ip',
+                'port': 'to_port', 'protocol': 'proto', 'name': 'app', 'if': 'interface'}
+
+
+def rules_files():
+    # ufw keeps the user rules in /etc/ufw, older releases in /lib/ufw
+    found = [path for path in RULES_FILES[:2] if os.path.exists(path)]
+    if not found:
+        found = [path for path in RULES_FILES[2:] if os.path.exists(path)]
+    return found
+
+
+def normalize_address(address):
+    if address in (None, 'any', '0.0.0.0/0', '::/0'):
+        return 'any'
+    for suffix in ('/32', '/128'):
+        if address.endswith(suffix):
+            return address[:-len(suffix)]
+    return address
+
+
+def normalize_port(port):
+    if port in (None, 'any'):
+        return 'any'
+    port = str(port)
+    if not port.replace(',', '').replace(':', '').isdigit():
+        try:
+            return str(socket.getservbyname(port))
+        except socket.error:
+            pass
+    return port
+
+
+def parse_tuple(line):
+    # ### tuple ### ACTION PROTO DPORT DST SPORT SRC [DAPP SAPP] DIRECTION
+    fields = line.split()[3:]
+    if len(fields) not in (7, 9):
+        return None
+    (action, proto, dport, dst, sport, src) = fields[:6]
+    direction = fields[-1]
+    dapp = sapp = '-'
+    if len(fields) == 9:
+        (dapp, sapp) = fields[6:8]
+    route = action.startswith('route:')
+    if route:
+        action = action[len('route:'):]
+    log = ''
+    if '_' in action:
+        (action, log) = action.split('_', 1)
+    interface = ''
+    if '_' in direction:
+        (direction, interface) = direction.split('_', 1)
+    dapp = dapp.replace('%20', ' ')
+    sapp = sapp.replace('%20', ' ')
+    if dapp != '-' or sapp != '-':
+        proto = dport = sport = ''
+    return (action, log, route, proto, dport, normalize_address(dst),
+            sport, normalize_address(src), direction, interface, dapp, sapp)
+
+
+def read_rules():
+    # IPv4 and IPv6 copies of the same rule map to the same key
+    rules = set()
+    for path in rules_files():
+        f = open(path)
+        try:
+            for line in f:
+                if line.startswith('### tuple ###'):
+                    key = parse_tuple(line)
+                    if key is not None:
+                        rules.add(key)
+        finally:
+            f.close()
+    return rules
+
+
+def rule_key(module, rule):
+    log = ''
+    if module.boolean(rule.get('log')):
+        log = 'log'
+    direction = rule.get('direction') or 'in'
+    direction = {'incoming': 'in', 'outgoing': 'out'}.get(direction, direction)
+    app = rule.get('app')
+    if app:
+        proto = dport = sport = ''
+        dapp = app
+    else:
+        proto = rule.get('proto') or 'any'
+        dport = normalize_port(rule.get('to_port'))
+        sport = normalize_port(rule.get('from_port'))
+        dapp = '-'
+    return (rule['rule'], log, bool(module.boolean(rule.get('route'))), proto, dport,
+            normalize_address(rule.get('to_ip')), sport, normalize_address(rule.get('from_ip')),
+            direction, rule.get('interface') or '', dapp, '-')
+
+
+def key_command(ufw_bin, key, delete=False):
+    (action, log, route, proto, dport, dst, sport, src, direction, interface, dapp, sapp) = key
+    cmd = [ufw_bin]
+    if delete:
+        cmd.append('delete')
+    if route:
+        cmd.append('route')
+    cmd.append(action)
+    if interface:
+        cmd.extend([direction, 'on', interface])
+    elif direction != 'in':
+        cmd.append(direction)
+    if log:
+        cmd.append(log)
+    cmd.extend(['from', src])
+    if sapp != '-':
+        cmd.extend(['app', sapp])
+    elif sport not in ('any', ''):
+        cmd.extend(['port', sport])
+    cmd.extend(['to', dst])
+    if dapp != '-':
+        cmd.extend(['app', dapp])
+    elif dport not in ('any', ''):
+        cmd.extend(['port', dport])
+    if proto not in ('any', ''):
+        cmd.extend(['proto', proto])
+    return cmd
+
+
+def converge_rules(module, ufw_bin, rules, purge):
+    current = read_rules()
+    wanted = set()
+    add = []
+    delete = []
+    for item in rules:
+        if not isinstance(item, dict):
+            module.fail_json(msg="Each item of rules must be a dict")
+        rule = {}
+        for (key, value) in item.items():
+            rule[RULE_ALIASES.get(key, key)] = value
+        unknown = [key for key in rule if key not in RULE_KEYS]
+        if unknown:
+            module.fail_json(msg="Unsupported rule option(s): %s" % ', '.join(unknown))
+        if rule.get('rule') not in ('allow', 'deny', 'reject', 'limit'):
+            module.fail_json(msg="Each item of rules needs a rule of allow, deny, reject or limit")
+        key = rule_key(module, rule)
+        if module.boolean(rule.get('delete')):
+            if key in current and key not in delete:
+                delete.append(key)
+        else:
+            wanted.add(key)
+            if key not in current and key not in add:
+                add.append(key)
+    if purge:
+        for key in sorted(current - wanted):
+            if key not in delete:
+                delete.append(key)
+
+    cmds = []
+    for key in delete:
+        cmds.append(key_command(ufw_bin, key, delete=True))
+    for key in add:
+        cmds.append(key_command(ufw_bin, key))
+    commands = [' '.join(cmd) for cmd in cmds]
+
+    if not module.check_mode:
+        for cmd in cmds:
+            (rc, out, err) = module.run_command(cmd)
+            if rc != 0:
+                module.fail_json(msg=err or out, commands=commands)
+
+    module.exit_json(changed=bool(cmds), commands=commands, added=len(add), deleted=len(delete))
+
 
 def main():
     module = AnsibleModule(
@@ -199,10 +400,12 @@ def main():
             to_ip     = dict(default='any', aliases=['dest', 'to']),
             to_port   = dict(default=None,  aliases=['port']),
             proto     = dict(default=None,  aliases=['protocol'], choices=['any', 'tcp', 'udp', 'ipv6', 'esp', 'ah']),
-            app       = dict(default=None,  aliases=['name'])
+            app       = dict(default=None,  aliases=['name']),
+            rules     = dict(default=None,  type='list'),
+            purge     = dict(default=False, type='bool')
         ),
         supports_check_mode = True,
-        mutually_exclusive = [['app', 'proto', 'logging']]
+        mutually_exclusive = [['app', 'proto', 'logging'], ['rules', 'rule']]
     )
 
     cmds = []
@@ -218,6 +421,9 @@ def main():
 
     params = module.params
 
+    if params['rules'] is not None:
+        converge_rules(module, module.get_bin_path('ufw', True), params['rules'], params['purge'])
+
     # Ensure at least one of the command arguments are given
     command_keys = ['state', 'default', 'rule', 'logging']
     commands = dict((key, params[key]) for key in command_keys if params[key])
@@ -29,8 +29,8 @@ description:
 options:
     username:
         description:
-            - the name of the user to manage
-        required: true
+            - the name of the user to manage. Required unless I(users) is given.
+        required: false
     host:
         description:
             - the ejabberd host associated with this username
@@ -51,6 +51,58 @@ options:
         required: false
         default: 'present'
         choices: [ 'present', 'absent' ]
+    users:
+        description:
+            - list of users to reconcile on I(host) in a single task. Each item is a
+              dict with a C(username) and optionally C(password) and C(state).
+              The registered accounts are fetched once and only the differences are
+              applied. Mutually exclusive with I(username).
+        required: false
+        default: null
+        version_added: "2.3"
+    purge:
+        description:
+            - with I(users), unregister accounts of I(host) that are not listed
+        required: false
+        default: false
+        choices: [ 'true', 'false', 'yes', 'no' ]
+        version_added: "2.3"
+    update_password:
+        description:
+            - with I(users), C(always) checks and updates the password of existing
+              accounts, C(on_create) only sets it when the account is created and
+              skips the per-account password check
+        required: false
+        default: 'always'
+        choices: [ 'always', 'on_create' ]
+        version_added: "2.3"
+    api_url:
+        description:
+            - base URL of the ejabberd mod_http_api endpoint, for example
+              C(http://localhost:5280/api). When set, I(users) mode talks to the API
+              instead of starting an C(ejabberdctl) node per command.
+        required: false
+        default: null
+        version_added: "2.3"
+    api_user:
+        description:
+            - user to authenticate against I(api_url) with, as a JID
+        required: false
+        default: null
+        version_added: "2.3"
+    api_password:
+        description:
+            - password to authenticate against I(api_url) with
+        required: false
+        default: null
+        version_added: "2.3"
+    concurrency:
+        description:
+            - with I(users) and I(api_url), the number of API calls made at the
+              same time. C(ejabberdctl) commands always run one at a time.
+        required: false
+        default: 4
+        version_added: "2.3"
 notes:
     - Password parameter is required for state == present only
     - Passwords must be stored in clear text for this release
@@ -66,10 +118,49 @@ Example playbook entries using the ejabberd_user module to manage users state.
 
     - name: delete a user if it exists
       action: ejabberd_user username=test host=server state=absent
+
+    - name: reconcile many users through the HTTP API
+      ejabberd_user:
+        host: server
+        api_url: http://localhost:5280/api
+        concurrency: 16
+        update_password: on_create
+        users:
+          - username: alice
+            password: secret
+          - username: bob
+            state: absent
 '''
+
+RETURN = '''
+created:
+    description: users registered by the task in I(users) mode
+    returned: when users is given
+    type: list
+    sample: ["alice"]
+updated:
+    description: users whose password was changed in I(users) mode
+    returned: when users is given
+    type: list
+    sample: []
+deleted:
+    description: users unregistered by the task in I(users) mode
+    returned: when users is given
+    type: list
+    sample: ["bob"]
+'''
+import base64
 import syslog
+import threading
+
+try:
+    import json
+except ImportError:
+    import simplejson as json
+
 from ansible.module_utils.pycompat24 import get_exception
 from ansible.module_utils.basic import *
+from ansible.module_utils.urls import fetch_url
 
 class EjabberdUserException(Exception):
     """ Base exeption for EjabberdUser class object """
@@ -171,18 +262,200 @@ class EjabberdUser(object):
             (rc, out, err) = (1, None, "required attribute(s) missing")
         return (rc, out, err)
 
+def run_concurrently(func, items, limit):
+    """ Call func for every item with at most limit calls in flight and
+    return the results in the order of items.   With a limit of 1 the calls
+    are made in turn from the calling thread
+    """
+    results = [None] * len(items)
+    pending = list(enumerate(items))
+    lock = threading.Lock()
+
+    def worker():
+        while True:
+            lock.acquire()
+            try:
+                if not pending:
+                    return
+                (index, item) = pending.pop(0)
+            finally:
+                lock.release()
+            try:
+                results[index] = func(item)
+            except Exception:
+                e = get_exception()
+                results[index] = (1, None, str(e))
+
+    if limit <= 1:
+        worker()
+        return results
+
+    threads = []
+    for i in range(max(1, min(limit, len(items)))):
+        thread = threading.Thread(target=worker)
+        thread.start()
+        threads.append(thread)
+    for thread in threads:
+        thread.join()
+    return results
+
+
+class EjabberdUsers(object):
+    """ This object reconciles a list of users for one ejabberd host.   The
+    registered accounts are read once with registered_users and only the
+    missing, changed or unwanted accounts are acted on.  Commands go through
+    ejabberdctl or, when api_url is set, through mod_http_api which avoids
+    starting an Erlang node per command.
+    """
+
+    def __init__(self, module):
+        self.module = module
+        self.logging = module.params.get('logging')
+        self.host = module.params.get('host')
+        self.users = module.params.get('users')
+        self.purge = module.params.get('purge')
+        self.update_password = module.params.get('update_password')
+        self.api_url = module.params.get('api_url')
+        # module.run_command is not safe to call from several threads, so
+        # only the API calls run concurrently
+        if self.api_url:
+            self.concurrency = module.params.get('concurrency')
+        else:
+            self.concurrency = 1
+        self.headers = {'Content-Type': 'application/json'}
+        if module.params.get('api_user'):
+            credentials = '%s:%s' % (module.params['api_user'], module.params['api_password'])
+            auth = base64.b64encode(credentials.encode('utf-8')).decode('ascii')
+            self.headers['Authorization'] = 'Basic %s' % auth
+
+    def log(self, entry):
+        """ This method will log information to the local syslog facility """
+        if self.logging:
+            syslog.openlog('ansible-%s' % self.module._name)
+            syslog.syslog(syslog.LOG_NOTICE, entry)
+
+    def call(self, cmd, args):
+        """ Run an ejabberd command with named arguments and return
+        (rc, result, err).   The result is the decoded API response or the
+        ejabberdctl output
+        """
+        self.log('command: %s %s' % (cmd, args.get('user', '')))
+        if self.api_url:
+            url = '%s/%s' % (self.api_url.rstrip('/'), cmd)
+            (response, info) = fetch_url(self.module, url, data=json.dumps(args),
+                                         headers=self.headers, method='POST')
+            if info['status'] != 200:
+                return (1, None, info.get('body') or info['msg'])
+            result = json.loads(response.read().decode('utf-8'))
+            if cmd == 'check_password':
+                return (int(result), result, '')
+            return (0, result, '')
+        options = [cmd, args['user'], args['host']]
+        if 'password' in args:
+            options.append(args['password'])
+        elif 'newpass' in args:
+            options.append(args['newpass'])
+        (rc, out, err) = self.module.run_command(['ejabberdctl'] + options)
+        return (rc, out, err)
+
+    def registered(self):
+        """ Return the set of usernames registered on the host """
+        if self.api_url:
+            (rc, result, err) = self.call('registered_users', dict(host=self.host))
+            if rc != 0:
+                self.module.fail_json(msg=err, rc=rc)
+            return set(result)
+        (rc, out, err) = self.module.run_command(['ejabberdctl', 'registered_users', self.host])
+        if rc != 0:
+            self.module.fail_json(msg=err, rc=rc)
+        return set([line.strip() for line in out.splitlines() if line.strip()])
+
+    def plan(self):
+        """ Compare the requested users with the registered accounts and
+        return the (create, update, delete) lists of commands to run
+        """
+        registered = self.registered()
+        wanted = set()
+        create = []
+        check = []
+        delete = []
+        for user in self.users:
+            name = user['username']
+            if user.get('state', 'present') == 'absent':
+                if name in registered:
+                    delete.append(dict(user=name, host=self.host))
+                continue
+            wanted.add(name)
+            if name not in registered:
+                if not user.get('password'):
+                    self.module.fail_json(msg="password is required to create user %s" % name)
+                create.append(dict(user=name, host=self.host, password=user['password']))
+            elif self.update_password == 'always' and user.get('password'):
+                check.append(dict(user=name, host=self.host, password=user['password']))
+        if self.purge:
+            absent = set([d['user'] for d in delete])
+            for name in sorted(registered - wanted - absent):
+                delete.append(dict(user=name, host=self.host))
+
+        update = []
+        results = run_concurrently(lambda args: self.call('check_password', args), check, self.concurrency)
+        for (args, (rc, out, err)) in zip(check, results):
+            if rc != 0:
+                update.append(dict(user=args['user'], host=args['host'], newpass=args['password']))
+        return (create, update, delete)
+
+    def apply(self, commands):
+        """ Run (cmd, args) pairs and fail on the first error """
+        results = run_concurrently(lambda command: self.call(*command), commands, self.concurrency)
+        for ((cmd, args), (rc, out, err)) in zip(commands, results):
+            if rc != 0:
+                self.module.fail_json(msg="%s %s failed: %s" % (cmd, args['user'], err), rc=rc)
+
+
+def reconcile_users(module):
+    obj = EjabberdUsers(module)
+    (create, update, delete) = obj.plan()
+    result = dict(changed=bool(create or update or delete),
+                  created=[args['user'] for args in create],
+                  updated=[args['user'] for args in update],
+                  deleted=[args['user'] for args in delete])
+    if module.check_mode or not result['changed']:
+        module.exit_json(**result)
+
+    commands = [('register', args) for args in create]
+    commands.extend([('change_password', args) for args in update])
+    commands.extend([('unregister', args) for args in delete])
+    obj.apply(commands)
+    module.exit_json(**result)
+
+
 def main():
     module = AnsibleModule(
         argument_spec = dict(
             host=dict(default=None, type='str'),
             username=dict(default=None, type='str'),
-            password=dict(default=None, type='str'),
+            password=dict(default=None, type='str', no_log=True),
             state=dict(default='present', choices=['present', 'absent']),
-            logging=dict(default=False, type='bool')
+            logging=dict(default=False, type='bool'),
+            users=dict(default=None, type='list', no_log=True),
+            purge=dict(default=False, type='bool'),
+            update_password=dict(default='always', choices=['always', 'on_create']),
+            api_url=dict(default=None, type='str'),
+            api_user=dict(default=None, type='str'),
+            api_password=dict(default=None, type='str', no_log=True),
+            concurrency=dict(default=4, type='int'),
         ),
+        mutually_exclusive = [['username', 'users']],
+        required_one_of = [['username', 'users']],
         supports_check_mode = True
     )
 
+    if module.params['users'] is not None:
+        for user in module.params['users']:
+            if not isinstance(user, dict) or not user.get('username'):
+                module.fail_json(msg="each item of users must be a dict with a username")
+        reconcile_users(module)
+
     obj = EjabberdUser(module)
 
     rc = None
@@ -26,9 +26,9 @@ description:
   - Deploy applications to JBoss standalone using the filesystem
 options:
   deployment:
-    required: true
+    required: false
     description:
-      - The name of the deployment
+      - The name of the deployment. Required unless I(deployments) is given.
   src:
     required: false
     description:
@@ -44,9 +44,34 @@ options:
     default: "present"
     description:
       - Whether the application should be deployed or undeployed
+  deployments:
+    required: false
+    default: null
+    version_added: "2.3"
+    description:
+      - List of deployments handled in one task. Each item is a dict with
+        C(deployment) and optionally C(src) and C(state), which default to the
+        module arguments. Artifacts are copied concurrently and all marker files
+        are waited on together.
+  digest_index:
+    required: false
+    default: "<deploy_path>/.ansible_jboss_digests"
+    version_added: "2.3"
+    description:
+      - File in which the SHA1 of source and deployed artifacts is recorded
+        together with their size and modification time, so unchanged artifacts
+        are not hashed again on the next run.
+  timeout:
+    required: false
+    default: 0
+    version_added: "2.3"
+    description:
+      - Number of seconds to wait for the deployment scanner to deploy or
+        undeploy the artifacts. C(0) waits without a limit.
 notes:
   - "The JBoss standalone deployment-scanner has to be enabled in standalone.xml"
   - "Ensure no identically named application is deployed through the JBoss CLI"
+  - "On Linux, marker files are waited on with inotify; elsewhere they are polled."
 author: "Jeroen Hoekx (@jhoekx)"
 """
 
@@ -57,12 +82,41 @@ EXAMPLES = """
 - jboss: src=/tmp/hello-1.1-SNAPSHOT.war deployment=hello.war state=present
 # Undeploy the hello world application
 - jboss: deployment=hello.war state=absent
+# Deploy several applications at once
+- jboss:
+    timeout: 600
+    deployments:
+      - { deployment: shop.ear, src: /tmp/shop-2.0.ear }
+      - { deployment: admin.war, src: /tmp/admin-2.0.war }
+      - { deployment: legacy.war, state: absent }
 """
 
 import os
+import select
 import shutil
+import tempfile
+import threading
 import time
 
+try:
+    import json
+except ImportError:
+    import simplejson as json
+
+try:
+    import ctypes
+    import ctypes.util
+    libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6')
+    HAS_INOTIFY = hasattr(libc, 'inotify_init')
+except Exception:
+    HAS_INOTIFY = False
+
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+
 def is_deployed(deploy_path, deployment):
     return os.path.exists(os.path.join(deploy_path, "%s.deployed"%(deployment)))
 
@@ -72,69 +126,257 @@ def is_undeployed(deploy_path, deployment):
 def is_failed(deploy_path, deployment):
     return os.path.exists(os.path.join(deploy_path, "%s.failed"%(deployment)))
 
+
+class DigestIndex(object):
+    """ SHA1 digests of files keyed by path, reused while size and mtime
+    of the file are unchanged """
+
+    def __init__(self, module, path):
+        self.module = module
+        self.path = path
+        self.entries = {}
+        self.dirty = False
+        self.lock = threading.Lock()
+        if os.path.exists(path):
+            try:
+                f = open(path)
+                try:
+                    self.entries = json.load(f)
+                finally:
+                    f.close()
+            except ValueError:
+                self.entries = {}
+
+    def digest(self, path):
+        path = os.path.abspath(path)
+        st = os.stat(path)
+        self.lock.acquire()
+        try:
+            entry = self.entries.get(path)
+        finally:
+            self.lock.release()
+        if entry and entry['size'] == st.st_size and entry['mtime'] == st.st_mtime:
+            return entry['sha1']
+        sha1 = self.module.sha1(path)
+        self.record(path, sha1, st)
+        return sha1
+
+    def record(self, path, sha1, st=None):
+        path = os.path.abspath(path)
+        if st is None:
+            st = os.stat(path)
+        self.lock.acquire()
+        try:
+            self.entries[path] = dict(size=st.st_size, mtime=st.st_mtime, sha1=sha1)
+            self.dirty = True
+        finally:
+            self.lock.release()
+
+    def save(self):
+        if not self.dirty:
+            return
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(self.path), prefix='.ansible_tmp')
+        f = os.fdopen(fd, 'w')
+        try:
+            json.dump(self.entries, f)
+        finally:
+            f.close()
+        os.rename(tmp, self.path)
+
+
+class MarkerWatcher(object):
+    """ Wait for changes in the deployment directory with inotify, falling
+    back to short sleeps where it is not available """
+
+    def __init__(self, deploy_path):
+        self.fd = -1
+        if HAS_INOTIFY:
+            fd = libc.inotify_init()
+            if fd >= 0:
+                mask = IN_CREATE | IN_MOVED_TO | IN_DELETE | IN_MODIFY | IN_ATTRIB
+                if libc.inotify_add_watch(fd, deploy_path.encode('utf-8'), mask) >= 0:
+                    self.fd = fd
+                else:
+                    os.close(fd)
+
+    def wait(self, timeout):
+        if self.fd < 0:
+            time.sleep(min(timeout, 0.5))
+            return
+        readable = select.select([self.fd], [], [], timeout)[0]
+        if readable:
+            os.read(self.fd, 65536)
+
+    def close(self):
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+def copy_atomic(src, deploy_path, deployment):
+    """ Copy src next to the deployment and rename it into place so the
+    scanner never sees a partially written artifact """
+    fd, tmp = tempfile.mkstemp(dir=deploy_path, prefix='.%s.' % deployment, suffix='.tmp')
+    os.close(fd)
+    try:
+        shutil.copyfile(src, tmp)
+        shutil.copystat(src, tmp)
+        os.rename(tmp, os.path.join(deploy_path, deployment))
+    except:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+def check_deployment(module, item):
+    """ Fail on a deployment that cannot be applied, before any marker of
+    the other deployments is touched """
+    if item['state'] == 'present':
+        if not item.get('src'):
+            module.fail_json(msg="Argument 'src' required for %s." % item['deployment'])
+        if not os.path.exists(item['src']):
+            module.fail_json(msg='Source file %s does not exist.'%(item['src']))
+
+
+def plan_deployment(module, index, deploy_path, item):
+    """ Start the change needed for one deployment and return the marker
+    state to wait for: 'deployed', 'undeployed' or None when unchanged """
+    deployment = item['deployment']
+    src = item.get('src')
+    state = item.get('state', 'present')
+    deployed = is_deployed(deploy_path, deployment)
+    dest = os.path.join(deploy_path, deployment)
+
+    if state == 'present':
+        if not deployed:
+            if is_failed(deploy_path, deployment):
+                ### Clean up old failed deployment
+                os.remove(os.path.join(deploy_path, "%s.failed"%(deployment)))
+            return 'deployed'
+        if index.digest(src) != index.digest(dest):
+            os.remove(os.path.join(deploy_path, "%s.deployed"%(deployment)))
+            return 'deployed'
+    elif deployed:
+        os.remove(os.path.join(deploy_path, "%s.deployed"%(deployment)))
+        return 'undeployed'
+    return None
+
+
+def copy_deployments(module, index, deploy_path, items):
+    """ Copy the artifacts of several deployments concurrently """
+    errors = []
+    threads = []
+
+    def copy(item):
+        try:
+            copy_atomic(item['src'], deploy_path, item['deployment'])
+            index.record(os.path.join(deploy_path, item['deployment']), index.digest(item['src']))
+        except Exception:
+            e = get_exception()
+            errors.append('Copying %s failed: %s' % (item['src'], e))
+
+    for item in items:
+        thread = threading.Thread(target=copy, args=(item,))
+        thread.start()
+        threads.append(thread)
+    for thread in threads:
+        thread.join()
+    if errors:
+        module.fail_json(msg=' '.join(errors))
+
+
+def wait_for_markers(module, watcher, deploy_path, pending, timeout):
+    """ Wait until every pending deployment reached its marker state """
+    deadline = None
+    if timeout:
+        deadline = time.time() + timeout
+    pending = dict(pending)
+    while pending:
+        for deployment, target in list(pending.items()):
+            if is_failed(deploy_path, deployment):
+                if target == 'deployed':
+                    module.fail_json(msg='Deploying %s failed.'%(deployment))
+                module.fail_json(msg='Undeploying %s failed.'%(deployment))
+            if target == 'deployed' and is_deployed(deploy_path, deployment):
+                del pending[deployment]
+            elif target == 'undeployed' and is_undeployed(deploy_path, deployment):
+                del pending[deployment]
+        if not pending:
+            break
+        if deadline is not None and time.time() > deadline:
+            module.fail_json(msg='Timeout waiting for %s.' % ', '.join(sorted(pending.keys())))
+        watcher.wait(1)
+
+
 def main():
     module = AnsibleModule(
         argument_spec = dict(
             src=dict(),
-            deployment=dict(required=True),
+            deployment=dict(),
             deploy_path=dict(default='/var/lib/jbossas/standalone/deployments'),
             state=dict(choices=['absent', 'present'], default='present'),
+            deployments=dict(type='list'),
+            digest_index=dict(type='path'),
+            timeout=dict(type='int', default=0),
         ),
+        required_one_of = [['deployment', 'deployments']],
+        mutually_exclusive = [['deployment', 'deployments']],
     )
 
-    changed = False
-
-    src = module.params['src']
-    deployment = module.params['deployment']
     deploy_path = module.params['deploy_path']
-    state = module.params['state']
+    digest_index = module.params['digest_index']
+    timeout = module.params['timeout']
 
-    if state == 'present' and not src:
-        module.fail_json(msg="Argument 'src' required.")
+    if module.params['deployments'] is not None:
+        items = []
+        for entry in module.params['deployments']:
+            if not isinstance(entry, dict) or not entry.get('deployment'):
+                module.fail_json(msg="Each item of deployments must be a dict with a deployment")
+            item = dict(src=module.params['src'], state=module.params['state'])
+            item.update(entry)
+            if item['state'] not in ('present', 'absent'):
+                module.fail_json(msg="state of %s must be present or absent" % item['deployment'])
+            items.append(item)
+    else:
+        items = [dict(deployment=module.params['deployment'], src=module.params['src'],
+                      state=module.params['state'])]
 
     if not os.path.exists(deploy_path):
         module.fail_json(msg="deploy_path does not exist.")
 
-    deployed = is_deployed(deploy_path, deployment)
-
-    if state == 'present' and not deployed:
-        if not os.path.exists(src):
-            module.fail_json(msg='Source file %s does not exist.'%(src))
-        if is_failed(deploy_path, deployment):
-            ### Clean up old failed deployment
-            os.remove(os.path.join(deploy_path, "%s.failed"%(deployment)))
+    if digest_index is None:
+        digest_index = os.path.join(deploy_path, '.ansible_jboss_digests')
+    index = DigestIndex(module, digest_index)
 
-        shutil.copyfile(src, os.path.join(deploy_path, deployment))
-        while not deployed:
-            deployed = is_deployed(deploy_path, deployment)
-            if is_failed(deploy_path, deployment):
-                module.fail_json(msg='Deploying %s failed.'%(deployment))
-            time.sleep(1)
-        changed = True
+    for item in items:
+        check_deployment(module, item)
 
-    if state == 'present' and deployed:
-        if module.sha1(src) != module.sha1(os.path.join(deploy_path, deployment)):
-            os.remove(os.path.join(deploy_path, "%s.deployed"%(deployment)))
-            shutil.copyfile(src, os.path.join(deploy_path, deployment))
-            deployed = False
-            while not deployed:
-                deployed = is_deployed(deploy_path, deployment)
-                if is_failed(deploy_path, deployment):
-                    module.fail_json(msg='Deploying %s failed.'%(deployment))
-                time.sleep(1)
-            changed = True
-
-    if state == 'absent' and deployed:
-        os.remove(os.path.join(deploy_path, "%s.deployed"%(deployment)))
-        while deployed:
-            deployed = not is_undeployed(deploy_path, deployment)
-            if is_failed(deploy_path, deployment):
-                module.fail_json(msg='Undeploying %s failed.'%(deployment))
-            time.sleep(1)
-        changed = True
+    # The watch is set up before anything changes so no marker is missed
+    watcher = MarkerWatcher(deploy_path)
+    try:
+        pending = {}
+        copies = []
+        for item in items:
+            target = plan_deployment(module, index, deploy_path, item)
+            if target is not None:
+                pending[item['deployment']] = target
+            if target == 'deployed':
+                copies.append(item)
+        copy_deployments(module, index, deploy_path, copies)
+        index.save()
+        wait_for_markers(module, watcher, deploy_path, pending, timeout)
+    finally:
+        watcher.close()
 
-    module.exit_json(changed=changed)
+    if module.params['deployments'] is not None:
+        results = []
+        for item in items:
+            results.append(dict(deployment=item['deployment'], state=item['state'],
+                                changed=item['deployment'] in pending))
+        module.exit_json(changed=bool(pending), deployments=results)
+    module.exit_json(changed=bool(pending))
 
 # import module snippets
 from ansible.module_utils.basic import *
+from ansible.module_utils.pycompat24 import get_exception
 main()
@@ -96,6 +96,44 @@ options:
     description:
      - This is a free-form data structure that can contain arbitrary data. This is passed directly to the JIRA REST API (possibly after merging with other required data, as when passed to create). See examples for more information, and the JIRA REST API for the structure required for various fields.
 
+  issues:
+    required: false
+    version_added: "2.3"
+    description:
+     - A list of operations performed in one task over a single keep-alive
+       connection per worker. Each item is a dict accepting the same keys as the
+       module (operation, project, summary, description, issuetype, issue,
+       comment, status, assignee, fields); missing keys are taken from the module
+       arguments. Create operations are sent through the bulk create endpoint.
+       The operations on different issues run concurrently, those on the same
+       issue run in the order given. Transition ids are looked up once per
+       project, issue type and current status.
+     - The connections go through the proxy set in the C(https_proxy) or
+       C(http_proxy) environment variable, unless C(no_proxy) excludes the host.
+
+  timeout:
+    required: false
+    version_added: "2.3"
+    default: 10
+    description:
+     - Timeout in seconds of each request to JIRA.
+
+  validate_certs:
+    required: false
+    version_added: "2.3"
+    default: "yes"
+    choices: [ "yes", "no" ]
+    description:
+     - If C(no), SSL certificates of the JIRA server will not be validated.
+       This should only be used on personally controlled sites using self-signed certificates.
+
+  concurrency:
+    required: false
+    default: 4
+    version_added: "2.3"
+    description:
+     - The number of operations of I(issues) performed at the same time.
+
 notes:
   - "Currently this only works with basic-auth."
 
@@ -158,6 +196,20 @@ EXAMPLES = """
 - name: Close the issue
   jira: uri={{server}} username={{user}} password={{pass}}
         issue={{issue.meta.key}} operation=transition status="Done"
+
+# Close and comment on all issues of a release in one task
+- name: Close the release issues
+  jira:
+    uri: "{{server}}"
+    username: "{{user}}"
+    password: "{{pass}}"
+    operation: transition
+    status: Done
+    concurrency: 8
+    issues:
+      - { issue: ANS-63 }
+      - { issue: ANS-64 }
+      - { issue: ANS-64, operation: comment, comment: "Released in 2.3" }
 """
 
 try:
@@ -170,11 +222,40 @@ except ImportError:
         pass
 
 import base64
+import socket
+import threading
+
+try:
+    import httplib
+except ImportError:
+    import http.client as httplib
+
+try:
+    from urlparse import urlparse
+    from urllib import getproxies, proxy_bypass
+except ImportError:
+    from urllib.parse import urlparse
+    from urllib.request import getproxies, proxy_bypass
+
+try:
+    import ssl
+    HAS_SSL_CONTEXT = hasattr(ssl, 'create_default_context')
+except ImportError:
+    HAS_SSL_CONTEXT = False
 
 from ansible.module_utils.basic import *
 from ansible.module_utils.urls import *
 from ansible.module_utils.pycompat24 import get_exception
 
+AUTH_HEADERS = {}
+
+def auth_header(user, passwd):
+    # Built once per user instead of for every request
+    if user not in AUTH_HEADERS:
+        auth = base64.b64encode(('%s:%s' % (user, passwd)).encode('utf-8')).decode('ascii')
+        AUTH_HEADERS[user] = "Basic %s" % auth
+    return AUTH_HEADERS[user]
+
 def request(url, user, passwd, data=None, method=None):
     if data:
         data = json.dumps(data)
@@ -186,10 +267,10 @@ def request(url, user, passwd, data=None, method=None):
     # resulting in unexpected results. To work around this we manually
     # inject the basic-auth header up-front to ensure that JIRA treats
     # the requests as authorized for this user.
-    auth = base64.encodestring('%s:%s' % (user, passwd)).replace('\n', '')
-    response, info = fetch_url(module, url, data=data, method=method, 
+    response, info = fetch_url(module, url, data=data, method=method,
                                headers={'Content-Type':'application/json',
-                                        'Authorization':"Basic %s" % auth})
+                                        'Authorization':auth_header(user, passwd)},
+                               timeout=module.params['timeout'])
 
     if info['status'] not in (200, 201, 204):
         module.fail_json(msg=info['msg'])
@@ -211,18 +292,150 @@ def get(url, user, passwd):
     return request(url, user, passwd)
 
 
-def create(restbase, user, passwd, params):
-    createfields = {
-        'project': { 'key': params['project'] },
-        'summary': params['summary'],
-        'description': params['description'],
-        'issuetype': { 'name': params['issuetype'] }}
+class JiraSession(object):
+    """Keep-alive connections to JIRA, one per worker thread, for the
+    issues list mode. Requests raise instead of failing the module so they
+    can be made from worker threads. Like fetch_url, connections honour
+    validate_certs, timeout and the proxy environment variables. Transition
+    ids are cached per project, issue type and status so each combination
+    is looked up only once."""
+
+    def __init__(self, module, restbase, user, passwd):
+        parsed = urlparse(restbase)
+        self.https = parsed.scheme == 'https'
+        self.netloc = parsed.netloc
+        self.path = parsed.path.rstrip('/')
+        self.timeout = module.params['timeout']
+        self.headers = {'Content-Type': 'application/json',
+                        'Accept': 'application/json',
+                        'Authorization': auth_header(user, passwd)}
+
+        self.context = None
+        if self.https:
+            if HAS_SSL_CONTEXT:
+                if module.params['validate_certs']:
+                    self.context = ssl.create_default_context()
+                else:
+                    self.context = ssl._create_unverified_context()
+            elif module.params['validate_certs']:
+                module.fail_json(msg="SSL certificates cannot be validated by this python version. "
+                                     "Use validate_certs=no to connect without validating them.")
+
+        self.proxy = None
+        self.proxy_headers = {}
+        proxy = getproxies().get(parsed.scheme)
+        if proxy and not proxy_bypass(parsed.hostname):
+            self.proxy = urlparse(proxy)
+            if self.proxy.username:
+                credentials = '%s:%s' % (self.proxy.username, self.proxy.password or '')
+                auth = base64.b64encode(credentials.encode('utf-8')).decode('ascii')
+                self.proxy_headers['Proxy-Authorization'] = 'Basic %s' % auth
+
+        self.local = threading.local()
+        self.lock = threading.Lock()
+        self.transitions = {}
+        self.status = {}
+
+    def connection(self, reconnect=False):
+        conn = getattr(self.local, 'conn', None)
+        if conn is not None and reconnect:
+            conn.close()
+            conn = None
+        if conn is None:
+            netloc = self.netloc
+            if self.proxy is not None:
+                netloc = self.proxy.netloc.split('@')[-1]
+            if not self.https:
+                conn = httplib.HTTPConnection(netloc, timeout=self.timeout)
+            elif self.context is not None:
+                conn = httplib.HTTPSConnection(netloc, timeout=self.timeout, context=self.context)
+            else:
+                conn = httplib.HTTPSConnection(netloc, timeout=self.timeout)
+            if self.https and self.proxy is not None:
+                # CONNECT through the proxy, TLS and the certificate check are end to end
+                conn.set_tunnel(self.netloc, headers=self.proxy_headers)
+            self.local.conn = conn
+        return conn
+
+    def request(self, path, data=None, method='GET'):
+        body = None
+        if data is not None:
+            body = json.dumps(data)
+        target = self.path + path
+        headers = self.headers
+        if self.proxy is not None and not self.https:
+            # a plain HTTP proxy is sent the absolute URL
+            target = 'http://%s%s' % (self.netloc, target)
+            headers = dict(self.headers)
+            headers.update(self.proxy_headers)
+        for attempt in (1, 2):
+            # the server may have closed an idle keep-alive connection,
+            # so a failed request is retried once on a new one
+            conn = self.connection(reconnect=attempt > 1)
+            try:
+                conn.request(method, target, body, headers)
+                response = conn.getresponse()
+                content = response.read()
+                break
+            except (httplib.HTTPException, socket.error):
+                if attempt > 1:
+                    raise
+        if response.status not in (200, 201, 204):
+            raise Exception("%s %s returned %s: %s" % (method, path, response.status, content))
+        if content:
+            return json.loads(content.decode('utf-8'))
+        return {}
 
-    # Merge in any additional or overridden fields
-    if params['fields']:
-        createfields.update(params['fields'])
+    def close(self):
+        conn = getattr(self.local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self.local.conn = None
+
+    def prefetch_status(self, issues, chunk=100):
+        """Look up project, issue type and status of many issues with one
+        search request per chunk"""
+        issues = list(set(issues))
+        for start in range(0, len(issues), chunk):
+            keys = issues[start:start + chunk]
+            data = {'jql': 'key in (%s)' % ','.join(keys),
+                    'fields': ['status', 'issuetype', 'project'],
+                    'maxResults': chunk}
+            ret = self.request('/search', data, 'POST')
+            for meta in ret['issues']:
+                self.status[meta['key']] = self.status_key(meta)
+
+    def status_key(self, meta):
+        fields = meta['fields']
+        return (fields['project']['key'], fields['issuetype']['name'], fields['status']['name'])
+
+    def transition_id(self, issue, target):
+        # the prefetched status only holds until the first transition of the issue
+        key = self.status.pop(issue, None)
+        if key is None:
+            key = self.status_key(self.request('/issue/%s?fields=status,issuetype,project' % issue))
+        self.lock.acquire()
+        try:
+            ids = self.transitions.get(key)
+        finally:
+            self.lock.release()
+        if ids is None:
+            tmeta = self.request('/issue/%s/transitions' % issue)
+            ids = {}
+            for t in tmeta['transitions']:
+                ids[t['name']] = t['id']
+            self.lock.acquire()
+            try:
+                self.transitions[key] = ids
+            finally:
+                self.lock.release()
+        if target not in ids:
+            raise ValueError("Failed find valid transition for '%s'" % target)
+        return ids[target]
 
-    data = {'fields': createfields}
+
+def create(restbase, user, passwd, params):
+    data = {'fields': create_fields(params)}
 
     url = restbase + '/issue/'
 
@@ -286,6 +499,134 @@ def transition(restbase, user, passwd, params):
     return ret
 
 
+def create_fields(params):
+    createfields = {
+        'project': { 'key': params['project'] },
+        'summary': params['summary'],
+        'description': params['description'],
+        'issuetype': { 'name': params['issuetype'] }}
+
+    # Merge in any additional or overridden fields
+    if params['fields']:
+        createfields.update(params['fields'])
+    return createfields
+
+
+def session_operation(session, params):
+    op = params['operation']
+    issue = params['issue']
+    if op == 'comment':
+        return session.request('/issue/%s/comment' % issue, {'body': params['comment']}, 'POST')
+    if op == 'edit':
+        return session.request('/issue/%s' % issue, {'fields': params['fields']}, 'PUT')
+    if op == 'fetch':
+        return session.request('/issue/%s' % issue)
+    tid = session.transition_id(issue, params['status'])
+    data = { 'transition': { "id" : tid },
+             'fields': params['fields']}
+    return session.request('/issue/%s/transitions' % issue, data, 'POST')
+
+
+def bulk_create(session, items, chunk=50):
+    results = []
+    for start in range(0, len(items), chunk):
+        updates = []
+        for params in items[start:start + chunk]:
+            updates.append({'fields': create_fields(params)})
+        ret = session.request('/issue/bulk', {'issueUpdates': updates}, 'POST')
+        if ret.get('errors'):
+            raise Exception("Bulk create failed: %s" % ret['errors'])
+        results.extend(ret['issues'])
+    return results
+
+
+def run_concurrently(session, items, concurrency):
+    """Run the operations with at most concurrency requests in flight. The
+    operations on one issue run in order on a single worker, and stop at the
+    first that fails since the next ones may depend on it."""
+    results = [None] * len(items)
+    errors = []
+    groups = []
+    by_issue = {}
+    for index, params in enumerate(items):
+        if params['issue'] not in by_issue:
+            by_issue[params['issue']] = []
+            groups.append(by_issue[params['issue']])
+        by_issue[params['issue']].append((index, params))
+    pending = list(groups)
+    lock = threading.Lock()
+
+    def worker():
+        try:
+            while True:
+                lock.acquire()
+                try:
+                    if not pending:
+                        return
+                    group = pending.pop(0)
+                finally:
+                    lock.release()
+                for index, params in group:
+                    try:
+                        results[index] = session_operation(session, params)
+                    except Exception:
+                        e = get_exception()
+                        errors.append("%s %s: %s" % (params['operation'], params['issue'], e))
+                        break
+        finally:
+            session.close()
+
+    threads = []
+    for i in range(max(1, min(concurrency, len(groups)))):
+        thread = threading.Thread(target=worker)
+        thread.start()
+        threads.append(thread)
+    for thread in threads:
+        thread.join()
+    return results, errors
+
+
+def process_issues(module, restbase, user, passwd):
+    items = []
+    for entry in module.params['issues']:
+        if not isinstance(entry, dict):
+            module.fail_json(msg="Each item of issues must be a dict")
+        params = dict(module.params)
+        params['fields'] = dict(module.params['fields'])
+        params.update(entry)
+        if params['operation'] not in OP_REQUIRED:
+            module.fail_json(msg="Unknown operation %s" % params['operation'])
+        required = list(OP_REQUIRED[params['operation']])
+        if params['operation'] != 'create':
+            required.append('issue')
+        missing = [parm for parm in required if not params.get(parm)]
+        if missing:
+            module.fail_json(msg="Operation %s require the following missing parameters: %s" % (params['operation'], ",".join(missing)))
+        if entry.get('assignee'):
+            params['fields']['assignee'] = { 'name': entry['assignee'] }
+        items.append(params)
+
+    session = JiraSession(module, restbase, user, passwd)
+    creates = [params for params in items if params['operation'] == 'create']
+    others = [params for params in items if params['operation'] != 'create']
+    try:
+        created = []
+        if creates:
+            created = bulk_create(session, creates)
+        transitions = [params['issue'] for params in others if params['operation'] == 'transition']
+        if transitions:
+            session.prefetch_status(transitions)
+        results, errors = run_concurrently(session, others, module.params['concurrency'])
+    except Exception:
+        e = get_exception()
+        module.fail_json(msg=str(e))
+    session.close()
+
+    if errors:
+        module.fail_json(msg="; ".join(errors), created=created, meta=results)
+    module.exit_json(changed=True, created=created, meta=results)
+
+
 # Some parameters are required depending on the operation:
 OP_REQUIRED = dict(create=['project', 'issuetype', 'summary', 'description'],
                    comment=['issue', 'comment'],
@@ -311,21 +652,17 @@ def main():
             comment=dict(),
             status=dict(),
             assignee=dict(),
-            fields=dict(default={})
+            fields=dict(default={}),
+            issues=dict(type='list'),
+            timeout=dict(default=10, type='int'),
+            validate_certs=dict(default=True, type='bool'),
+            concurrency=dict(default=4, type='int')
         ),
         supports_check_mode=False
     )
 
     op = module.params['operation']
 
-    # Check we have the necessary per-operation parameters
-    missing = []
-    for parm in OP_REQUIRED[op]:
-        if not module.params[parm]:
-            missing.append(parm)
-    if missing:
-        module.fail_json(msg="Operation %s require the following missing parameters: %s" % (op, ",".join(missing)))
-
     # Handle rest of parameters
     uri = module.params['uri']
     user = module.params['username']
@@ -337,6 +674,17 @@ def main():
         uri = uri+'/'
     restbase = uri + 'rest/api/2'
 
+    if module.params['issues'] is not None:
+        process_issues(module, restbase, user, passwd)
+
+    # Check we have the necessary per-operation parameters
+    missing = []
+    for parm in OP_REQUIRED[op]:
+        if not module.params[parm]:
+            missing.append(parm)
+    if missing:
+        module.fail_json(msg="Operation %s require the following missing parameters: %s" % (op, ",".join(missing)))
+
     # Dispatch
     try:
         